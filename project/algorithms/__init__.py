@@ -1,23 +1,70 @@
 """
-مجلد الخوارزميات - يحتوي على 8 خوارزميات للبحث عن المسار
+مجلد الخوارزميات - يحتوي على 10 خوارزميات للبحث عن المسار
+ومخططات D* Lite وFlowField
 """
-from .astar import astar
+from .astar import astar, astar_stepwise
 from .dijkstra import dijkstra
 from .bfs import bfs
 from .dfs import dfs
 from .greedy import greedy_best_first
 from .bidirectional import bidirectional_search
 from .ida_star import ida_star
+from .base import SearchResult
+from .instrumentation import SearchStats, collect_stats, current_stats
 from .theta_star import theta_star
+from .jps import jump_point_search
+from .distance_table import DistanceTable, build_distance_table, load_distance_table
+from .cache import PathCache, cached
+from .d_star_lite import DStarLite
+from .flow_field import FlowField
+from .hpa_star import HierarchicalPlanner, hpa_star
+from .junction_graph import JunctionGraph, junction_graph, on_junction_graph
+from .visibility import VisibilityCache, visibility
+from .scheduler import PathScheduler
+from .planning_service import PlanningService
+from .workspace import (
+    SearchWorkspace, get_workspace, astar_workspace, dijkstra_workspace,
+    bfs_workspace, dfs_workspace, greedy_workspace, measure_allocations
+)
 
 __all__ = [
     'astar',
+    'astar_stepwise',
     'dijkstra', 
     'bfs',
     'dfs',
     'greedy_best_first',
     'bidirectional_search',
     'ida_star',
-    'theta_star'
+    'SearchResult',
+    'SearchStats',
+    'collect_stats',
+    'current_stats',
+    'theta_star',
+    'jump_point_search',
+    'DistanceTable',
+    'build_distance_table',
+    'load_distance_table',
+    'PathCache',
+    'cached',
+    'DStarLite',
+    'FlowField',
+    'HierarchicalPlanner',
+    'hpa_star',
+    'JunctionGraph',
+    'junction_graph',
+    'on_junction_graph',
+    'VisibilityCache',
+    'visibility',
+    'PathScheduler',
+    'PlanningService',
+    'SearchWorkspace',
+    'get_workspace',
+    'astar_workspace',
+    'dijkstra_workspace',
+    'bfs_workspace',
+    'dfs_workspace',
+    'greedy_workspace',
+    'measure_allocations'
 ]
 
@@ -3,6 +3,7 @@
 """
 import heapq
 from .base import heuristic_manhattan, reconstruct_path
+from .instrumentation import current_stats
 
 def astar(gamemap, start, goal):
     """
@@ -24,21 +25,99 @@ def astar(gamemap, start, goal):
     came_from = {}
     g_score = {start: 0}
     f_score = {start: heuristic_manhattan(start, goal)}
+    # الرسوم الموزونة (مثل JunctionView) تعرّف edge_cost، والشبكة كلها بتكلفة 1
+    edge_cost = getattr(gamemap, 'edge_cost', None)
+    stats = current_stats()
     
     while open_set:
         _, current = heapq.heappop(open_set)
+        if stats is not None:
+            stats.heap_pops += 1
         
         if current == goal:
             return reconstruct_path(came_from, start, goal)
+        if stats is not None:
+            stats.expanded += 1
         
         for neighbor in gamemap.neighbors(current):
-            tentative_g_score = g_score[current] + 1
+            if stats is not None:
+                stats.generated += 1
+            tentative_g_score = g_score[current] + (edge_cost(current, neighbor) if edge_cost else 1)
             
             if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
                 came_from[neighbor] = current
                 g_score[neighbor] = tentative_g_score
                 f_score[neighbor] = tentative_g_score + heuristic_manhattan(neighbor, goal)
                 heapq.heappush(open_set, (f_score[neighbor], neighbor))
+                if stats is not None:
+                    stats.pushed(len(open_set))
+    
+    return []
+
+
+def astar_stepwise(gamemap, start, goal, chunk=64):
+    """
+    نفس A* لكن كمولِّد يتوقف بعد كل chunk عقدة موسَّعة، فيمكن إيقاف
+    البحث الطويل مؤقتاً واستئنافه في إطار لاحق:
+    
+        search = astar_stepwise(gamemap, start, goal)
+        try:
+            while True:
+                next(search)        # دفعة من chunk عقدة
+        except StopIteration as done:
+            path = done.value
+    
+    Args:
+        gamemap: خريطة اللعبة
+        start: نقطة البداية (x, y)
+        goal: نقطة الهدف (x, y)
+        chunk: عدد العقد الموسَّعة بين كل توقف وآخر
+    
+    Yields:
+        عدد العقد الموسَّعة حتى الآن
+    
+    Returns:
+        قائمة بالمسار من البداية إلى الهدف (قيمة StopIteration)
+    """
+    if start == goal:
+        return [start]
+    
+    open_set = [(heuristic_manhattan(start, goal), start)]
+    came_from = {}
+    g_score = {start: 0}
+    edge_cost = getattr(gamemap, 'edge_cost', None)
+    stats = current_stats()
+    expanded = 0
+    
+    while open_set:
+        f, current = heapq.heappop(open_set)
+        if stats is not None:
+            stats.heap_pops += 1
+        
+        if current == goal:
+            return reconstruct_path(came_from, start, goal)
+        g = g_score[current]
+        # مدخل قديم: وُجد طريق أقصر بعد إضافته
+        if f > g + heuristic_manhattan(current, goal):
+            continue
+        if stats is not None:
+            stats.expanded += 1
+        
+        for neighbor in gamemap.neighbors(current):
+            if stats is not None:
+                stats.generated += 1
+            tentative_g_score = g + (edge_cost(current, neighbor) if edge_cost else 1)
+            
+            if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                heapq.heappush(open_set, (tentative_g_score + heuristic_manhattan(neighbor, goal), neighbor))
+                if stats is not None:
+                    stats.pushed(len(open_set))
+        
+        expanded += 1
+        if expanded % chunk == 0:
+            yield expanded
     
     return []
 
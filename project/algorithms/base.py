@@ -2,6 +2,12 @@
 الدوال الأساسية المشتركة بين جميع الخوارزميات
 """
 
+# حالات نتيجة البحث (SearchResult.status)
+FOUND = "found"
+NO_PATH = "no_path"
+TIMEOUT = "timeout"
+NODE_LIMIT = "node_limit"
+
 def heuristic_manhattan(a, b):
     """Heuristic: Manhattan distance"""
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
@@ -20,3 +26,17 @@ def reconstruct_path(came_from, start, goal):
     path.reverse()
     return path
 
+class SearchResult(list):
+    """
+    مسار (قائمة عادية) مع حالة البحث، حتى يُميَّز "لا يوجد مسار" عن
+    انتهاء الوقت أو بلوغ حد العقد بدل قائمة فارغة في الحالتين
+    """
+    def __init__(self, path=(), status=FOUND, expanded=0):
+        super().__init__(path)
+        self.status = status
+        self.expanded = expanded
+
+    @property
+    def exhausted(self):
+        """True إن توقف البحث بسبب الوقت أو حد العقد"""
+        return self.status in (TIMEOUT, NODE_LIMIT)
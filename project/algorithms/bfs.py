@@ -3,6 +3,7 @@
 """
 from collections import deque
 from .base import reconstruct_path
+from .instrumentation import current_stats
 
 def bfs(gamemap, start, goal):
     """
@@ -21,17 +22,26 @@ def bfs(gamemap, start, goal):
     
     queue = deque([start])
     came_from = {start: None}
+    stats = current_stats()
     
     while queue:
         current = queue.popleft()
+        if stats is not None:
+            stats.heap_pops += 1
         
         if current == goal:
             return reconstruct_path(came_from, start, goal)
+        if stats is not None:
+            stats.expanded += 1
         
         for neighbor in gamemap.neighbors(current):
+            if stats is not None:
+                stats.generated += 1
             if neighbor not in came_from:
                 came_from[neighbor] = current
                 queue.append(neighbor)
+                if stats is not None:
+                    stats.pushed(len(queue))
     
     return []
 
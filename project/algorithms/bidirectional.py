@@ -1,89 +1,113 @@
 """
 خوارزمية Bidirectional Search
 """
-from collections import deque
-from .base import reconstruct_path
+import heapq
+from .base import heuristic_manhattan
+from .instrumentation import current_stats
 
 def bidirectional_search(gamemap, start, goal):
     """
-    خوارزمية البحث ثنائي الاتجاه
-    
+    خوارزمية البحث ثنائي الاتجاه (Bidirectional A* بحدود DIBBS)
+
+    بحث من البداية نحو الهدف وآخر من الهدف نحو البداية، وأولوية العقدة n في
+    كل اتجاه هي الحد الأدنى المُحسَّن لأي مسار يمر بها:
+
+        fbar(n) = 2g(n) + h(n, الهدف المقابل) - h(n, أصل هذا الاتجاه)
+
+    ويُوسَّع في كل خطوة الاتجاه الذي أصغر أولوية فيه أقل. mu أفضل تكلفة مسار
+    عبر نقطة التقاء معروفة حتى الآن، ويتوقف البحث عندما:
+
+        mu <= (fbar_min_forward + fbar_min_backward) / 2
+
+    فالمسار المُرجَع هو الأقصر. الحد يرتفع أسرع من f في A* لأن كل اتجاه يطرح
+    ما قطعه الآخر، فالبحثان يلتقيان في المنتصف بعقد موسَّعة أقل من astar على
+    مسارات المتاهات الطويلة.
+
     Args:
         gamemap: خريطة اللعبة
         start: نقطة البداية (x, y)
         goal: نقطة الهدف (x, y)
-    
+
     Returns:
         قائمة بالمسار من البداية إلى الهدف
     """
     if start == goal:
         return [start]
-    
-    # البحث من البداية
-    queue_start = deque([start])
-    came_from_start = {start: None}
-    
-    # البحث من الهدف
-    queue_goal = deque([goal])
-    came_from_goal = {goal: None}
-    
-    visited_start = {start}
-    visited_goal = {goal}
-    
-    while queue_start or queue_goal:
-        # خطوة من البداية
-        if queue_start:
-            current_start = queue_start.popleft()
-            
-            if current_start in visited_goal:
-                # تم العثور على التقاطع
-                path1 = []
-                node = current_start
-                while node is not None:
-                    path1.append(node)
-                    node = came_from_start[node]
-                path1.reverse()
-                
-                path2 = []
-                node = came_from_goal[current_start]
-                while node is not None:
-                    path2.append(node)
-                    node = came_from_goal[node]
-                
-                return path1 + path2
-            
-            for neighbor in gamemap.neighbors(current_start):
-                if neighbor not in visited_start:
-                    visited_start.add(neighbor)
-                    came_from_start[neighbor] = current_start
-                    queue_start.append(neighbor)
-        
-        # خطوة من الهدف
-        if queue_goal:
-            current_goal = queue_goal.popleft()
-            
-            if current_goal in visited_start:
-                # تم العثور على التقاطع
-                path1 = []
-                node = current_goal
-                while node is not None:
-                    path1.append(node)
-                    node = came_from_start[node]
-                path1.reverse()
-                
-                path2 = []
-                node = came_from_goal[current_goal]
-                while node is not None:
-                    path2.append(node)
-                    node = came_from_goal[node]
-                
-                return path1 + path2
-            
-            for neighbor in gamemap.neighbors(current_goal):
-                if neighbor not in visited_goal:
-                    visited_goal.add(neighbor)
-                    came_from_goal[neighbor] = current_goal
-                    queue_goal.append(neighbor)
-    
-    return []
 
+    edge_cost = getattr(gamemap, 'edge_cost', None)
+    stats = current_stats()
+
+    # الاتجاه 0: من البداية نحو الهدف، الاتجاه 1: من الهدف نحو البداية
+    targets = (goal, start)
+    g_score = ({start: 0}, {goal: 0})
+    came_from = ({start: None}, {goal: None})
+    bound = heuristic_manhattan(start, goal)
+    # (fbar، -g لتفضيل العقدة الأعمق عند التساوي، العقدة)
+    open_sets = ([(bound, 0, start)], [(bound, 0, goal)])
+
+    best = float('inf')
+    meeting = None
+
+    def top(side):
+        """أصغر أولوية صالحة في اتجاه (المدخلات القديمة تُزال)"""
+        heap, g_side = open_sets[side], g_score[side]
+        while heap and -heap[0][1] != g_side[heap[0][2]]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    while True:
+        forward, backward = top(0), top(1)
+        if forward is None or backward is None:
+            break
+        if best <= (forward + backward) / 2:
+            break
+
+        side = 0 if forward <= backward else 1
+        other = 1 - side
+        _, g, current = heapq.heappop(open_sets[side])
+        g = -g
+        if stats is not None:
+            stats.heap_pops += 1
+            stats.expanded += 1
+
+        (tx, ty), (ox, oy) = targets[side], targets[other]
+        g_side, g_other = g_score[side], g_score[other]
+        for neighbor in gamemap.neighbors(current):
+            if stats is not None:
+                stats.generated += 1
+            step = edge_cost(current, neighbor) if edge_cost else 1
+            tentative_g_score = g + step
+
+            if tentative_g_score < g_side.get(neighbor, float('inf')):
+                g_side[neighbor] = tentative_g_score
+                came_from[side][neighbor] = current
+                x, y = neighbor
+                priority = (2 * tentative_g_score + abs(x - tx) + abs(y - ty)
+                            - abs(x - ox) - abs(y - oy))
+                heapq.heappush(open_sets[side], (priority, -tentative_g_score, neighbor))
+                if stats is not None:
+                    stats.pushed(len(open_sets[0]) + len(open_sets[1]))
+
+                # نقطة التقاء مع البحث المعاكس
+                if neighbor in g_other:
+                    total = tentative_g_score + g_other[neighbor]
+                    if total < best:
+                        best = total
+                        meeting = neighbor
+
+    if meeting is None:
+        return []
+
+    path = []
+    node = meeting
+    while node is not None:
+        path.append(node)
+        node = came_from[0][node]
+    path.reverse()
+
+    node = came_from[1][meeting]
+    while node is not None:
+        path.append(node)
+        node = came_from[1][node]
+
+    return path
@@ -0,0 +1,98 @@
+"""
+ذاكرة تخزين مؤقت مشتركة للمسارات (LRU Path Cache)
+"""
+from collections import OrderedDict
+from functools import wraps
+
+
+class PathCache:
+    """
+    ذاكرة مؤقتة محدودة الحجم للمسارات مع طرد الأقدم استخداماً (LRU)
+
+    المفتاح: (إصدار الخريطة، اسم الخوارزمية، البداية، الهدف)
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """إرجاع نسخة من المسار المخزّن أو None"""
+        path = self._entries.get(key)
+        if path is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return list(path)
+
+    def put(self, key, path):
+        """
+        تخزين المسار وطرد الأقدم عند تجاوز الحد
+
+        البحث الذي توقف بسبب الوقت أو حد العقد (SearchResult.exhausted) لا
+        يُخزَّن، وإلا صار كل استعلام لاحق يبدو كأنه "لا يوجد مسار".
+        """
+        if self.maxsize <= 0 or getattr(path, 'exhausted', False):
+            return
+        self._entries[key] = tuple(path)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        """عدادات الإصابة والإخفاق"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / lookups * 100 if lookups else 0.0
+        }
+
+    def wrap(self, algorithm, name=None):
+        """تغليف خوارزمية بنفس التوقيع (gamemap, start, goal)"""
+        return cached(algorithm, self, name)
+
+
+def cached(algorithm, cache, name=None):
+    """
+    تغليف خوارزمية بذاكرة مؤقتة مشتركة
+
+    Args:
+        algorithm: دالة الخوارزمية
+        cache: كائن PathCache (يمكن مشاركته بين عدة أشباح)
+        name: اسم الخوارزمية في المفتاح (افتراضي: اسم الدالة)
+
+    Returns:
+        دالة بنفس التوقيع تُرجع المسار من الذاكرة إن وُجد
+    """
+    name = name or getattr(algorithm, '__name__', repr(algorithm))
+
+    def key(gamemap, start, goal):
+        return (getattr(gamemap, 'version', id(gamemap)), name, tuple(start), tuple(goal))
+
+    @wraps(algorithm)
+    def wrapper(gamemap, start, goal):
+        k = key(gamemap, start, goal)
+        path = cache.get(k)
+        if path is None:
+            path = algorithm(gamemap, start, goal)
+            cache.put(k, path)
+        return path
+
+    wrapper.cache = cache
+    wrapper.cache_key = key  # يستخدمه من يشغّل الخوارزمية بنفسه (مثل PathScheduler)
+    return wrapper
@@ -0,0 +1,215 @@
+"""
+خوارزمية D* Lite - إعادة تخطيط تزايدية لهدف متحرك
+"""
+import heapq
+from .base import heuristic_manhattan
+from .instrumentation import current_stats
+
+INF = float('inf')
+
+
+class DStarLite:
+    """
+    مخطط D* Lite لهدف متحرك (Moving Target D* Lite) يحتفظ بحالة البحث بين الاستدعاءات
+
+    البحث يبدأ من الشبح نحو الهدف، فكل خلية تحتفظ بمسافتها من جذر الشجرة
+    (g) وبأبيها فيها:
+    - انتقال الهدف لا يغيّر أي مسافة، فيُعالج بإزاحة المفاتيح (km) ثم يُكمل
+      البحث من حيث توقف
+    - تقدّم الشبح إلى خلية داخل الشجرة يُبقي الشجرة الفرعية التي جذرها
+      الموضع الجديد كما هي (قيمها تزيد على المسافة الحقيقية بمقدار ثابت فلا
+      يتغير ترتيبها)، ويُحذف الباقي ثم تُربط حدوده بما بقي
+    - قفزة إلى خارج الشجرة أو تغيّر الخريطة يبدأ بحثاً جديداً
+
+    الاستخدام:
+        planner = DStarLite(gamemap)
+        path = planner.plan(start, goal)   # نفس شكل مخرجات الخوارزميات
+    """
+
+    def __init__(self, gamemap):
+        self.gamemap = gamemap
+        self.reset()
+
+    def reset(self):
+        """مسح حالة البحث بالكامل"""
+        self.version = getattr(self.gamemap, 'version', None)
+        self.g = {}
+        self.rhs = {}
+        self.parent = {}
+        self.children = {}  # عكس parent: أبناء كل خلية في الشجرة
+        self.open_set = []
+        self.open_keys = {}
+        self.km = 0
+        self.start = None  # جذر شجرة البحث (موضع الشبح)
+        self.goal = None
+        self.expanded = 0  # عدد العقد الموسّعة في آخر استدعاء لـ plan
+        self.deleted = 0   # عدد الخلايا المحذوفة من الشجرة في آخر استدعاء
+        self.stats = None
+
+    def _key(self, s):
+        m = min(self.g.get(s, INF), self.rhs.get(s, INF))
+        return (m + heuristic_manhattan(s, self.goal) + self.km, m)
+
+    def _queue(self, s):
+        """إضافة s إلى القائمة المفتوحة إن كانت غير متسقة، أو إزالتها"""
+        if self.g.get(s, INF) != self.rhs.get(s, INF):
+            key = self._key(s)
+            self.open_keys[s] = key
+            heapq.heappush(self.open_set, (key, s))
+            if self.stats is not None:
+                self.stats.pushed(len(self.open_set))
+        else:
+            self.open_keys.pop(s, None)
+
+    def _set_parent(self, s, p):
+        """تعيين أب s مع تحديث فهرس الأبناء"""
+        old = self.parent.get(s)
+        if old is not None:
+            self.children[old].discard(s)
+        self.parent[s] = p
+        self.children.setdefault(p, set()).add(s)
+
+    def _recompute_rhs(self, s):
+        """أفضل أب لـ s من جيرانها الموجودين في الشجرة"""
+        g = self.g
+        best, best_parent = INF, None
+        for neighbor in self.gamemap.neighbors(s):
+            cost = g.get(neighbor, INF) + 1
+            if cost < best:
+                best, best_parent = cost, neighbor
+        if best_parent is not None:
+            self.rhs[s] = best
+            self._set_parent(s, best_parent)
+
+    def _restart(self, start, goal):
+        self.reset()
+        self.start = start
+        self.goal = goal
+        self.rhs[start] = 0
+        self._queue(start)
+
+    def _move_root(self, start):
+        """
+        نقل جذر الشجرة إلى start مع إبقاء شجرته الفرعية
+
+        Returns:
+            False إذا لم تكن start خلية متسقة في الشجرة (يلزم بحث جديد)
+        """
+        g, rhs, parent = self.g, self.rhs, self.parent
+        if g.get(start, INF) == INF or g[start] != rhs.get(start):
+            return False
+
+        # المحذوف هو شجرة الجذر القديم بدون فرع start: نزول عبر الأبناء
+        # فلا نلمس الشجرة الفرعية الباقية
+        children = self.children
+        deleted = []
+        stack = [self.start]
+        while stack:
+            s = stack.pop()
+            if s == start:
+                continue
+            deleted.append(s)
+            stack.extend(children.pop(s, ()))
+        for s in deleted:
+            g.pop(s, None)
+            rhs.pop(s, None)
+            parent.pop(s, None)
+            self.open_keys.pop(s, None)
+        parent.pop(start, None)
+        self.start = start
+        # حدود المنطقة المحذوفة تُربط بالشجرة الباقية وتعود إلى القائمة المفتوحة
+        for s in deleted:
+            self._recompute_rhs(s)
+            if s in rhs:
+                self._queue(s)
+        self.deleted = len(deleted)
+        return True
+
+    def _compute_shortest_path(self):
+        g, rhs = self.g, self.rhs
+        set_parent = self._set_parent
+        open_set, open_keys = self.open_set, self.open_keys
+        goal = self.goal
+        stats = self.stats
+        while open_set:
+            key, u = open_set[0]
+            if open_keys.get(u) != key:
+                heapq.heappop(open_set)  # مدخل قديم
+                continue
+            if not (key < self._key(goal) or rhs.get(goal, INF) != g.get(goal, INF)):
+                break
+            heapq.heappop(open_set)
+            if stats is not None:
+                stats.heap_pops += 1
+            new_key = self._key(u)
+            if key < new_key:
+                # المفتاح حُسب لهدف سابق (km أقل)
+                open_keys[u] = new_key
+                heapq.heappush(open_set, (new_key, u))
+                continue
+            del open_keys[u]
+            self.expanded += 1
+            if stats is not None:
+                stats.expanded += 1
+
+            # الخريطة ثابتة داخل النسخة الواحدة فالمسافات لا تزيد أبداً:
+            # كل عقدة في القائمة زائدة الاتساق، تثبيت g ثم تحسين الجيران
+            g[u] = rhs[u]
+            cost = g[u] + 1
+            for neighbor in self.gamemap.neighbors(u):
+                if stats is not None:
+                    stats.generated += 1
+                if cost < rhs.get(neighbor, INF):
+                    rhs[neighbor] = cost
+                    set_parent(neighbor, u)
+                    self._queue(neighbor)
+
+    def plan(self, start, goal):
+        """
+        حساب المسار من start إلى goal مع إعادة استخدام البحث السابق
+
+        Args:
+            start: الموضع الحالي للشبح (x, y)
+            goal: موضع الهدف (x, y)
+
+        Returns:
+            قائمة بالمسار من البداية إلى الهدف
+        """
+        start, goal = tuple(start), tuple(goal)
+        self.expanded = 0
+        self.deleted = 0
+        if getattr(self.gamemap, 'version', None) != self.version:
+            self.reset()
+        self.stats = current_stats()
+
+        if self.start is None or (start != self.start and not self._move_root(start)):
+            self._restart(start, goal)
+        elif goal != self.goal:
+            self.km += heuristic_manhattan(self.goal, goal)
+            self.goal = goal
+
+        if start == goal:
+            return [start]
+
+        self._compute_shortest_path()
+        return self._extract_path()
+
+    def next_step(self, start, goal):
+        """الخطوة التالية فقط، أو None إذا لم يوجد مسار"""
+        path = self.plan(start, goal)
+        return path[1] if len(path) > 1 else None
+
+    def _extract_path(self):
+        """تتبّع الآباء من الهدف إلى الجذر"""
+        current = self.goal
+        if self.g.get(current, INF) == INF:
+            return []
+        parent = self.parent
+        path = [current]
+        while current != self.start:
+            current = parent.get(current)
+            if current is None:
+                return []
+            path.append(current)
+        path.reverse()
+        return path
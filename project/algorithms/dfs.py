@@ -2,6 +2,7 @@
 خوارزمية DFS (Depth-First Search)
 """
 from .base import reconstruct_path
+from .instrumentation import current_stats
 
 def dfs(gamemap, start, goal):
     """
@@ -20,17 +21,26 @@ def dfs(gamemap, start, goal):
     
     stack = [start]
     came_from = {start: None}
+    stats = current_stats()
     
     while stack:
         current = stack.pop()
+        if stats is not None:
+            stats.heap_pops += 1
         
         if current == goal:
             return reconstruct_path(came_from, start, goal)
+        if stats is not None:
+            stats.expanded += 1
         
         for neighbor in gamemap.neighbors(current):
+            if stats is not None:
+                stats.generated += 1
             if neighbor not in came_from:
                 came_from[neighbor] = current
                 stack.append(neighbor)
+                if stats is not None:
+                    stats.pushed(len(stack))
     
     return []
 
@@ -3,6 +3,7 @@
 """
 import heapq
 from .base import reconstruct_path
+from .instrumentation import current_stats
 
 def dijkstra(gamemap, start, goal):
     """
@@ -23,22 +24,32 @@ def dijkstra(gamemap, start, goal):
     heapq.heappush(open_set, (0, start))
     came_from = {}
     cost = {start: 0}
+    edge_cost = getattr(gamemap, 'edge_cost', None)
+    stats = current_stats()
     
     while open_set:
         current_cost, current = heapq.heappop(open_set)
+        if stats is not None:
+            stats.heap_pops += 1
         
         if current == goal:
             return reconstruct_path(came_from, start, goal)
         
         if current_cost > cost.get(current, float('inf')):
             continue
+        if stats is not None:
+            stats.expanded += 1
         
         for neighbor in gamemap.neighbors(current):
-            new_cost = cost[current] + 1
+            if stats is not None:
+                stats.generated += 1
+            new_cost = cost[current] + (edge_cost(current, neighbor) if edge_cost else 1)
             
             if neighbor not in cost or new_cost < cost[neighbor]:
                 cost[neighbor] = new_cost
                 heapq.heappush(open_set, (new_cost, neighbor))
+                if stats is not None:
+                    stats.pushed(len(open_set))
                 came_from[neighbor] = current
     
     return []
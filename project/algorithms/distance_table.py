@@ -0,0 +1,200 @@
+"""
+جدول المسافات المحسوب مسبقاً (All-Pairs Shortest Paths + Next-Hop)
+"""
+import hashlib
+import re
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+from map import DIRECTIONS
+
+NO_HOP = np.iinfo(np.uint8).max
+CACHE_DIR = '.cache'
+_ROW_CHUNK = 1024
+
+
+def map_hash(gamemap):
+    """
+    بصمة جدران الخريطة - أي تعديل عليها (في الملف أو عبر set_tile) يُبطل
+    الجدول المخزّن، بينما الكرات والمواضع الابتدائية لا تؤثر
+    """
+    compiled = gamemap.compile()
+    digest = hashlib.sha1(f"{compiled.width}x{compiled.height}:".encode())
+    digest.update(compiled.walkable)
+    return digest.hexdigest()[:16]
+
+
+def dist_dtype(cells):
+    """
+    أصغر نوع يتسع لأطول مسار ممكن (cells - 1) مع بقاء أكبر قيمة فيه لـ
+    "غير قابل للوصول": uint16 حتى 65535 خلية وإلا uint32
+    """
+    return np.uint16 if cells - 1 < np.iinfo(np.uint16).max else np.uint32
+
+
+class DistanceTable:
+    """
+    جدول المسافات بين كل زوج من الخلايا القابلة للمشي مع اتجاه الخطوة التالية
+
+    dist[i, j]: طول أقصر مسار من الخلية i إلى الخلية j (uint16، أو uint32
+        للخرائط الأكبر - انظر dist_dtype)، وأكبر قيمة في النوع تعني غير قابل للوصول
+    hop[i, j]: فهرس الاتجاه في DIRECTIONS للخطوة الأولى من i نحو j (uint8)
+
+    الجدول مرتبط بإصدار الخريطة: بعد GameMap.set_tile يُعاد بناؤه في الذاكرة
+    عند أول استعلام.
+    """
+
+    def __init__(self, gamemap, dist, hop):
+        self._assign(gamemap, dist, hop)
+
+    def _assign(self, gamemap, dist, hop):
+        self.gamemap = gamemap
+        self.version = getattr(gamemap, 'version', None)
+        self.dist = dist
+        self.hop = hop
+        self.unreachable = np.iinfo(dist.dtype).max
+        compiled = gamemap.compile()
+        self.cells = [compiled.cell_pos(c) for c in compiled.walkable_ids()]
+        self.index = {pos: i for i, pos in enumerate(self.cells)}
+
+    def sync(self):
+        """إعادة البناء إذا تغيّر إصدار الخريطة منذ حساب الجدول"""
+        if getattr(self.gamemap, 'version', None) != self.version:
+            table = build_distance_table(self.gamemap)
+            self._assign(self.gamemap, table.dist, table.hop)
+
+    def distance(self, start, goal):
+        """طول أقصر مسار، أو None إذا لم يكن الهدف قابلاً للوصول"""
+        self.sync()
+        i = self.index.get(tuple(start))
+        j = self.index.get(tuple(goal))
+        if i is None or j is None:
+            return None
+        d = int(self.dist[i, j])
+        return None if d == self.unreachable else d
+
+    def next_step(self, start, goal):
+        """الخطوة التالية من start نحو goal في O(1)، أو None"""
+        self.sync()
+        i = self.index.get(tuple(start))
+        j = self.index.get(tuple(goal))
+        if i is None or j is None:
+            return None
+        k = int(self.hop[i, j])
+        if k == NO_HOP:
+            return None
+        dx, dy = DIRECTIONS[k]
+        return (start[0] + dx, start[1] + dy)
+
+    def path(self, start, goal):
+        """المسار الكامل بتتبع جدول الخطوات التالية"""
+        start, goal = tuple(start), tuple(goal)
+        if start == goal:
+            return [start] if start in self.index else []
+        if self.distance(start, goal) is None:
+            return []
+        path = [start]
+        current = start
+        while current != goal:
+            current = self.next_step(current, goal)
+            path.append(current)
+        return path
+
+    def __call__(self, gamemap, start, goal):
+        """نفس توقيع الخوارزميات: table(gamemap, start, goal)"""
+        return self.path(start, goal)
+
+
+def build_distance_table(gamemap):
+    """
+    بناء الجدول بتشغيل BFS من كل خلية قابلة للمشي
+
+    الذاكرة O(N²) حيث N عدد الخلايا القابلة للمشي، لذلك هذه خطوة مسبقة
+    للخرائط الصغيرة والمتوسطة.
+    """
+    compiled = gamemap.compile()
+    ids = compiled.walkable_ids()
+    n = len(ids)
+    index = {cid: i for i, cid in enumerate(ids)}
+    adjacency = [[index[c] for c in compiled.neighbor_ids(cid)] for cid in ids]
+
+    dtype = dist_dtype(n)
+    unreachable = np.iinfo(dtype).max
+    dist = np.full((n, n), unreachable, dtype=dtype)
+    for source in range(n):
+        row = [-1] * n
+        row[source] = 0
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            d = row[current] + 1
+            for neighbor in adjacency[current]:
+                if row[neighbor] < 0:
+                    row[neighbor] = d
+                    queue.append(neighbor)
+        dist_row = np.array(row, dtype=np.int32)
+        dist[source, dist_row >= 0] = dist_row[dist_row >= 0]
+
+    # الجار في كل اتجاه لكل خلية (-1 إذا كان جداراً)
+    w = compiled.width
+    neighbor_by_dir = np.full((len(DIRECTIONS), n), -1, dtype=np.int64)
+    for i, cid in enumerate(ids):
+        x, y = cid % w, cid // w
+        for k, (dx, dy) in enumerate(DIRECTIONS):
+            nid = (y + dy) * w + (x + dx)
+            if 0 <= x + dx < w and 0 <= y + dy < compiled.height and nid in index:
+                neighbor_by_dir[k, i] = index[nid]
+
+    hop = np.full((n, n), NO_HOP, dtype=np.uint8)
+    work = np.int32 if dtype == np.uint16 else np.int64
+    for lo in range(0, n, _ROW_CHUNK):
+        hi = min(lo + _ROW_CHUNK, n)
+        block = dist[lo:hi].astype(work)
+        wanted = block - 1
+        pending = (block != unreachable) & (block > 0)
+        hop_block = hop[lo:hi]
+        for k in range(len(DIRECTIONS)):
+            nbr = neighbor_by_dir[k, lo:hi]
+            valid = nbr >= 0
+            if not valid.any():
+                continue
+            cand = np.full(block.shape, -2, dtype=work)
+            cand[valid] = dist[nbr[valid]]
+            match = pending & (cand == wanted)
+            hop_block[match] = k
+            pending &= ~match
+    return DistanceTable(gamemap, dist, hop)
+
+
+def load_distance_table(gamemap, cache_dir=None):
+    """
+    تحميل الجدول من ملف جانبي عبر memory-mapping، أو بناؤه وحفظه
+
+    الملفات تُسمّى ببصمة جدران الخريطة لذلك تُبطل تلقائياً عند تعديلها.
+    الخرائط المحمّلة من نص بدون ملف يُبنى جدولها في الذاكرة فقط.
+    """
+    if getattr(gamemap, 'map_path', None) is None:
+        return build_distance_table(gamemap)
+    map_path = Path(gamemap.map_path)
+    cache_dir = Path(cache_dir) if cache_dir else map_path.parent / CACHE_DIR
+    prefix = f"{map_path.stem}.{map_hash(gamemap)}"
+    dist_file = cache_dir / f"{prefix}.dist.npy"
+    hop_file = cache_dir / f"{prefix}.hop.npy"
+
+    if not (dist_file.exists() and hop_file.exists()):
+        table = build_distance_table(gamemap)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # حذف الجداول القديمة لنفس الخريطة فقط ({stem}.{hash}.dist|hop.npy)،
+        # لا جداول خريطة أخرى يبدأ اسمها بنفس الجذع (map1 و map1.big)
+        stale = re.compile(re.escape(map_path.stem) + r"\.[0-9a-f]{16}\.(dist|hop)\.npy")
+        for old in cache_dir.iterdir():
+            if stale.fullmatch(old.name):
+                old.unlink()
+        np.save(dist_file, table.dist)
+        np.save(hop_file, table.hop)
+
+    dist = np.load(dist_file, mmap_mode='r')
+    hop = np.load(hop_file, mmap_mode='r')
+    return DistanceTable(gamemap, dist, hop)
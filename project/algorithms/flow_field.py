@@ -0,0 +1,112 @@
+"""
+حقل التدفق (Flow Field) - بحث واحد من اللاعب تشترك فيه كل الأشباح
+"""
+from collections import deque
+
+from map import DIRECTIONS
+from .instrumentation import current_stats
+
+NO_DIRECTION = 255
+
+
+class FlowField:
+    """
+    حقل اتجاهات نحو هدف واحد محسوب بـ BFS عكسي من الهدف
+
+    direction[cid]: فهرس الاتجاه في DIRECTIONS للخطوة التالية من الخلية cid
+    distance[cid]: عدد الخطوات إلى الهدف (-1 إذا لم يكن قابلاً للوصول)
+
+    الاستخدام:
+        field = FlowField(gamemap)
+        field.update(player_pos)        # مرة واحدة في كل إطار
+        nxt = field.next_step(ghost_pos)  # O(1) لكل شبح
+    """
+
+    def __init__(self, gamemap):
+        self.gamemap = gamemap
+        self.target = None
+        self.version = None
+        self.direction = bytearray()
+        self.distance = []
+        self.builds = 0
+
+    def update(self, target):
+        """
+        إعادة بناء الحقل إذا تغير الهدف أو الخريطة
+
+        Returns:
+            True إذا أعيد البناء
+        """
+        target = tuple(target)
+        version = getattr(self.gamemap, 'version', None)
+        if target == self.target and version == self.version:
+            return False
+
+        compiled = self.gamemap.compile()
+        w = compiled.width
+        direction = bytearray([NO_DIRECTION]) * compiled.size
+        distance = [-1] * compiled.size
+        # فرق المعرّف بين خلية وجارها -> فهرس الاتجاه من الجار نحو الخلية
+        toward = {dx + dy * w: k for k, (dx, dy) in enumerate(DIRECTIONS)}
+
+        if self.gamemap.passable(target):
+            root = compiled.cell_id(target)
+            distance[root] = 0
+            queue = deque([root])
+            adjacency = compiled.adjacency
+            stats = current_stats()
+            while queue:
+                current = queue.popleft()
+                if stats is not None:
+                    stats.heap_pops += 1
+                    stats.expanded += 1
+                    stats.generated += len(adjacency[current])
+                d = distance[current] + 1
+                for neighbor in adjacency[current]:
+                    if distance[neighbor] < 0:
+                        distance[neighbor] = d
+                        direction[neighbor] = toward[current - neighbor]
+                        queue.append(neighbor)
+                        if stats is not None:
+                            stats.pushed(len(queue))
+
+        self.direction = direction
+        self.distance = distance
+        self.target = target
+        self.version = version
+        self.builds += 1
+        return True
+
+    def _cell(self, pos):
+        """معرّف خلية pos، أو None قبل أول update() أو خارج الخريطة"""
+        compiled = self.gamemap.compiled
+        x, y = pos
+        if self.target is None or compiled is None or not (0 <= x < compiled.width and 0 <= y < compiled.height):
+            return None
+        return compiled.cell_id(pos)
+
+    def next_step(self, pos):
+        """الخطوة التالية نحو الهدف، أو None"""
+        cid = self._cell(pos)
+        if cid is None or self.direction[cid] == NO_DIRECTION:
+            return None
+        dx, dy = DIRECTIONS[self.direction[cid]]
+        return (pos[0] + dx, pos[1] + dy)
+
+    def distance_to_target(self, pos):
+        """عدد الخطوات إلى الهدف، أو None"""
+        cid = self._cell(pos)
+        if cid is None or self.distance[cid] < 0:
+            return None
+        return self.distance[cid]
+
+    def path(self, pos):
+        """المسار الكامل من pos إلى الهدف بتتبع الاتجاهات"""
+        pos = tuple(pos)
+        if self.distance_to_target(pos) is None:
+            return []
+        path = [pos]
+        while pos != self.target:
+            pos = self.next_step(pos)
+            path.append(pos)
+        return path
@@ -3,6 +3,7 @@
 """
 import heapq
 from .base import heuristic_manhattan, reconstruct_path
+from .instrumentation import current_stats
 
 def greedy_best_first(gamemap, start, goal):
     """
@@ -22,18 +23,27 @@ def greedy_best_first(gamemap, start, goal):
     open_set = []
     heapq.heappush(open_set, (0, start))
     came_from = {start: None}
+    stats = current_stats()
     
     while open_set:
         _, current = heapq.heappop(open_set)
+        if stats is not None:
+            stats.heap_pops += 1
         
         if current == goal:
             return reconstruct_path(came_from, start, goal)
+        if stats is not None:
+            stats.expanded += 1
         
         for neighbor in gamemap.neighbors(current):
+            if stats is not None:
+                stats.generated += 1
             if neighbor not in came_from:
                 came_from[neighbor] = current
                 priority = heuristic_manhattan(neighbor, goal)
                 heapq.heappush(open_set, (priority, neighbor))
+                if stats is not None:
+                    stats.pushed(len(open_set))
     
     return []
 
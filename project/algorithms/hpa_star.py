@@ -0,0 +1,335 @@
+"""
+خوارزمية HPA* (Hierarchical Pathfinding A*) للخرائط الكبيرة
+"""
+import heapq
+import weakref
+from collections import deque
+from .base import heuristic_manhattan
+from .instrumentation import current_stats
+
+
+class HierarchicalPlanner:
+    """
+    مخطط هرمي: يقسم الخريطة إلى عناقيد، ويحسب مسبقاً نقاط الدخول بين العناقيد
+    والمسافات داخل كل عنقود، ثم يبحث في الرسم المجرد أولاً ويُفصّل فقط
+    المقاطع التي يحتاجها المسار.
+
+    مفتاح الجودة/السرعة:
+        cluster_size: حجم العنقود - أكبر = رسم مجرد أصغر وبحث أسرع لكن مسار
+            أقل دقة. أصغر = أقرب إلى الأمثل وأبطأ.
+        max_entrance_width: الممرات الحدودية الأعرض من هذا تأخذ نقطتي دخول
+            (عند الطرفين) بدل نقطة واحدة في الوسط.
+    """
+
+    def __init__(self, gamemap, cluster_size=10, max_entrance_width=6):
+        self.gamemap = gamemap
+        self.cluster_size = max(2, cluster_size)
+        self.max_entrance_width = max_entrance_width
+        self.rebuild()
+
+    # ------------------------------------------------------------------
+    # البناء المسبق
+    # ------------------------------------------------------------------
+    def rebuild(self):
+        """بناء كل العناقيد ونقاط الدخول من جديد"""
+        gamemap = self.gamemap
+        self.version = getattr(gamemap, 'version', None)
+        self.width = len(gamemap.grid[0]) if gamemap.grid else 0
+        self.height = len(gamemap.grid)
+        cs = self.cluster_size
+        self.clusters_x = -(-self.width // cs)
+        self.clusters_y = -(-self.height // cs)
+        self.borders = {}   # (c1, c2) -> [(a, b), ...] انتقالات بين عنقودين
+        self.inter = {}     # node -> {node: 1} حواف بين العناقيد
+        self.intra = {}     # cluster -> {node: {node: cost}}
+        self.segments = {}  # (a, b) -> مسار مفصّل مخزّن
+        for c in self._all_clusters():
+            for other in self._forward_neighbors(c):
+                self._build_border(c, other)
+        for c in self._all_clusters():
+            self._build_intra(c)
+
+    def update_tiles(self, positions):
+        """
+        إعادة بناء العناقيد المتأثرة فقط بعد تعديل بلاطات الخريطة
+
+        Args:
+            positions: البلاطات التي تغيرت (مثلاً عبر GameMap.set_tile)
+        """
+        changed = {self.cluster_of(p) for p in positions}
+        borders = set()
+        for c in changed:
+            for other in self._adjacent_clusters(c):
+                borders.add((min(c, other), max(c, other)))
+        for c1, c2 in borders:
+            self._build_border(c1, c2)
+        dirty = changed | {c for pair in borders for c in pair}
+        for c in dirty:
+            self._build_intra(c)
+        self.segments = {k: v for k, v in self.segments.items()
+                         if self.cluster_of(k[0]) not in dirty and self.cluster_of(k[1]) not in dirty}
+        self.version = getattr(self.gamemap, 'version', None)
+
+    def sync(self):
+        """
+        مطابقة المخطط مع إصدار الخريطة الحالي
+
+        البلاطات المسجلة في GameMap.changed_tiles تُعاد عناقيدها فقط، ويُعاد
+        البناء الكامل إن لم يكن السجل متاحاً (أو تغيّر حجم الخريطة).
+        """
+        gamemap = self.gamemap
+        if getattr(gamemap, 'version', None) == self.version:
+            return
+        changed_tiles = getattr(gamemap, 'changed_tiles', None)
+        changed = changed_tiles(self.version) if changed_tiles is not None else None
+        width = len(gamemap.grid[0]) if gamemap.grid else 0
+        if changed is None or (width, len(gamemap.grid)) != (self.width, self.height):
+            self.rebuild()
+        else:
+            self.update_tiles(changed)
+
+    def cluster_of(self, pos):
+        return (pos[0] // self.cluster_size, pos[1] // self.cluster_size)
+
+    def _all_clusters(self):
+        for cy in range(self.clusters_y):
+            for cx in range(self.clusters_x):
+                yield (cx, cy)
+
+    def _forward_neighbors(self, c):
+        cx, cy = c
+        if cx + 1 < self.clusters_x:
+            yield (cx + 1, cy)
+        if cy + 1 < self.clusters_y:
+            yield (cx, cy + 1)
+
+    def _adjacent_clusters(self, c):
+        cx, cy = c
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            if 0 <= cx + dx < self.clusters_x and 0 <= cy + dy < self.clusters_y:
+                yield (cx + dx, cy + dy)
+
+    def _bounds(self, c):
+        cs = self.cluster_size
+        return (c[0] * cs, c[1] * cs,
+                min(self.width, (c[0] + 1) * cs), min(self.height, (c[1] + 1) * cs))
+
+    def _build_border(self, c1, c2):
+        """حساب نقاط الدخول على الحد بين عنقودين متجاورين"""
+        for a, b in self.borders.pop((c1, c2), ()):
+            self.inter.get(a, {}).pop(b, None)
+            self.inter.get(b, {}).pop(a, None)
+
+        x0, y0, x1, y1 = self._bounds(c1)
+        if c2[0] != c1[0]:  # حد عمودي
+            pairs = [((x1 - 1, y), (x1, y)) for y in range(y0, y1)]
+        else:               # حد أفقي
+            pairs = [((x, y1 - 1), (x, y1)) for x in range(x0, x1)]
+
+        passable = self.gamemap.passable
+        transitions = []
+        run = []
+        for a, b in pairs + [(None, None)]:
+            if a is not None and passable(a) and passable(b):
+                run.append((a, b))
+                continue
+            if run:
+                if len(run) > self.max_entrance_width:
+                    transitions.extend((run[0], run[-1]))
+                else:
+                    transitions.append(run[len(run) // 2])
+                run = []
+
+        self.borders[(c1, c2)] = transitions
+        for a, b in transitions:
+            self.inter.setdefault(a, {})[b] = 1
+            self.inter.setdefault(b, {})[a] = 1
+
+    def _cluster_nodes(self, c):
+        nodes = set()
+        for other in self._adjacent_clusters(c):
+            for a, b in self.borders.get((min(c, other), max(c, other)), ()):
+                nodes.add(a if self.cluster_of(a) == c else b)
+        return nodes
+
+    def _build_intra(self, c):
+        """المسافات بين نقاط الدخول داخل العنقود (BFS محصور في العنقود)"""
+        nodes = self._cluster_nodes(c)
+        edges = {}
+        for node in nodes:
+            dist, _ = self._local_bfs(node, c)
+            edges[node] = {other: dist[other] for other in nodes
+                           if other != node and other in dist}
+        self.intra[c] = edges
+
+    def _local_bfs(self, source, c, target=None):
+        x0, y0, x1, y1 = self._bounds(c)
+        dist = {source: 0}
+        parent = {source: None}
+        queue = deque([source])
+        stats = current_stats()
+        while queue:
+            current = queue.popleft()
+            if stats is not None:
+                stats.heap_pops += 1
+                stats.expanded += 1
+            if current == target:
+                break
+            for neighbor in self.gamemap.neighbors(current):
+                if stats is not None:
+                    stats.generated += 1
+                if neighbor not in dist and x0 <= neighbor[0] < x1 and y0 <= neighbor[1] < y1:
+                    dist[neighbor] = dist[current] + 1
+                    parent[neighbor] = current
+                    queue.append(neighbor)
+                    if stats is not None:
+                        stats.pushed(len(queue))
+        return dist, parent
+
+    def _local_path(self, a, b):
+        """
+        مسار مفصّل بين نقطتين داخل نفس العنقود
+
+        يُخزَّن فقط ما بين نقطتي دخول (عددها ثابت لكل عنقود)، أما مقاطع ربط
+        البداية والهدف فتختلف مع كل استعلام فلا تُخزَّن وإلا كبر القاموس بلا حد.
+        """
+        segment = self.segments.get((a, b))
+        if segment is not None:
+            return segment
+        cluster = self.cluster_of(a)
+        _, parent = self._local_bfs(a, cluster, b)
+        if b not in parent:
+            return None
+        segment = []
+        node = b
+        while node is not None:
+            segment.append(node)
+            node = parent[node]
+        segment.reverse()
+        entrances = self.intra[cluster]
+        if a in entrances and b in entrances:
+            self.segments[(a, b)] = segment
+        return segment
+
+    # ------------------------------------------------------------------
+    # الاستعلام
+    # ------------------------------------------------------------------
+    def plan(self, start, goal):
+        """
+        حساب المسار من start إلى goal
+
+        Args:
+            start: نقطة البداية (x, y)
+            goal: نقطة الهدف (x, y)
+
+        Returns:
+            قائمة بالمسار من البداية إلى الهدف
+        """
+        start, goal = tuple(start), tuple(goal)
+        if start == goal:
+            return [start]
+        self.sync()
+        passable = self.gamemap.passable
+        if not passable(start) or not passable(goal):
+            return []
+
+        start_cluster = self.cluster_of(start)
+        goal_cluster = self.cluster_of(goal)
+        best = None
+        if start_cluster == goal_cluster:
+            best = self._local_path(start, goal)
+
+        # ربط البداية والهدف مؤقتاً بنقاط دخول عنقوديهما
+        start_dist, _ = self._local_bfs(start, start_cluster)
+        goal_dist, _ = self._local_bfs(goal, goal_cluster)
+        start_edges = {n: d for n, d in start_dist.items() if n in self.intra[start_cluster]}
+        goal_edges = {n: d for n, d in goal_dist.items() if n in self.intra[goal_cluster]}
+
+        abstract = self._abstract_search(start, goal, start_edges, goal_edges)
+        if abstract is not None and (best is None or abstract[0] < len(best) - 1):
+            best = self._refine(abstract[1])
+        return best or []
+
+    def _abstract_search(self, start, goal, start_edges, goal_edges):
+        """A* على الرسم المجرد، يُرجع (التكلفة، العقد) أو None"""
+        open_set = [(heuristic_manhattan(start, goal), 0, start)]
+        came_from = {start: None}
+        g_score = {start: 0}
+        stats = current_stats()
+        while open_set:
+            _, g, current = heapq.heappop(open_set)
+            if stats is not None:
+                stats.heap_pops += 1
+            if g > g_score[current]:
+                continue
+            if stats is not None:
+                stats.expanded += 1
+            if current == goal:
+                nodes = []
+                while current is not None:
+                    nodes.append(current)
+                    current = came_from[current]
+                nodes.reverse()
+                return g, nodes
+
+            if current == start:
+                edges = list(start_edges.items()) + list(self.inter.get(start, {}).items())
+            else:
+                edges = list(self.intra[self.cluster_of(current)].get(current, {}).items())
+                edges += self.inter.get(current, {}).items()
+                if current in goal_edges:
+                    edges.append((goal, goal_edges[current]))
+
+            for neighbor, cost in edges:
+                if stats is not None:
+                    stats.generated += 1
+                tentative = g + cost
+                if neighbor not in g_score or tentative < g_score[neighbor]:
+                    g_score[neighbor] = tentative
+                    came_from[neighbor] = current
+                    heapq.heappush(open_set, (tentative + heuristic_manhattan(neighbor, goal),
+                                              tentative, neighbor))
+                    if stats is not None:
+                        stats.pushed(len(open_set))
+        return None
+
+    def _refine(self, nodes):
+        """تفصيل المسار المجرد إلى بلاطات - فقط المقاطع المطلوبة"""
+        path = [nodes[0]]
+        for a, b in zip(nodes, nodes[1:]):
+            if a == b:
+                continue
+            if self.cluster_of(a) != self.cluster_of(b):
+                path.append(b)  # حافة بين عنقودين متجاورين
+                continue
+            segment = self._local_path(a, b)
+            if segment is None:
+                return []
+            path.extend(segment[1:])
+        return path
+
+
+_planners = weakref.WeakKeyDictionary()
+
+
+def hpa_star(gamemap, start, goal, cluster_size=10):
+    """
+    خوارزمية HPA* بنفس توقيع باقي الخوارزميات
+
+    المخطط الهرمي يُبنى مرة واحدة لكل خريطة، وعند تغير إصدارها تُعاد فقط
+    العناقيد التي عدّلتها GameMap.set_tile.
+
+    Args:
+        gamemap: خريطة اللعبة
+        start: نقطة البداية (x, y)
+        goal: نقطة الهدف (x, y)
+        cluster_size: حجم العنقود (مستوى التجريد)
+
+    Returns:
+        قائمة بالمسار من البداية إلى الهدف
+    """
+    planner = _planners.get(gamemap)
+    if planner is None or planner.cluster_size != cluster_size:
+        planner = HierarchicalPlanner(gamemap, cluster_size)
+        _planners[gamemap] = planner
+    return planner.plan(start, goal)
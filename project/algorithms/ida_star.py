@@ -2,73 +2,102 @@
 IDA* (Iterative Deepening A*) Algorithm
 """
 import time
-from .base import heuristic_manhattan
+from .base import heuristic_manhattan, SearchResult, FOUND, NO_PATH, TIMEOUT, NODE_LIMIT
+from .instrumentation import current_stats
 
-def ida_star(gamemap, start, goal, time_limit=1.0, max_nodes=5000):
+# The deadline is checked once per this many generated nodes
+CLOCK_INTERVAL = 1024
+
+def ida_star(gamemap, start, goal, time_limit=1.0, max_nodes=2000000, table_size=200000):
     """
     IDA* algorithm for pathfinding
-    
+
+    Depth-first iterations with an explicit stack of neighbor iterators, so
+    path length is not bounded by the recursion limit. Membership of the
+    current path is kept in a set updated on push/pop, and a transposition
+    table remembers the lowest g at which each cell was reached in the
+    current iteration: reaching it again with g no lower cannot find
+    anything new and is pruned.
+
     Args:
         gamemap: Game map
         start: Start point (x, y)
         goal: Goal point (x, y)
-    
+        time_limit: Time budget in seconds (monotonic clock)
+        max_nodes: Cap on generated nodes over all iterations
+        table_size: Maximum transposition table entries per iteration
+
     Returns:
-        List of path from start to goal
+        SearchResult: The path (empty unless found) with its status:
+        found, no_path, timeout or node_limit
     """
     if start == goal:
-        return [start]
-    
-    start_time = time.time()
-    explored = 0
+        return SearchResult([start], FOUND)
+
+    neighbors = gamemap.neighbors
+    edge_cost = getattr(gamemap, 'edge_cost', None)
+    stats = current_stats()
+    deadline = time.monotonic() + time_limit
+    generated = 0
+    threshold = heuristic_manhattan(start, goal)
 
-    def search(path, g, threshold):
-        nonlocal explored
+    while True:
+        path = [start]
+        costs = [0]
+        on_path = {start}
+        frontier = [iter(neighbors(start))]
+        table = {start: 0}
+        next_threshold = float('inf')
 
-        # زمن التشغيل
-        if time.time() - start_time > time_limit:
-            return float("inf")
+        while frontier:
+            g = costs[-1]
+            node = path[-1]
+            for neighbor in frontier[-1]:
+                if neighbor in on_path:
+                    continue
 
-        # حد أقصى لعدد العقد
-        explored += 1
-        if explored > max_nodes:
-            return float("inf")
+                generated += 1
+                if stats is not None:
+                    stats.generated += 1
+                if generated > max_nodes:
+                    return SearchResult([], NODE_LIMIT, generated)
+                if generated % CLOCK_INTERVAL == 0 and time.monotonic() > deadline:
+                    return SearchResult([], TIMEOUT, generated)
+
+                new_g = g + (edge_cost(node, neighbor) if edge_cost else 1)
+                f = new_g + heuristic_manhattan(neighbor, goal)
+                if f > threshold:
+                    if f < next_threshold:
+                        next_threshold = f
+                    continue
+
+                if neighbor == goal:
+                    path.append(neighbor)
+                    return SearchResult(path, FOUND, generated)
+
+                seen = table.get(neighbor)
+                if seen is not None and seen <= new_g:
+                    continue
+                if seen is not None or len(table) < table_size:
+                    table[neighbor] = new_g
 
-        node = path[-1]
-        f = g + heuristic_manhattan(node, goal)
-        
-        if f > threshold:
-            return f
-        
-        if node == goal:
-            return path
-        
-        min_cost = float('inf')
-        visited = set(path)  # Use set for faster lookup
-        
-        for neighbor in gamemap.neighbors(node):
-            if neighbor not in visited:
                 path.append(neighbor)
-                result = search(path, g + 1, threshold)
-                if isinstance(result, list):
-                    return result
-                if isinstance(result, (int, float)):
-                    min_cost = min(min_cost, result)
-                path.pop()
-        
-        return min_cost
-    
-    threshold = heuristic_manhattan(start, goal)
-    max_iterations = 200  # Prevent infinite loops
-    iteration = 0
-    
-    while iteration < max_iterations:
-        result = search([start], 0, threshold)
-        if isinstance(result, list):
-            return result
-        if result == float('inf'):
-            return []
-        threshold = result
-        iteration += 1
-    
-    return []
+                costs.append(new_g)
+                on_path.add(neighbor)
+                frontier.append(iter(neighbors(neighbor)))
+                if stats is not None:
+                    # المكدس هو قائمة الانتظار: دفع العقدة يعني توسيعها
+                    stats.expanded += 1
+                    stats.pushed(len(frontier))
+                break
+            else:
+                # All neighbors done: backtrack
+                frontier.pop()
+                costs.pop()
+                if stats is not None:
+                    stats.heap_pops += 1
+                on_path.discard(path.pop())
+
+        if next_threshold == float('inf'):
+            return SearchResult([], NO_PATH, generated)
+        threshold = next_threshold
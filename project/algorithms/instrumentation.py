@@ -0,0 +1,87 @@
+"""
+عدّادات البحث: العقد الموسَّعة والمولَّدة وعمليات قائمة الانتظار وذروة حجمها
+
+الخوارزميات تقرأ current_stats() مرة واحدة في بدايتها وتُحدِّث العدّادات فقط
+إن لم تكن None، فالتكلفة عند التعطيل فحص واحد لكل عقدة.
+
+    with collect_stats(trace_memory=True) as stats:
+        astar(gamemap, start, goal)
+    print(stats.as_dict())
+"""
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+_local = threading.local()
+
+
+class SearchStats:
+    """
+    عدّادات استعلام (أو عدة استعلامات) بحث
+
+    Attributes:
+        expanded: العقد التي أُخرجت من قائمة الانتظار ووُسِّعت
+        generated: الجيران الذين فُحصوا أثناء التوسيع
+        heap_pushes: الإضافات إلى قائمة الانتظار (كومة أو طابور أو مكدس)
+        heap_pops: السحوبات من قائمة الانتظار
+        peak_open: أكبر حجم وصلت إليه قائمة الانتظار
+        peak_memory: ذروة الذاكرة بالبايت (فقط مع trace_memory)
+    """
+    __slots__ = ('expanded', 'generated', 'heap_pushes', 'heap_pops', 'peak_open', 'peak_memory')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.expanded = 0
+        self.generated = 0
+        self.heap_pushes = 0
+        self.heap_pops = 0
+        self.peak_open = 0
+        self.peak_memory = 0
+
+    def pushed(self, open_size):
+        """تسجيل إضافة إلى قائمة انتظار حجمها الآن open_size"""
+        self.heap_pushes += 1
+        if open_size > self.peak_open:
+            self.peak_open = open_size
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def current_stats():
+    """عدّادات الخيط الحالي، أو None إن كان القياس معطلاً"""
+    return getattr(_local, 'stats', None)
+
+
+@contextmanager
+def collect_stats(trace_memory=False):
+    """
+    تفعيل العدّادات داخل كتلة with
+
+    Args:
+        trace_memory: قياس ذروة الذاكرة عبر tracemalloc (يُبطئ التنفيذ)
+
+    Yields:
+        SearchStats تتجمع فيه عدّادات كل البحث داخل الكتلة
+    """
+    stats = SearchStats()
+    previous = getattr(_local, 'stats', None)
+    _local.stats = stats
+    started = False
+    if trace_memory:
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+            started = True
+        baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        yield stats
+    finally:
+        if trace_memory:
+            stats.peak_memory = max(0, tracemalloc.get_traced_memory()[1] - baseline)
+            if started:
+                tracemalloc.stop()
+        _local.stats = previous
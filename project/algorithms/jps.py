@@ -0,0 +1,134 @@
+"""
+خوارزمية Jump Point Search (نسخة الشبكة رباعية الاتجاهات)
+"""
+import heapq
+from .instrumentation import current_stats
+
+
+def jump_point_search(gamemap, start, goal):
+    """
+    خوارزمية JPS: A* على نقاط القفز فقط مع القفز على طول الممرات
+
+    تُقلّم التوسعات المتماثلة: الحركة الأفقية تستمر حتى جار إجباري، والحركة
+    العمودية تفحص الاتجاهين الأفقيين في كل خطوة. تُعطي نفس طول المسار
+    الأقصر الذي تعطيه A*. تعمل على الشبكة المُجمَّعة ذات الإطار (padded)
+    بفهارس مسطحة.
+
+    Args:
+        gamemap: خريطة اللعبة
+        start: نقطة البداية (x, y)
+        goal: نقطة الهدف (x, y)
+
+    Returns:
+        قائمة بالمسار من البداية إلى الهدف
+    """
+    if start == goal:
+        return [start]
+
+    grid, stride = gamemap.compile().padded()
+    if not (gamemap.in_bounds(start) and gamemap.in_bounds(goal)):
+        return []
+    s = (start[1] + 1) * stride + start[0] + 1
+    g = (goal[1] + 1) * stride + goal[0] + 1
+    gx, gy = g % stride, g // stride
+
+    def jump_horizontal(i, d):
+        while True:
+            i += d
+            if not grid[i]:
+                return -1
+            if i == g:
+                return i
+            up, down = i - stride, i + stride
+            if (grid[up] and not grid[up - d]) or (grid[down] and not grid[down - d]):
+                return i
+
+    def jump_vertical(i, d):
+        while True:
+            i += d
+            if not grid[i]:
+                return -1
+            if i == g:
+                return i
+            if (grid[i - 1] and not grid[i - 1 - d]) or (grid[i + 1] and not grid[i + 1 - d]):
+                return i
+            # الحركة العمودية تتوقف حيث يجد المسح الأفقي نقطة قفز
+            if jump_horizontal(i, 1) >= 0 or jump_horizontal(i, -1) >= 0:
+                return i
+
+    def distance(a, b):
+        return abs(a % stride - b % stride) + abs(a // stride - b // stride)
+
+    open_set = []
+    heapq.heappush(open_set, (distance(s, g), s))
+    came_from = {s: -1}
+    g_score = {s: 0}
+    closed = set()
+    stats = current_stats()
+
+    while open_set:
+        _, current = heapq.heappop(open_set)
+        if stats is not None:
+            stats.heap_pops += 1
+        if current in closed:
+            continue
+        closed.add(current)
+
+        if current == g:
+            return _expand(came_from, g, stride)
+        if stats is not None:
+            stats.expanded += 1
+
+        parent = came_from[current]
+        if parent < 0:
+            directions = (1, -1, stride, -stride)
+        elif current // stride == parent // stride:
+            d = 1 if current > parent else -1
+            directions = (-stride, stride, d)
+        else:
+            d = stride if current > parent else -stride
+            directions = (-1, 1, d)
+
+        for d in directions:
+            if not grid[current + d]:
+                continue
+            if d == 1 or d == -1:
+                point = jump_horizontal(current, d)
+            else:
+                point = jump_vertical(current, d)
+            if point < 0 or point in closed:
+                continue
+            if stats is not None:
+                stats.generated += 1
+            tentative_g_score = g_score[current] + distance(current, point)
+            if point not in g_score or tentative_g_score < g_score[point]:
+                g_score[point] = tentative_g_score
+                came_from[point] = current
+                h = abs(point % stride - gx) + abs(point // stride - gy)
+                heapq.heappush(open_set, (tentative_g_score + h, point))
+                if stats is not None:
+                    stats.pushed(len(open_set))
+
+    return []
+
+
+def _expand(came_from, goal, stride):
+    """تحويل سلسلة نقاط القفز إلى مسار بلاطة ببلاطة"""
+    points = []
+    node = goal
+    while node >= 0:
+        points.append(node)
+        node = came_from[node]
+    points.reverse()
+
+    path = [points[0]]
+    for a, b in zip(points, points[1:]):
+        if a // stride == b // stride:
+            d = 1 if b > a else -1
+        else:
+            d = stride if b > a else -stride
+        i = a
+        while i != b:
+            i += d
+            path.append(i)
+    return [(i % stride - 1, i // stride - 1) for i in path]
@@ -0,0 +1,233 @@
+"""
+تقليص الممرات: رسم التقاطعات والطرق المسدودة بدل البلاطات
+"""
+import weakref
+from .base import SearchResult
+from .jps import jump_point_search
+from .hpa_star import hpa_star
+
+
+class JunctionGraph:
+    """
+    رسم موزون عقده التقاطعات والطرق المسدودة (كل بلاطة درجتها ليست 2)،
+    وحوافه الممرات بينها ووزن كل حافة طول الممر.
+
+    يُبنى مرة واحدة لكل إصدار خريطة. البحث يجري على عرض (JunctionView)
+    يربط البداية والهدف مؤقتاً بطرفي ممريهما ثم يُعاد المسار إلى بلاطات.
+    """
+
+    def __init__(self, gamemap):
+        self.gamemap = gamemap
+        self.rebuild()
+
+    def rebuild(self):
+        """بناء الرسم من جديد من الخريطة الحالية"""
+        gamemap = self.gamemap
+        self.version = getattr(gamemap, 'version', None)
+        cells = [(x, y) for y, row in enumerate(gamemap.grid)
+                 for x in range(len(row)) if gamemap.passable((x, y))]
+        self.neighbor_map = {cell: tuple(gamemap.neighbors(cell)) for cell in cells}
+        self.nodes = {cell for cell in cells if len(self.neighbor_map[cell]) != 2}
+        self.corridors = []     # [(u, v, [بلاطات الممر الداخلية من u إلى v])]
+        self.corridor_of = {}   # بلاطة -> (رقم الممر، موقعها فيه)
+        self.adjacency = {}     # node -> {node: (التكلفة، رقم الممر)}
+
+        for node in list(self.nodes):
+            self._walk_from(node)
+        # حلقات مغلقة بلا أي تقاطع: نختار بلاطة منها عقدةً
+        for cell in cells:
+            if cell not in self.nodes and cell not in self.corridor_of:
+                self.nodes.add(cell)
+                self._walk_from(cell)
+
+        self.node_neighbors = {node: tuple(self.adjacency.get(node, ())) for node in self.nodes}
+
+    def _walk_from(self, node):
+        """تتبع كل ممر يبدأ من عقدة حتى العقدة التالية"""
+        neighbor_map = self.neighbor_map
+        for first in neighbor_map[node]:
+            if first in self.corridor_of:
+                continue  # الممر سُجِّل من طرفه الآخر
+            if first in self.nodes and first < node:
+                continue  # عقدتان متجاورتان: الحافة سُجِّلت من الأخرى
+            tiles = []
+            previous, current = node, first
+            while current not in self.nodes:
+                tiles.append(current)
+                a, b = neighbor_map[current]
+                previous, current = current, (b if a == previous else a)
+            cid = len(self.corridors)
+            self.corridors.append((node, current, tiles))
+            for i, tile in enumerate(tiles):
+                self.corridor_of[tile] = (cid, i)
+            if current != node:
+                self._add_edge(node, current, len(tiles) + 1, cid)
+
+    def _add_edge(self, u, v, cost, cid):
+        # بين نفس العقدتين نحتفظ بأقصر ممر فقط
+        existing = self.adjacency.get(u, {}).get(v)
+        if existing is None or cost < existing[0]:
+            self.adjacency.setdefault(u, {})[v] = (cost, cid)
+            self.adjacency.setdefault(v, {})[u] = (cost, cid)
+
+    def corridor_tiles(self, cid, a, b):
+        """البلاطات الداخلية لممر بالاتجاه من a إلى b"""
+        u, v, tiles = self.corridors[cid]
+        return tiles if u == a else tiles[::-1]
+
+    def view(self, start, goal):
+        """عرض للرسم مع ربط البداية والهدف مؤقتاً"""
+        return JunctionView(self, start, goal)
+
+    def search(self, algorithm, start, goal, **kwargs):
+        """
+        تشغيل خوارزمية على الرسم المقلّص وإرجاع مسار بلاطة ببلاطة
+
+        Args:
+            algorithm: أي خوارزمية بالتوقيع (gamemap, start, goal)
+            start: نقطة البداية (x, y)
+            goal: نقطة الهدف (x, y)
+
+        Returns:
+            قائمة بالمسار من البداية إلى الهدف
+        """
+        start, goal = tuple(start), tuple(goal)
+        if start == goal:
+            return [start]
+        if getattr(self.gamemap, 'version', None) != self.version:
+            self.rebuild()
+        if start not in self.neighbor_map or goal not in self.neighbor_map:
+            return []
+        view = self.view(start, goal)
+        nodes = algorithm(view, start, goal, **kwargs)
+        path = view.expand(nodes)
+        if isinstance(nodes, SearchResult):
+            return SearchResult(path, nodes.status, nodes.expanded)
+        return path
+
+    def stats(self):
+        return {
+            'tiles': len(self.neighbor_map),
+            'nodes': len(self.nodes),
+            'edges': sum(len(v) for v in self.adjacency.values()) // 2,
+            'corridors': len(self.corridors)
+        }
+
+
+class JunctionView:
+    """
+    واجهة شبيهة بـ GameMap فوق JunctionGraph: neighbors() تُرجع العقد
+    المجاورة وedge_cost() طول الممر. البداية والهدف يُضافان كعقد مؤقتة.
+    """
+
+    def __init__(self, graph, start, goal):
+        self.graph = graph
+        self.gamemap = graph.gamemap
+        self.version = graph.version
+        self.grid = self.gamemap.grid
+        self.extra = {}  # node -> {node: (التكلفة، البلاطات الداخلية)}
+        for point in (start, goal):
+            self._attach(point)
+        # البداية والهدف على نفس الممر: حافة مباشرة بينهما
+        if start in graph.corridor_of and goal in graph.corridor_of:
+            (c1, i), (c2, j) = graph.corridor_of[start], graph.corridor_of[goal]
+            if c1 == c2:
+                tiles = graph.corridors[c1][2]
+                between = tiles[i + 1:j] if i < j else tiles[j + 1:i][::-1]
+                self._link(start, goal, abs(i - j), between)
+
+    def _attach(self, point):
+        graph = self.graph
+        if point not in graph.corridor_of:
+            return
+        cid, i = graph.corridor_of[point]
+        u, v, tiles = graph.corridors[cid]
+        self._link(point, u, i + 1, tiles[:i][::-1])
+        self._link(point, v, len(tiles) - i, tiles[i + 1:])
+
+    def _link(self, a, b, cost, tiles):
+        current = self.extra.get(a, {}).get(b)
+        if current is None or cost < current[0]:
+            self.extra.setdefault(a, {})[b] = (cost, tiles)
+            self.extra.setdefault(b, {})[a] = (cost, tiles[::-1])
+
+    def neighbors(self, node):
+        extra = self.extra.get(node)
+        base = self.graph.node_neighbors.get(node, ())
+        if extra is None:
+            return base
+        return tuple(extra) + tuple(n for n in base if n not in extra)
+
+    def edge_cost(self, a, b):
+        extra = self.extra.get(a)
+        if extra is not None and b in extra:
+            return extra[b][0]
+        return self.graph.adjacency[a][b][0]
+
+    def in_bounds(self, pos):
+        return self.gamemap.in_bounds(pos)
+
+    def passable(self, pos):
+        return self.gamemap.passable(pos)
+
+    def segment(self, a, b):
+        """البلاطات الداخلية للحافة a -> b، أو None إن لم تكن حافة"""
+        extra = self.extra.get(a)
+        if extra is not None and b in extra:
+            return extra[b][1]
+        edge = self.graph.adjacency.get(a, {}).get(b)
+        if edge is None:
+            return None
+        return self.graph.corridor_tiles(edge[1], a, b)
+
+    def expand(self, nodes):
+        """تحويل مسار عقد إلى مسار بلاطات"""
+        if not nodes:
+            return []
+        path = [nodes[0]]
+        for a, b in zip(nodes, nodes[1:]):
+            tiles = self.segment(a, b)
+            if tiles is not None:  # Theta* قد يصل بين عقد بخط رؤية
+                path.extend(tiles)
+            path.append(b)
+        return path
+
+
+# خوارزميات تعتمد على شبكة البلاطات نفسها فتعمل عليها مباشرة
+GRID_ONLY = (jump_point_search, hpa_star)
+
+_graphs = weakref.WeakKeyDictionary()
+
+
+def junction_graph(gamemap):
+    """رسم التقاطعات الخاص بالخريطة (يُبنى مرة واحدة لكل خريطة)"""
+    graph = _graphs.get(gamemap)
+    if graph is None:
+        graph = JunctionGraph(gamemap)
+        _graphs[gamemap] = graph
+    elif graph.version != getattr(gamemap, 'version', None):
+        graph.rebuild()
+    return graph
+
+
+def on_junction_graph(algorithm):
+    """
+    تغليف خوارزمية لتبحث على رسم التقاطعات بنفس التوقيع
+
+        path = on_junction_graph(astar)(gamemap, start, goal)
+
+    Args:
+        algorithm: خوارزمية بالتوقيع (gamemap, start, goal)
+
+    Returns:
+        دالة بنفس التوقيع تُرجع مسار بلاطات
+    """
+    if algorithm in GRID_ONLY:
+        return algorithm
+
+    def wrapper(gamemap, start, goal, **kwargs):
+        return junction_graph(gamemap).search(algorithm, start, goal, **kwargs)
+
+    wrapper.__name__ = getattr(algorithm, '__name__', 'algorithm')
+    wrapper.__doc__ = algorithm.__doc__
+    return wrapper
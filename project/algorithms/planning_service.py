@@ -0,0 +1,294 @@
+"""
+خدمة تخطيط غير متزامنة: البحث عن المسارات في مجمّع خيوط أو عمليات
+
+نفس واجهة PathScheduler، فالشبح لا يعرف الفرق:
+
+    service = PlanningService(gamemap, workers=2, mode='process')
+    ghost = Ghost(..., scheduler=service)
+    ...
+    for g in ghosts:
+        g.update(player_pos)      # يرسل الطلبات فقط
+    service.run()                 # يسلّم المسارات الجاهزة دون انتظار
+    ...
+    service.close()
+
+في وضع 'thread' تتقاسم الخيوط قفل المفسّر (GIL) مع حلقة الرسم، فالإطار لا
+يتجمد لكن البحث لا يصبح أسرع؛ وضع 'process' يُشغِّل البحث فعلياً على
+أنوية أخرى وكل عامل يحمل نسخته من الخريطة.
+"""
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+THREAD = 'thread'
+PROCESS = 'process'
+
+# خريطة كل عملية عاملة (تُنسخ مرة واحدة عند بدء المجمّع)
+_worker_map = None
+
+
+def _init_worker(gamemap):
+    global _worker_map
+    _worker_map = gamemap
+
+
+def _plan(algorithm, gamemap, start, goal):
+    """البحث داخل العامل: يُرجع (المسار، زمن البحث بالثواني)"""
+    if gamemap is None:
+        gamemap = _worker_map
+    t0 = time.perf_counter()
+    path = algorithm(gamemap, start, goal)
+    if not isinstance(path, list):
+        path = list(path)
+    return path, time.perf_counter() - t0
+
+
+class _Request:
+    __slots__ = ('start', 'goal', 'future', 'submitted', 'cache_key', 'discard')
+
+    def __init__(self, start, goal, future, submitted, cache_key=None):
+        self.start = start
+        self.goal = goal
+        self.future = future
+        self.submitted = submitted
+        self.cache_key = cache_key
+        self.discard = False  # أُلغي أثناء التنفيذ: نتيجته تُهمل عند انتهائه
+
+
+class PlanningService:
+    """
+    طلبات مسارات الأشباح تُنفَّذ في الخلفية وتُسلَّم في إطار لاحق
+
+    لكل شبح طلب واحد على الأكثر قيد التنفيذ. إن تغيّر الهدف قبل أن يبدأ
+    الطلب أُلغي واستُبدل، وإن كان قد بدأ فآخر هدف يُحفظ ويُرسل عند انتهائه،
+    والنتيجة القديمة تُهمل إلا إذا لم يكن لدى الشبح أي مسار يسير عليه.
+    الطلب الملغى أثناء تنفيذه يبقى مسجلاً حتى ينتهي، فلا يعمل بحثان للشبح
+    نفسه في وقت واحد (المخطط التزايدي له حالة مشتركة لا تحتمل ذلك).
+    """
+
+    def __init__(self, gamemap, workers=None, mode=THREAD, history=1000):
+        """
+        Args:
+            gamemap: خريطة اللعبة (تُرسل نسخة منها لكل عملية في وضع process)
+            workers: عدد العمال (افتراضي: عدد الأنوية ناقص واحد، وعلى الأقل 1)
+            mode: 'thread' أو 'process'
+            history: عدد قياسات زمن الانتظار المحفوظة للإحصاءات
+        """
+        if mode not in (THREAD, PROCESS):
+            raise ValueError(f"Unknown mode: {mode}")
+        self.gamemap = gamemap
+        self.mode = mode
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self._executor = None
+        self._version = None
+        self._inflight = {}   # ghost -> _Request
+        self._latest = {}     # ghost -> (start, goal) ينتظر انتهاء الطلب الجاري
+        self._ready = []      # إصابات ذاكرة المسارات تُسلَّم في run التالي
+        self.latencies = deque(maxlen=history)    # من الإرسال حتى التسليم (ثوانٍ)
+        self.service_times = deque(maxlen=history)  # زمن البحث داخل العامل
+        self.submitted = 0
+        self.delivered = 0
+        self.cancelled = 0
+        self.dropped = 0
+        self.errors = 0
+        self.peak_queue_depth = 0
+        self._depth_total = 0
+        self._depth_samples = 0
+
+    def __len__(self):
+        return len(self._inflight)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _pool(self):
+        """المجمّع الحالي، ويُعاد إنشاؤه في وضع process إذا تغيرت الخريطة"""
+        version = getattr(self.gamemap, 'version', None)
+        if self._executor is not None and (self.mode == THREAD or version == self._version):
+            return self._executor
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        if self.mode == PROCESS:
+            self._executor = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                                 initargs=(self.gamemap,))
+        else:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='planner')
+        self._version = version
+        return self._executor
+
+    def _submit(self, ghost, start, goal):
+        algorithm = ghost.algorithm
+        key = None
+        planner = getattr(ghost, 'planner', None)
+        if planner is not None:
+            if self.mode == PROCESS:
+                # المخطط التزايدي له حالة داخل هذه العملية فلا يمكن نقله
+                self._ready.append((ghost, start, goal, planner.plan(start, goal)))
+                return
+            algorithm = lambda _, s, g: planner.plan(s, g)
+        elif getattr(algorithm, 'cache', None) is not None:
+            # ذاكرة المسارات ليست آمنة للخيوط: تُقرأ وتُكتب من الخيط الرئيسي فقط
+            key = algorithm.cache_key(ghost.gamemap, start, goal)
+            path = algorithm.cache.get(key)
+            if path is not None:
+                self._ready.append((ghost, start, goal, path))
+                return
+            algorithm = algorithm.__wrapped__
+
+        pool = self._pool()
+        if self.mode == PROCESS:
+            future = pool.submit(_plan, algorithm, None, start, goal)
+        else:
+            future = pool.submit(_plan, algorithm, ghost.gamemap, start, goal)
+        self._inflight[ghost] = _Request(start, goal, future, time.perf_counter(), key)
+        self.submitted += 1
+        depth = len(self._inflight)
+        if depth > self.peak_queue_depth:
+            self.peak_queue_depth = depth
+
+    def request(self, ghost, start, goal):
+        """
+        طلب مسار للشبح (غير حاجب)
+
+        Args:
+            ghost: الشبح (يستلم المسار عبر ghost.receive_path)
+            start: موضع البداية
+            goal: الهدف
+        """
+        start, goal = tuple(start), tuple(goal)
+        current = self._inflight.get(ghost)
+        if current is None:
+            self._submit(ghost, start, goal)
+        elif current.discard:
+            # بحث ملغى ما زال يعمل: يُرسل الطلب الجديد بعد انتهائه
+            self._latest[ghost] = (start, goal)
+        elif current.goal == goal:
+            self._latest.pop(ghost, None)
+        elif current.future.cancel():
+            # لم يبدأ بعد: يُستبدل مباشرة
+            del self._inflight[ghost]
+            self.cancelled += 1
+            self._submit(ghost, start, goal)
+        else:
+            self._latest[ghost] = (start, goal)
+
+    def pending(self, ghost):
+        """هل للشبح طلب لم يُسلَّم بعد"""
+        request = self._inflight.get(ghost)
+        return request is not None and (not request.discard or ghost in self._latest)
+
+    def cancel(self, ghost):
+        """
+        إلغاء طلب الشبح؛ إن كان قيد التنفيذ يبقى حتى ينتهي ونتيجته تُهمل
+        """
+        self._latest.pop(ghost, None)
+        self._ready = [item for item in self._ready if item[0] is not ghost]
+        request = self._inflight.get(ghost)
+        if request is None or request.discard:
+            return
+        if request.future.cancel():
+            del self._inflight[ghost]
+            self.cancelled += 1
+        else:
+            request.discard = True
+            self.dropped += 1
+
+    def clear(self):
+        for ghost in list(self._inflight):
+            self.cancel(ghost)
+        self._latest.clear()
+        self._ready.clear()
+
+    def run(self, budget_ms=None):
+        """
+        تسليم المسارات الجاهزة (لا ينتظر أي عامل)
+
+        Args:
+            budget_ms: غير مستخدم، للتوافق مع PathScheduler.run
+
+        Returns:
+            عدد المسارات التي سُلِّمت
+        """
+        delivered = 0
+        ready, self._ready = self._ready, []
+        for ghost, start, goal, path in ready:
+            ghost.receive_path(start, goal, path)
+            delivered += 1
+
+        now = time.perf_counter()
+        for ghost, request in list(self._inflight.items()):
+            if not request.future.done():
+                continue
+            del self._inflight[ghost]
+            latest = self._latest.pop(ghost, None)
+            try:
+                path, seconds = request.future.result()
+            except Exception:
+                self.errors += 1
+                path = None
+            else:
+                self.service_times.append(seconds)
+                if request.cache_key is not None:
+                    ghost.algorithm.cache.put(request.cache_key, path)
+
+            if request.discard:
+                path = None
+            # الهدف تغيّر أثناء البحث: النتيجة قديمة
+            stale = latest is not None
+            if path is not None and (not stale or not ghost.path):
+                ghost.receive_path(request.start, request.goal, path)
+                self.latencies.append(now - request.submitted)
+                delivered += 1
+            elif path is not None:
+                self.dropped += 1
+            if latest is not None:
+                self._submit(ghost, *latest)
+
+        self.delivered += delivered
+        self._depth_total += len(self._inflight)
+        self._depth_samples += 1
+        return delivered
+
+    def close(self):
+        """إيقاف العمال وإلغاء الطلبات المعلقة"""
+        self.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self):
+        """
+        عمق الطابور وأزمنة الانتظار لتحديد حجم المجمّع
+
+        Returns:
+            dict: العدّادات، وعمق الطابور الحالي والأقصى والمتوسط، وزمن الانتظار
+                (من الإرسال حتى التسليم) وزمن البحث بالميلي ثانية
+        """
+        latencies = sorted(self.latencies)
+        service = list(self.service_times)
+
+        def ms(values, q):
+            if not values:
+                return 0.0
+            return values[min(len(values) - 1, int(len(values) * q))] * 1000
+
+        return {
+            'mode': self.mode,
+            'workers': self.workers,
+            'submitted': self.submitted,
+            'delivered': self.delivered,
+            'cancelled': self.cancelled,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'queue_depth': len(self._inflight),
+            'peak_queue_depth': self.peak_queue_depth,
+            'mean_queue_depth': self._depth_total / self._depth_samples if self._depth_samples else 0.0,
+            'latency_p50_ms': ms(latencies, 0.50),
+            'latency_p95_ms': ms(latencies, 0.95),
+            'latency_max_ms': latencies[-1] * 1000 if latencies else 0.0,
+            'service_mean_ms': sum(service) / len(service) * 1000 if service else 0.0
+        }
@@ -0,0 +1,201 @@
+"""
+جدولة البحث عن المسارات بميزانية زمنية لكل إطار
+
+بدل أن تعيد كل الأشباح التخطيط في نفس الإطار، يطلب كل شبح مساراً من
+المُجدوِل ويواصل السير على مساره القديم حتى يصله المسار الجديد:
+
+    scheduler = PathScheduler(budget_ms=2.0, policy='priority')
+    ghost = Ghost(..., scheduler=scheduler)
+    ...
+    for g in ghosts:
+        g.update(player_pos)      # يسجّل الطلبات فقط
+    scheduler.run()               # يُنفّذ ما تسمح به الميزانية
+"""
+import time
+from collections import OrderedDict
+
+from .astar import astar, astar_stepwise
+from .base import heuristic_manhattan
+
+ROUND_ROBIN = 'round_robin'
+PRIORITY = 'priority'
+
+# خوارزميات لها نسخة مولِّدة يمكن إيقافها واستئنافها
+STEPWISE = {astar: astar_stepwise}
+
+
+class _Job:
+    """طلب مسار لشبح واحد: البداية والهدف والبحث الجاري (إن بدأ)"""
+    __slots__ = ('ghost', 'start', 'goal', 'search', 'frame')
+
+    def __init__(self, ghost, start, goal, frame):
+        self.ghost = ghost
+        self.start = start
+        self.goal = goal
+        self.search = None
+        self.frame = frame  # أول إطار يمكن أن يُخدم فيه الطلب
+
+
+class PathScheduler:
+    """
+    مُجدوِل مشترك بين الأشباح يوزّع إعادة التخطيط على عدة إطارات
+
+    - round_robin: الطلبات تُخدم بترتيب وصولها، والشبح الذي استلم مساره
+      يعود إلى آخر الطابور عند طلبه التالي
+    - priority: الأقرب إلى اللاعب أولاً (مسافة مانهاتن بين البداية والهدف)
+
+    البحث الذي لا تكفيه ميزانية الإطار يُوقَف ويُستأنف في الإطار التالي
+    (للخوارزميات التي لها نسخة في STEPWISE)، والباقي يُنفَّذ دفعة واحدة.
+    """
+
+    def __init__(self, budget_ms=2.0, policy=ROUND_ROBIN, chunk=64):
+        """
+        Args:
+            budget_ms: زمن البحث المسموح به في كل استدعاء لـ run (ميلي ثانية)
+            policy: 'round_robin' أو 'priority'
+            chunk: عدد العقد الموسَّعة بين كل فحص للميزانية
+        """
+        if policy not in (ROUND_ROBIN, PRIORITY):
+            raise ValueError(f"Unknown policy: {policy}")
+        self.budget_ms = budget_ms
+        self.policy = policy
+        self.chunk = chunk
+        self._jobs = OrderedDict()  # ghost -> _Job بترتيب الوصول
+        self.frames = 0
+        self.completed = 0
+        self.superseded = 0
+        self.resumed = 0
+        self.max_frame_ms = 0.0
+        self.max_wait_frames = 0
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def request(self, ghost, start, goal):
+        """
+        طلب مسار للشبح (يستبدل طلبه السابق إن لم يبدأ بعد)
+
+        البحث الذي بدأ فعلاً لا يُلغى: يُسلَّم مساره ثم يطلب الشبح من جديد
+        إن تغير الهدف، وإلا فلن ينتهي بحث طويل أبداً والهدف يتحرك.
+        """
+        start, goal = tuple(start), tuple(goal)
+        job = self._jobs.get(ghost)
+        if job is None:
+            self._jobs[ghost] = _Job(ghost, start, goal, self.frames + 1)
+        elif job.search is None and (job.start, job.goal) != (start, goal):
+            job.start, job.goal = start, goal
+            self.superseded += 1
+
+    def pending(self, ghost):
+        """هل للشبح طلب لم يُسلَّم بعد"""
+        return ghost in self._jobs
+
+    def cancel(self, ghost):
+        """إلغاء طلب الشبح (مثلاً عند إعادة إحيائه)"""
+        job = self._jobs.pop(ghost, None)
+        if job is not None and job.search is not None:
+            job.search.close()
+
+    def clear(self):
+        for ghost in list(self._jobs):
+            self.cancel(ghost)
+
+    def close(self):
+        """للتوافق مع PlanningService.close"""
+        self.clear()
+
+    def _order(self):
+        jobs = list(self._jobs.values())
+        if self.policy == PRIORITY:
+            jobs.sort(key=lambda job: heuristic_manhattan(job.ghost.pos, job.goal))
+        return jobs
+
+    def _search(self, ghost, start, goal):
+        """مولِّد البحث: يتوقف بين الدفعات ويُرجع المسار (قيمة StopIteration)"""
+        planner = getattr(ghost, 'planner', None)
+        if planner is not None:
+            return planner.plan(start, goal)
+
+        algorithm = ghost.algorithm
+        gamemap = ghost.gamemap
+        stepwise = STEPWISE.get(getattr(algorithm, '__wrapped__', algorithm))
+        if stepwise is None:
+            return algorithm(gamemap, start, goal)
+
+        # ذاكرة المسارات المشتركة (PathCache.wrap) تبقى فعّالة
+        cache = getattr(algorithm, 'cache', None)
+        if cache is not None:
+            key = algorithm.cache_key(gamemap, start, goal)
+            path = cache.get(key)
+            if path is not None:
+                return path
+        path = yield from stepwise(gamemap, start, goal, self.chunk)
+        if cache is not None:
+            cache.put(key, path)
+        return path
+
+    def run(self, budget_ms=None):
+        """
+        تنفيذ الطلبات حتى نفاد ميزانية هذا الإطار
+
+        يُنفَّذ دائماً جزء واحد على الأقل حتى لا يتوقف التقدم عندما تكون
+        الميزانية أصغر من دفعة واحدة.
+
+        Returns:
+            عدد المسارات التي سُلِّمت في هذا الإطار
+        """
+        budget = (self.budget_ms if budget_ms is None else budget_ms) / 1000
+        t0 = time.perf_counter()
+        deadline = t0 + budget
+        delivered = 0
+        worked = False
+        self.frames += 1
+
+        for job in self._order():
+            now = time.perf_counter()
+            if worked and now >= deadline:
+                break
+            worked = True
+            if job.search is None:
+                job.search = self._search(job.ghost, job.start, job.goal)
+            else:
+                self.resumed += 1
+
+            path = None
+            try:
+                while True:
+                    next(job.search)
+                    if time.perf_counter() >= deadline:
+                        break   # يُستأنف في الإطار التالي
+            except StopIteration as done:
+                path = done.value
+
+            job.ghost.last_plan_time = (getattr(job.ghost, 'last_plan_time', 0.0)
+                                        + time.perf_counter() - now)
+            if path is not None:
+                del self._jobs[job.ghost]
+                self.completed += 1
+                delivered += 1
+                wait = self.frames - job.frame
+                if wait > self.max_wait_frames:
+                    self.max_wait_frames = wait
+                job.ghost.receive_path(job.start, job.goal, path)
+
+        frame_ms = (time.perf_counter() - t0) * 1000
+        if frame_ms > self.max_frame_ms:
+            self.max_frame_ms = frame_ms
+        return delivered
+
+    def stats(self):
+        """عدّادات المُجدوِل"""
+        return {
+            'policy': self.policy,
+            'budget_ms': self.budget_ms,
+            'frames': self.frames,
+            'pending': len(self._jobs),
+            'completed': self.completed,
+            'superseded': self.superseded,
+            'resumed': self.resumed,
+            'max_frame_ms': self.max_frame_ms,
+            'max_wait_frames': self.max_wait_frames
+        }
@@ -0,0 +1,164 @@
+"""
+نظام خط الرؤية: ذاكرة مؤقتة لنتائج line_of_sight وجداول فراغ الصفوف والأعمدة
+"""
+import weakref
+
+
+def line_of_sight(gamemap, a, b):
+    """
+    التحقق من وجود خط رؤية مباشر بين نقطتين
+    """
+    x0, y0 = a
+    x1, y1 = b
+
+    dx = abs(x1 - x0)
+    dy = abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+    err = dx - dy
+
+    x, y = x0, y0
+
+    while True:
+        if not gamemap.passable((x, y)):
+            return False
+
+        if x == x1 and y == y1:
+            return True
+
+        e2 = 2 * err
+        if e2 > -dy:
+            err -= dy
+            x += sx
+        if e2 < dx:
+            err += dx
+            y += sy
+
+
+class VisibilityCache:
+    """
+    خط رؤية لخريطة واحدة بتكلفة O(1) في أغلب الاستعلامات:
+
+    - الخطوط الأفقية والعمودية تُجاب من جداول الفراغ: عدد البلاطات
+      المفتوحة المتتالية يميناً (row_clear) وأسفل (col_clear) من كل بلاطة.
+    - باقي الخطوط تُحسب بـ Bresenham مرة واحدة وتُخزّن بمفتاح (a, b).
+
+    الذاكرة تُفرَّغ عند تغير إصدار الخريطة أو عند بلوغ maxsize.
+    """
+
+    def __init__(self, gamemap, maxsize=100000, clearance=True):
+        """
+        Args:
+            gamemap: خريطة اللعبة
+            maxsize: أقصى عدد من النتائج المخزّنة
+            clearance: بناء جداول فراغ الصفوف والأعمدة
+        """
+        self.gamemap = gamemap
+        self.maxsize = maxsize
+        self.clearance = clearance
+        self.axis_hits = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.reset()
+
+    def reset(self):
+        """إعادة بناء الجداول وتفريغ الذاكرة"""
+        gamemap = self.gamemap
+        self.version = getattr(gamemap, 'version', None)
+        self._memo = {}
+        self.width = len(gamemap.grid[0]) if gamemap.grid else 0
+        self.height = len(gamemap.grid)
+        self.row_clear = self.col_clear = None
+        if self.clearance:
+            self._build_clearance()
+
+    def _build_clearance(self):
+        w, h = self.width, self.height
+        passable = self.gamemap.passable
+        open_cells = [passable((x, y)) for y in range(h) for x in range(w)]
+        row = [0] * (w * h)
+        col = [0] * (w * h)
+        for y in range(h - 1, -1, -1):
+            for x in range(w - 1, -1, -1):
+                i = y * w + x
+                if open_cells[i]:
+                    row[i] = 1 + (row[i + 1] if x + 1 < w else 0)
+                    col[i] = 1 + (col[i + w] if y + 1 < h else 0)
+        self.row_clear = row
+        self.col_clear = col
+
+    def line_of_sight(self, a, b):
+        """
+        نفس نتيجة line_of_sight(gamemap, a, b) مع التخزين المؤقت
+
+        Args:
+            a: نقطة البداية (x, y)
+            b: نقطة النهاية (x, y)
+
+        Returns:
+            True إن كان الخط بينهما مفتوحاً
+        """
+        if getattr(self.gamemap, 'version', None) != self.version:
+            self.reset()
+
+        if self.row_clear is not None:
+            x0, y0 = a
+            x1, y1 = b
+            w = self.width
+            if 0 <= x0 < w and 0 <= x1 < w and 0 <= y0 < self.height and 0 <= y1 < self.height:
+                if y0 == y1:
+                    self.axis_hits += 1
+                    return self.row_clear[y0 * w + min(x0, x1)] > abs(x1 - x0)
+                if x0 == x1:
+                    self.axis_hits += 1
+                    return self.col_clear[min(y0, y1) * w + x0] > abs(y1 - y0)
+
+        key = (a, b)
+        result = self._memo.get(key)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = line_of_sight(self.gamemap, a, b)
+        if len(self._memo) >= self.maxsize:
+            self._memo.clear()
+            self.evictions += 1
+        self._memo[key] = result
+        return result
+
+    def stats(self):
+        """
+        إحصائيات الاستخدام
+
+        Returns:
+            قاموس بعدد الاستعلامات ونسب الإصابة
+        """
+        queries = self.axis_hits + self.hits + self.misses
+        return {
+            'queries': queries,
+            'axis_hits': self.axis_hits,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._memo),
+            'maxsize': self.maxsize,
+            'hit_rate': (self.axis_hits + self.hits) / queries if queries else 0.0
+        }
+
+
+_caches = weakref.WeakKeyDictionary()
+
+
+def visibility(gamemap):
+    """
+    ذاكرة خط الرؤية الخاصة بالخريطة (واحدة لكل خريطة)
+
+    العروض فوق الخريطة (مثل JunctionView) تشارك ذاكرة خريطتها الأصلية.
+    """
+    gamemap = getattr(gamemap, 'gamemap', gamemap)
+    cache = _caches.get(gamemap)
+    if cache is None:
+        cache = VisibilityCache(gamemap)
+        _caches[gamemap] = cache
+    return cache
@@ -0,0 +1,437 @@
+"""
+مساحة عمل بحث قابلة لإعادة الاستخدام: مصفوفات مُخصَّصة مسبقاً بمعرّف البلاطة
+"""
+import heapq
+import sys
+import threading
+import tracemalloc
+import weakref
+from array import array
+from collections import deque
+
+from .instrumentation import current_stats
+
+# عدد القواميس (بمفاتيح tuple) التي تنشئها النسخة العادية من كل خوارزمية
+DICTS_PER_CELL = {'astar': 3, 'dijkstra': 2, 'bfs': 1, 'dfs': 1, 'greedy': 1}
+MAX_GENERATION = 0xFFFFFFFF
+
+
+class SearchWorkspace:
+    """
+    مصفوفات g وparent وختم الجيل لكل بلاطة في الخريطة المُجمَّعة.
+
+    كل استعلام يأخذ جيلاً جديداً؛ البلاطة التي ختمها لا يساوي الجيل الحالي
+    تُعامل كأنها لم تُزر، فلا حاجة لتفريغ المصفوفات بين الاستعلامات.
+    """
+
+    def __init__(self, gamemap):
+        self.gamemap = gamemap
+        self.queries = 0
+        self.cells_touched = 0
+        self.entries_avoided = 0
+        self.reset()
+
+    def reset(self):
+        """تخصيص المصفوفات من جديد لإصدار الخريطة الحالي"""
+        self.version = getattr(self.gamemap, 'version', None)
+        self.compiled = self.gamemap.compile()
+        size = self.compiled.size
+        self.stamp = array('I', bytes(4 * size))
+        self.g = array('i', bytes(4 * size))
+        self.parent = array('i', bytes(4 * size))
+        # صفوف CSR كـ tuple، تُملأ للبلاطات التي يوسّعها بحث فقط
+        # (بدل compiled.adjacency الذي يبني الجدول كاملاً)
+        self.rows = [None] * size
+        self.generation = 0
+
+    def begin(self):
+        """
+        بدء استعلام جديد
+
+        Returns:
+            رقم الجيل الخاص بالاستعلام
+        """
+        if getattr(self.gamemap, 'version', None) != self.version:
+            self.reset()
+        if self.generation == MAX_GENERATION:
+            self.stamp = array('I', bytes(4 * self.compiled.size))
+            self.generation = 0
+        self.generation += 1
+        self.queries += 1
+        return self.generation
+
+    def finish(self, kind, touched):
+        """تسجيل عدد البلاطات التي لمسها الاستعلام"""
+        self.cells_touched += touched
+        self.entries_avoided += touched * DICTS_PER_CELL[kind]
+
+    def cell(self, pos):
+        """معرّف البلاطة أو -1 إن كانت خارج الخريطة"""
+        compiled = self.compiled
+        x, y = pos
+        if 0 <= x < compiled.width and 0 <= y < compiled.height:
+            return y * compiled.width + x
+        return -1
+
+    def path_to(self, cid):
+        """إعادة بناء المسار من مصفوفة parent"""
+        positions = self.compiled.positions
+        parent = self.parent
+        path = []
+        while cid >= 0:
+            path.append(positions[cid])
+            cid = parent[cid]
+        path.reverse()
+        return path
+
+    def stats(self):
+        """
+        إحصائيات التوفير
+
+        Returns:
+            قاموس بعدد الاستعلامات والبلاطات الملموسة ومدخلات القواميس
+            التي لم تُنشأ وحجم المصفوفات المُعاد استخدامها
+        """
+        return {
+            'queries': self.queries,
+            'cells_touched': self.cells_touched,
+            'dict_entries_avoided': self.entries_avoided,
+            'workspace_bytes': sum(a.itemsize * len(a) for a in (self.stamp, self.g, self.parent))
+            + sys.getsizeof(self.rows)
+        }
+
+
+# مساحة لكل خيط ولكل خريطة: الاستعلامات المتزامنة لا تتشارك المصفوفات
+_local = threading.local()
+
+
+def get_workspace(gamemap):
+    """مساحة العمل الخاصة بالخريطة في الخيط الحالي"""
+    workspaces = getattr(_local, 'workspaces', None)
+    if workspaces is None:
+        workspaces = _local.workspaces = weakref.WeakKeyDictionary()
+    workspace = workspaces.get(gamemap)
+    if workspace is None:
+        workspace = SearchWorkspace(gamemap)
+        workspaces[gamemap] = workspace
+    return workspace
+
+
+def astar_workspace(gamemap, start, goal):
+    """
+    خوارزمية A* على مساحة العمل المشتركة (نفس توقيع astar)
+
+    Args:
+        gamemap: خريطة اللعبة
+        start: نقطة البداية (x, y)
+        goal: نقطة الهدف (x, y)
+
+    Returns:
+        قائمة بالمسار من البداية إلى الهدف
+    """
+    if start == goal:
+        return [start]
+    ws = get_workspace(gamemap)
+    gen = ws.begin()
+    s, t = ws.cell(start), ws.cell(goal)
+    if s < 0 or t < 0:
+        return []
+
+    stamp, g_score, parent = ws.stamp, ws.g, ws.parent
+    rows, offsets, targets = ws.rows, ws.compiled.offsets, ws.compiled.targets
+    width = ws.compiled.width
+    gx, gy = goal
+    stamp[s] = gen
+    g_score[s] = 0
+    parent[s] = -1
+    touched = 1
+    stats = current_stats()
+    open_set = [(abs(start[0] - gx) + abs(start[1] - gy), 0, s)]
+
+    while open_set:
+        _, g, current = heapq.heappop(open_set)
+        if stats is not None:
+            stats.heap_pops += 1
+        if current == t:
+            ws.finish('astar', touched)
+            return ws.path_to(t)
+        if g > g_score[current]:
+            continue
+
+        g += 1
+        row = rows[current]
+        if row is None:
+            row = rows[current] = tuple(targets[offsets[current]:offsets[current + 1]])
+        if stats is not None:
+            stats.expanded += 1
+            stats.generated += len(row)
+        for neighbor in row:
+            if stamp[neighbor] != gen:
+                stamp[neighbor] = gen
+                touched += 1
+            elif g >= g_score[neighbor]:
+                continue
+            g_score[neighbor] = g
+            parent[neighbor] = current
+            h = abs(neighbor % width - gx) + abs(neighbor // width - gy)
+            heapq.heappush(open_set, (g + h, g, neighbor))
+            if stats is not None:
+                stats.pushed(len(open_set))
+
+    ws.finish('astar', touched)
+    return []
+
+
+def dijkstra_workspace(gamemap, start, goal):
+    """
+    خوارزمية Dijkstra على مساحة العمل المشتركة (نفس توقيع dijkstra)
+
+    Args:
+        gamemap: خريطة اللعبة
+        start: نقطة البداية (x, y)
+        goal: نقطة الهدف (x, y)
+
+    Returns:
+        قائمة بالمسار من البداية إلى الهدف
+    """
+    if start == goal:
+        return [start]
+    ws = get_workspace(gamemap)
+    gen = ws.begin()
+    s, t = ws.cell(start), ws.cell(goal)
+    if s < 0 or t < 0:
+        return []
+
+    stamp, cost, parent = ws.stamp, ws.g, ws.parent
+    rows, offsets, targets = ws.rows, ws.compiled.offsets, ws.compiled.targets
+    stamp[s] = gen
+    cost[s] = 0
+    parent[s] = -1
+    touched = 1
+    stats = current_stats()
+    open_set = [(0, s)]
+
+    while open_set:
+        current_cost, current = heapq.heappop(open_set)
+        if stats is not None:
+            stats.heap_pops += 1
+        if current == t:
+            ws.finish('dijkstra', touched)
+            return ws.path_to(t)
+        if current_cost > cost[current]:
+            continue
+
+        new_cost = current_cost + 1
+        row = rows[current]
+        if row is None:
+            row = rows[current] = tuple(targets[offsets[current]:offsets[current + 1]])
+        if stats is not None:
+            stats.expanded += 1
+            stats.generated += len(row)
+        for neighbor in row:
+            if stamp[neighbor] != gen:
+                stamp[neighbor] = gen
+                touched += 1
+            elif new_cost >= cost[neighbor]:
+                continue
+            cost[neighbor] = new_cost
+            parent[neighbor] = current
+            heapq.heappush(open_set, (new_cost, neighbor))
+            if stats is not None:
+                stats.pushed(len(open_set))
+
+    ws.finish('dijkstra', touched)
+    return []
+
+
+def bfs_workspace(gamemap, start, goal):
+    """
+    خوارزمية BFS على مساحة العمل المشتركة (نفس توقيع bfs)
+
+    Args:
+        gamemap: خريطة اللعبة
+        start: نقطة البداية (x, y)
+        goal: نقطة الهدف (x, y)
+
+    Returns:
+        قائمة بالمسار من البداية إلى الهدف
+    """
+    if start == goal:
+        return [start]
+    ws = get_workspace(gamemap)
+    gen = ws.begin()
+    s, t = ws.cell(start), ws.cell(goal)
+    if s < 0 or t < 0:
+        return []
+
+    stamp, parent = ws.stamp, ws.parent
+    rows, offsets, targets = ws.rows, ws.compiled.offsets, ws.compiled.targets
+    stamp[s] = gen
+    parent[s] = -1
+    touched = 1
+    stats = current_stats()
+    queue = deque([s])
+
+    while queue:
+        current = queue.popleft()
+        if stats is not None:
+            stats.heap_pops += 1
+        if current == t:
+            ws.finish('bfs', touched)
+            return ws.path_to(t)
+        row = rows[current]
+        if row is None:
+            row = rows[current] = tuple(targets[offsets[current]:offsets[current + 1]])
+        if stats is not None:
+            stats.expanded += 1
+            stats.generated += len(row)
+        for neighbor in row:
+            if stamp[neighbor] != gen:
+                stamp[neighbor] = gen
+                parent[neighbor] = current
+                touched += 1
+                queue.append(neighbor)
+                if stats is not None:
+                    stats.pushed(len(queue))
+
+    ws.finish('bfs', touched)
+    return []
+
+
+def dfs_workspace(gamemap, start, goal):
+    """
+    خوارزمية DFS على مساحة العمل المشتركة (نفس توقيع dfs)
+
+    Args:
+        gamemap: خريطة اللعبة
+        start: نقطة البداية (x, y)
+        goal: نقطة الهدف (x, y)
+
+    Returns:
+        قائمة بالمسار من البداية إلى الهدف
+    """
+    if start == goal:
+        return [start]
+    ws = get_workspace(gamemap)
+    gen = ws.begin()
+    s, t = ws.cell(start), ws.cell(goal)
+    if s < 0 or t < 0:
+        return []
+
+    stamp, parent = ws.stamp, ws.parent
+    rows, offsets, targets = ws.rows, ws.compiled.offsets, ws.compiled.targets
+    stamp[s] = gen
+    parent[s] = -1
+    touched = 1
+    stats = current_stats()
+    stack = [s]
+
+    while stack:
+        current = stack.pop()
+        if stats is not None:
+            stats.heap_pops += 1
+        if current == t:
+            ws.finish('dfs', touched)
+            return ws.path_to(t)
+        row = rows[current]
+        if row is None:
+            row = rows[current] = tuple(targets[offsets[current]:offsets[current + 1]])
+        if stats is not None:
+            stats.expanded += 1
+            stats.generated += len(row)
+        for neighbor in row:
+            if stamp[neighbor] != gen:
+                stamp[neighbor] = gen
+                parent[neighbor] = current
+                touched += 1
+                stack.append(neighbor)
+                if stats is not None:
+                    stats.pushed(len(stack))
+
+    ws.finish('dfs', touched)
+    return []
+
+
+def greedy_workspace(gamemap, start, goal):
+    """
+    خوارزمية Greedy Best-First على مساحة العمل المشتركة
+    (نفس توقيع greedy_best_first)
+
+    Args:
+        gamemap: خريطة اللعبة
+        start: نقطة البداية (x, y)
+        goal: نقطة الهدف (x, y)
+
+    Returns:
+        قائمة بالمسار من البداية إلى الهدف
+    """
+    if start == goal:
+        return [start]
+    ws = get_workspace(gamemap)
+    gen = ws.begin()
+    s, t = ws.cell(start), ws.cell(goal)
+    if s < 0 or t < 0:
+        return []
+
+    stamp, parent = ws.stamp, ws.parent
+    rows, offsets, targets = ws.rows, ws.compiled.offsets, ws.compiled.targets
+    width = ws.compiled.width
+    gx, gy = goal
+    stamp[s] = gen
+    parent[s] = -1
+    touched = 1
+    stats = current_stats()
+    open_set = [(0, s)]
+
+    while open_set:
+        _, current = heapq.heappop(open_set)
+        if stats is not None:
+            stats.heap_pops += 1
+        if current == t:
+            ws.finish('greedy', touched)
+            return ws.path_to(t)
+        row = rows[current]
+        if row is None:
+            row = rows[current] = tuple(targets[offsets[current]:offsets[current + 1]])
+        if stats is not None:
+            stats.expanded += 1
+            stats.generated += len(row)
+        for neighbor in row:
+            if stamp[neighbor] != gen:
+                stamp[neighbor] = gen
+                parent[neighbor] = current
+                touched += 1
+                h = abs(neighbor % width - gx) + abs(neighbor // width - gy)
+                heapq.heappush(open_set, (h, neighbor))
+                if stats is not None:
+                    stats.pushed(len(open_set))
+
+    ws.finish('greedy', touched)
+    return []
+
+
+def measure_allocations(algorithm, gamemap, queries):
+    """
+    قياس ذروة الذاكرة المُخصَّصة أثناء تشغيل خوارزمية (عبر tracemalloc)
+
+    Args:
+        algorithm: الخوارزمية
+        gamemap: خريطة اللعبة
+        queries: قائمة (start, goal)
+
+    Returns:
+        قاموس بمتوسط ذروة البايتات المُخصَّصة لكل استعلام
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    peak_total = 0
+    for start, goal in queries:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        algorithm(gamemap, start, goal)
+        peak_total += tracemalloc.get_traced_memory()[1] - before
+    if not was_tracing:
+        tracemalloc.stop()
+    count = len(queries) or 1
+    return {'queries': len(queries), 'avg_peak_bytes': peak_total / count}
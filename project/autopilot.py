@@ -0,0 +1,283 @@
+"""
+طيار آلي للاعب - يختار الحركة من حقلي مسافات يُحدَّثان تزايدياً
+
+- PelletField: المسافة من كل خلية إلى أقرب كرة (BFS متعدد المصادر)، وعند
+  أكل كرة تُصلَح فقط الخلايا التي كانت تعتمد عليها بدل إعادة الحساب
+- DangerField: BFS محدود بنصف قطر من كل شبح، ولا يُعاد إلا للشبح الذي تحرك
+
+    pilot = Autopilot(state.game_map)
+    state.run(policy=pilot)
+"""
+import heapq
+import time
+from collections import deque
+from itertools import chain
+
+from map import DIRECTIONS
+
+UNREACHED = 1 << 30
+DANGER_WEIGHT = 10
+
+
+class PelletField:
+    """
+    distance[cid]: عدد الخطوات من الخلية cid إلى أقرب كرة (UNREACHED إن لم توجد)
+
+    أكل كرة لا يُنقص أي مسافة، فالإصلاح تناقصي: تُحدَّد الخلايا التي فقدت
+    كل جيرانها الداعمين (جار مسافته أقل بواحد) ثم تُعاد مسافاتها من حدود
+    المنطقة المتأثرة فقط.
+    """
+
+    def __init__(self, gamemap):
+        self.gamemap = gamemap
+        self.version = None
+        self.sources = set()
+        self.distance = []
+        self.rebuilds = 0
+        self.repairs = 0
+        self.repaired_cells = 0
+
+    def rebuild(self, positions):
+        """BFS متعدد المصادر من كل الكرات"""
+        compiled = self.gamemap.compile()
+        adjacency = compiled.adjacency
+        distance = [UNREACHED] * compiled.size
+        self.sources = set()
+        queue = deque()
+        for pos in positions:
+            cid = compiled.cell_id(pos)
+            if distance[cid] != 0:
+                distance[cid] = 0
+                self.sources.add(cid)
+                queue.append(cid)
+        while queue:
+            current = queue.popleft()
+            d = distance[current] + 1
+            for neighbor in adjacency[current]:
+                if distance[neighbor] > d:
+                    distance[neighbor] = d
+                    queue.append(neighbor)
+        self.distance = distance
+        self.version = getattr(self.gamemap, 'version', None)
+        self.rebuilds += 1
+
+    def remove(self, cid):
+        """
+        إزالة مصدر (كرة أُكلت) وإصلاح المسافات المتأثرة
+
+        Returns:
+            عدد الخلايا التي أُعيد حسابها
+        """
+        if cid not in self.sources:
+            return 0
+        self.sources.discard(cid)
+        adjacency = self.gamemap.compiled.adjacency
+        distance = self.distance
+
+        # 1) الخلايا التي فقدت كل داعميها، طبقة بعد طبقة من الكرة المأكولة
+        affected = {cid}
+        queue = deque([cid])
+        while queue:
+            current = queue.popleft()
+            d = distance[current] + 1
+            for neighbor in adjacency[current]:
+                if distance[neighbor] != d or neighbor in affected:
+                    continue
+                supported = False
+                for other in adjacency[neighbor]:
+                    if distance[other] == d - 1 and other not in affected:
+                        supported = True
+                        break
+                if not supported:
+                    affected.add(neighbor)
+                    queue.append(neighbor)
+
+        # 2) إعادة المسافات من الخلايا السليمة المجاورة للمنطقة
+        for current in affected:
+            distance[current] = UNREACHED
+        heap = []
+        for current in affected:
+            best = UNREACHED
+            for neighbor in adjacency[current]:
+                if distance[neighbor] + 1 < best:
+                    best = distance[neighbor] + 1
+            if best < UNREACHED:
+                distance[current] = best
+                heap.append((best, current))
+        heapq.heapify(heap)
+        while heap:
+            d, current = heapq.heappop(heap)
+            if d > distance[current]:
+                continue
+            for neighbor in adjacency[current]:
+                if d + 1 < distance[neighbor]:
+                    distance[neighbor] = d + 1
+                    heapq.heappush(heap, (d + 1, neighbor))
+
+        self.repairs += 1
+        self.repaired_cells += len(affected)
+        return len(affected)
+
+    def sync(self, pellets, power_pellets, hints=()):
+        """
+        مطابقة الحقل مع الكرات المتبقية
+
+        Args:
+            pellets: مجموعة الكرات العادية المتبقية
+            power_pellets: مجموعة الكرات الكبيرة المتبقية
+            hints: خلايا يُرجَّح أن كرة أُكلت فيها (موضع اللاعب)، تُفحص قبل
+                اللجوء إلى مقارنة كل الكرات
+        """
+        total = len(pellets) + len(power_pellets)
+        if (getattr(self.gamemap, 'version', None) != self.version
+                or total > len(self.sources)):
+            self.rebuild(chain(pellets, power_pellets))
+            return
+        if total == len(self.sources):
+            return
+        positions = self.gamemap.compiled.positions
+        for cid in hints:
+            pos = positions[cid]
+            if cid in self.sources and pos not in pellets and pos not in power_pellets:
+                self.remove(cid)
+        if total != len(self.sources):
+            # أُكلت كرة في موضع لم يُراقَب
+            compiled = self.gamemap.compiled
+            remaining = {compiled.cell_id(pos) for pos in chain(pellets, power_pellets)}
+            for cid in self.sources - remaining:
+                self.remove(cid)
+
+
+class DangerField:
+    """مسافات محدودة بـ radius من كل شبح غير خائف، تُحدَّث لمن تحرك فقط"""
+
+    def __init__(self, gamemap, radius=8):
+        self.gamemap = gamemap
+        self.radius = radius
+        self._cells = []   # خلية كل شبح عند آخر حساب (None للخائف)
+        self._fields = []  # {cid: distance} لكل شبح
+        self.searches = 0
+
+    def _bounded_bfs(self, root):
+        adjacency = self.gamemap.compiled.adjacency
+        field = {root: 0}
+        frontier = [root]
+        for d in range(1, self.radius + 1):
+            following = []
+            for current in frontier:
+                for neighbor in adjacency[current]:
+                    if neighbor not in field:
+                        field[neighbor] = d
+                        following.append(neighbor)
+            frontier = following
+        self.searches += 1
+        return field
+
+    def update(self, ghosts):
+        """إعادة الحقل فقط للأشباح التي تغيرت خليتها أو حالتها"""
+        compiled = self.gamemap.compile()
+        if len(self._cells) != len(ghosts):
+            self._cells = [None] * len(ghosts)
+            self._fields = [{} for _ in ghosts]
+        for i, ghost in enumerate(ghosts):
+            cid = None if ghost.state == "FRIGHTENED" else compiled.cell_id(ghost.pos)
+            if cid == self._cells[i]:
+                continue
+            self._cells[i] = cid
+            self._fields[i] = {} if cid is None else self._bounded_bfs(cid)
+
+    def distance(self, cid):
+        """أقرب شبح إلى الخلية (radius + 1 إن كانت كلها أبعد)"""
+        best = self.radius + 1
+        for field in self._fields:
+            d = field.get(cid)
+            if d is not None and d < best:
+                best = d
+        return best
+
+
+class Autopilot:
+    """
+    سياسة للاعب بالتوقيع policy(state) -> action (كما في GameState.run)
+
+    تختار الجار الذي يقلل: المسافة إلى أقرب كرة + عقوبة القرب من الأشباح
+    (DANGER_WEIGHT لكل خطوة أقل من safe_distance، والخلية الملاصقة لشبح
+    ممنوعة ما دام هناك بديل).
+    """
+
+    def __init__(self, gamemap, danger_radius=8, safe_distance=3):
+        """
+        Args:
+            gamemap: خريطة اللعبة
+            danger_radius: نصف قطر BFS حول كل شبح
+            safe_distance: المسافة التي لا عقوبة بعدها
+        """
+        self.danger_radius = danger_radius
+        self.safe_distance = safe_distance
+        self.reset(gamemap)
+        self.decisions = 0
+        self.decision_time = 0.0
+        self.max_decision_time = 0.0
+
+    def reset(self, gamemap):
+        """البدء من جديد على خريطة أخرى (الحقلان يُبنيان في القرار التالي)"""
+        self.gamemap = gamemap
+        self.pellets = PelletField(gamemap)
+        self.danger = DangerField(gamemap, self.danger_radius)
+
+    def __call__(self, state):
+        t0 = time.perf_counter()
+        game_map = state.game_map
+        if game_map is not self.gamemap:
+            self.reset(game_map)
+        here = game_map.compile().cell_id(state.player.pos)
+        self.pellets.sync(game_map.pellets, game_map.power_pellets, (here,))
+        self.danger.update(state.ghosts)
+        action = self.choose_action(state.player.pos)
+
+        elapsed = time.perf_counter() - t0
+        self.decisions += 1
+        self.decision_time += elapsed
+        if elapsed > self.max_decision_time:
+            self.max_decision_time = elapsed
+        return action
+
+    def choose_action(self, pos):
+        """
+        أفضل اتجاه من pos حسب الحقلين الحاليين
+
+        Returns:
+            (dx, dy) أو None إن لم تكن هناك حركة ممكنة
+        """
+        compiled = self.gamemap.compiled
+        w = compiled.width
+        here = compiled.cell_id(pos)
+        distance = self.pellets.distance
+        best, best_score = None, None
+        for dx, dy in DIRECTIONS:
+            x, y = pos[0] + dx, pos[1] + dy
+            if not (0 <= x < w and 0 <= y < compiled.height):
+                continue
+            cid = here + dx + dy * w
+            if not compiled.walkable[cid]:
+                continue
+            danger = self.danger.distance(cid)
+            if danger <= 1:
+                score = UNREACHED - danger
+            else:
+                score = distance[cid] + DANGER_WEIGHT * max(0, self.safe_distance - danger)
+            if best_score is None or score < best_score:
+                best, best_score = (dx, dy), score
+        return best
+
+    def stats(self):
+        """عدّادات الحقول وزمن القرار"""
+        return {
+            'decisions': self.decisions,
+            'mean_decision_ms': self.decision_time / self.decisions * 1000 if self.decisions else 0.0,
+            'max_decision_ms': self.max_decision_time * 1000,
+            'pellet_rebuilds': self.pellets.rebuilds,
+            'pellet_repairs': self.pellets.repairs,
+            'repaired_cells': self.pellets.repaired_cells,
+            'danger_searches': self.danger.searches
+        }
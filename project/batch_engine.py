@@ -0,0 +1,202 @@
+"""
+محاكي دفعات متجه (NumPy) - يتقدم بـ B لعبة مستقلة على نفس الخريطة في استدعاء واحد
+
+نفس قواعد GameState لكن كل الحالة في مصفوفات: مواضع اللاعب والأشباح،
+خرائط الكرات، الأرواح ومؤقتات الخوف. حركة الأشباح تُقرأ من جدول الخطوات
+التالية (DistanceTable) بدل تشغيل خوارزمية بحث.
+
+    batch = BatchGame(game_map, batch_size=4096, seed=0)
+    while not batch.done.all():
+        batch.step(batch.random_actions())
+"""
+import numpy as np
+
+from algorithms import build_distance_table, load_distance_table
+from algorithms.distance_table import NO_HOP
+from engine import (START_LIVES, PELLET_SCORE, POWER_PELLET_SCORE,
+                    GHOST_SCORE, FRIGHT_FRAMES)
+from map import DIRECTIONS
+
+STAY = len(DIRECTIONS)  # رمز الفعل "البقاء في المكان"
+GHOST_MOVE_SPEED = 3
+
+
+class BatchGame:
+    """B لعبة مستقلة تتقدم معاً بعمليات متجهة"""
+
+    def __init__(self, game_map, batch_size, distance_table=None, lives=START_LIVES, seed=None):
+        """
+        Args:
+            game_map: خريطة اللعبة (مُجمَّعة أو لا)
+            batch_size: عدد الألعاب B
+            distance_table: جدول المسافات (افتراضي: من الملف الجانبي أو يُبنى)
+            lives: الأرواح في بداية كل لعبة
+            seed: بذرة المولد العشوائي لحركة الأشباح الخائفة
+        """
+        if distance_table is None:
+            try:
+                distance_table = load_distance_table(game_map)
+            except OSError:
+                distance_table = build_distance_table(game_map)
+        self.game_map = game_map
+        self.table = distance_table
+        self.hop = np.asarray(distance_table.hop)
+        self.batch_size = batch_size
+        self.start_lives = lives
+        self.rng = np.random.default_rng(seed)
+
+        cells = distance_table.cells
+        index = distance_table.index
+        n = len(cells)
+        # move[c, a]: الخلية بعد الفعل a من الخلية c (تبقى مكانها عند الجدار)
+        self.move = np.repeat(np.arange(n, dtype=np.int32)[:, None], STAY + 1, axis=1)
+        for c, (x, y) in enumerate(cells):
+            for k, (dx, dy) in enumerate(DIRECTIONS):
+                target = index.get((x + dx, y + dy))
+                if target is not None:
+                    self.move[c, k] = target
+        self.open_dirs = [np.flatnonzero(self.move[c, :STAY] != c) for c in range(n)]
+        self.degree = np.array([len(d) for d in self.open_dirs], dtype=np.int32)
+        padded = np.zeros((n, STAY), dtype=np.int32)
+        for c, dirs in enumerate(self.open_dirs):
+            padded[c, :len(dirs)] = dirs
+        self.open_dirs = padded
+
+        self.pellet_cells = np.array([index[p] for p in sorted(game_map.pellets)], dtype=np.int32)
+        self.power_cells = np.array([index[p] for p in sorted(game_map.power_pellets)], dtype=np.int32)
+        self.pellet_slot = np.full(n, -1, dtype=np.int32)
+        self.pellet_slot[self.pellet_cells] = np.arange(len(self.pellet_cells))
+        self.power_slot = np.full(n, -1, dtype=np.int32)
+        self.power_slot[self.power_cells] = np.arange(len(self.power_cells))
+
+        spawns = list(game_map.ghost_positions)
+        if not spawns:
+            spawns = [(5, 3) if game_map.passable((5, 3)) else (1, 1)]
+        self.player_start = index[tuple(game_map.start)]
+        self.ghost_start = np.array([index[tuple(p)] for p in spawns], dtype=np.int32)
+        self.reset()
+
+    def reset(self):
+        """إعادة كل الألعاب إلى بدايتها"""
+        b, g = self.batch_size, len(self.ghost_start)
+        self.player = np.full(b, self.player_start, dtype=np.int32)
+        self.ghosts = np.tile(self.ghost_start, (b, 1))
+        self.pellets = np.ones((b, len(self.pellet_cells)), dtype=bool)
+        self.power_pellets = np.ones((b, len(self.power_cells)), dtype=bool)
+        self.fright_timer = np.zeros((b, g), dtype=np.int32)
+        self.frightened = np.zeros((b, g), dtype=bool)
+        self.move_timer = np.zeros((b, g), dtype=np.int32)
+        self.score = np.zeros(b, dtype=np.int64)
+        self.lives = np.full(b, self.start_lives, dtype=np.int32)
+        self.game_over = np.zeros(b, dtype=bool)
+        self.tick = 0
+
+    @property
+    def won(self):
+        return ~self.pellets.any(axis=1) & ~self.power_pellets.any(axis=1)
+
+    @property
+    def done(self):
+        return self.game_over | self.won
+
+    def random_actions(self):
+        """فعل عشوائي لكل لعبة (بما فيه البقاء)"""
+        return self.rng.integers(0, STAY + 1, size=self.batch_size)
+
+    def step(self, actions):
+        """
+        تقدم كل الألعاب غير المنتهية إطاراً واحداً
+
+        Args:
+            actions: مصفوفة (B,) من فهارس DIRECTIONS أو STAY
+
+        Returns:
+            مصفوفة (B,) بالنقاط المكتسبة في هذا الإطار
+        """
+        actions = np.asarray(actions)
+        active = ~self.done
+        rows = np.arange(self.batch_size)
+        score_before = self.score.copy()
+        self.tick += 1
+
+        # اللاعب
+        moved = self.move[self.player, actions]
+        self.player = np.where(active, moved, self.player)
+
+        # مؤقتات الأشباح
+        act = active[:, None]
+        counting = act & (self.fright_timer > 0)
+        self.fright_timer -= counting
+        self.frightened &= ~(counting & (self.fright_timer <= 0))
+        self.move_timer += act
+
+        # الأشباح الخائفة: جار عشوائي كل 2 * السرعة إطارات
+        scared = act & self.frightened & (self.move_timer >= GHOST_MOVE_SPEED * 2)
+        if scared.any():
+            deg = self.degree[self.ghosts]
+            choice = (self.rng.random(self.ghosts.shape) * np.maximum(deg, 1)).astype(np.int32)
+            dirs = self.open_dirs[self.ghosts, choice]
+            wander = np.where(deg > 0, self.move[self.ghosts, dirs], self.ghosts)
+            self.ghosts = np.where(scared, wander, self.ghosts)
+            self.move_timer[scared] = 0
+
+        # المطاردة: الخطوة التالية من جدول المسافات
+        chase = act & ~self.frightened & (self.move_timer >= GHOST_MOVE_SPEED)
+        if chase.any():
+            hop = self.hop[self.ghosts, self.player[:, None]]
+            can = chase & (hop != NO_HOP)
+            nxt = self.move[self.ghosts, np.where(hop == NO_HOP, STAY, hop)]
+            self.ghosts = np.where(can, nxt, self.ghosts)
+            self.move_timer[can] = 0
+
+        # الكرات
+        slot = self.pellet_slot[self.player]
+        has = active & (slot >= 0)
+        eat = np.zeros(self.batch_size, dtype=bool)
+        eat[has] = self.pellets[rows[has], slot[has]]
+        self.pellets[rows[eat], slot[eat]] = False
+        self.score += eat * PELLET_SCORE
+
+        slot = self.power_slot[self.player]
+        has = active & (slot >= 0)
+        power = np.zeros(self.batch_size, dtype=bool)
+        power[has] = self.power_pellets[rows[has], slot[has]]
+        self.power_pellets[rows[power], slot[power]] = False
+        self.fright_timer[power] = FRIGHT_FRAMES
+        self.frightened[power] = True
+        self.score += power * POWER_PELLET_SCORE
+
+        # التصادمات (بالترتيب مثل GameState)
+        for g in range(len(self.ghost_start)):
+            hit = active & ~self.game_over & (self.ghosts[:, g] == self.player)
+            if not hit.any():
+                continue
+            eaten = hit & self.frightened[:, g]
+            self.ghosts[eaten, g] = self.ghost_start[g]
+            self.frightened[eaten, g] = False
+            self.score += eaten * GHOST_SCORE
+
+            caught = hit & ~eaten
+            self.lives -= caught
+            self.player[caught] = self.player_start
+            self.ghosts[caught] = self.ghost_start
+            self.frightened[caught] = False
+            self.game_over |= caught & (self.lives <= 0)
+
+        return self.score - score_before
+
+    def run(self, policy=None, max_ticks=10000):
+        """
+        تشغيل كل الألعاب حتى تنتهي أو max_ticks
+
+        Args:
+            policy: دالة policy(batch) -> actions، أو None (أفعال عشوائية)
+
+        Returns:
+            عدد الإطارات المنفذة
+        """
+        ticks = 0
+        while ticks < max_ticks and not self.done.all():
+            self.step(policy(self) if policy is not None else self.random_actions())
+            ticks += 1
+        return ticks
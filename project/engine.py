@@ -0,0 +1,162 @@
+"""
+محرك اللعبة بدون واجهة رسومية - كل منطق اللعبة بدون pygame
+
+الواجهة الرسومية مجرد عارض فوق GameState، ويمكن تشغيل آلاف الإطارات في
+الثانية بدون نافذة:
+
+    state = GameState.from_map_path("maps/map1.txt")
+    while not state.done:
+        state.step((1, 0))
+"""
+from algorithms import astar
+from ghost import Ghost, GHOST_COLORS
+from map import GameMap
+from player import Player
+
+START_LIVES = 3
+PELLET_SCORE = 10
+POWER_PELLET_SCORE = 50
+GHOST_SCORE = 200
+FRIGHT_FRAMES = 300
+
+
+def make_ghosts(game_map, algorithm=astar, planner_factory=None, **ghost_options):
+    """
+    إنشاء الأشباح من مواضع G في الخريطة (أو شبح واحد افتراضي)
+
+    Args:
+        game_map: خريطة اللعبة
+        algorithm: خوارزمية البحث للأشباح
+        planner_factory: دالة تُنشئ مخططاً خاصاً لكل شبح (مثل DStarLite)
+        **ghost_options: خيارات تُمرَّر إلى Ghost (distance_table, path_cache, flow_field,
+            scheduler)
+    """
+    positions = list(game_map.ghost_positions)
+    if not positions:
+        positions = [(5, 3) if game_map.passable((5, 3)) else (1, 1)]
+    ghosts = []
+    for i, pos in enumerate(positions):
+        color = GHOST_COLORS[i % len(GHOST_COLORS)]
+        planner = planner_factory() if planner_factory is not None else None
+        ghosts.append(Ghost(pos, game_map.tile_size, color, game_map, algorithm,
+                            planner=planner, **ghost_options))
+    return ghosts
+
+
+class GameState:
+    """حالة اللعبة الكاملة: الكرات، النقاط، الأرواح، مؤقتات الخوف والتصادمات"""
+
+    def __init__(self, game_map, ghosts=None, algorithm=astar, lives=START_LIVES,
+                 flow_field=None, scheduler=None):
+        """
+        Args:
+            game_map: خريطة اللعبة (تُعدَّل كراتها أثناء اللعب)
+            ghosts: قائمة الأشباح (افتراضي: make_ghosts بالخوارزمية المعطاة)
+            algorithm: الخوارزمية عند إنشاء الأشباح تلقائياً
+            lives: عدد الأرواح
+            flow_field: حقل تدفق مشترك يُحدَّث مرة في كل إطار قبل الأشباح
+            scheduler: مُجدوِل مسارات مشترك (PathScheduler أو PlanningService)
+                يُشغَّل مرة في كل إطار بعد أن تسجّل الأشباح طلباتها
+        """
+        self.game_map = game_map
+        self.player = Player(game_map.start, game_map.tile_size)
+        self.ghosts = ghosts if ghosts is not None else make_ghosts(game_map, algorithm)
+        self.flow_field = flow_field
+        self.scheduler = scheduler
+        self.score = 0
+        self.lives = lives
+        self.game_over = False
+        self.tick = 0
+
+    @classmethod
+    def from_map_path(cls, map_path, algorithm=astar, **kwargs):
+        """تحميل الخريطة (بالتمثيل المُجمَّع) وإنشاء الحالة"""
+        return cls(GameMap(map_path, compiled=True), algorithm=algorithm, **kwargs)
+
+    @property
+    def won(self):
+        return not self.game_map.pellets and not self.game_map.power_pellets
+
+    @property
+    def done(self):
+        return self.game_over or self.won
+
+    def step(self, action=None):
+        """
+        تقدم اللعبة إطاراً واحداً
+
+        Args:
+            action: اتجاه حركة اللاعب (dx, dy) أو None لاستخدام الطلب المعلّق
+
+        Returns:
+            dict: أحداث هذا الإطار (reward, eaten, ghosts_eaten, life_lost, game_over)
+        """
+        info = {'reward': 0, 'eaten': [], 'ghosts_eaten': 0,
+                'life_lost': False, 'game_over': self.game_over}
+        if self.game_over:
+            return info
+        self.tick += 1
+        score_before = self.score
+        game_map = self.game_map
+        player = self.player
+
+        if action is not None:
+            player.request_move(action)
+        player.update(game_map)
+
+        if self.flow_field is not None:
+            self.flow_field.update(player.pos)
+        for g in self.ghosts:
+            g.update(player.pos)
+        if self.scheduler is not None:
+            self.scheduler.run()
+
+        # جمع الكرات
+        pos = tuple(player.pos)
+        if pos in game_map.pellets:
+            game_map.pellets.remove(pos)
+            self.score += PELLET_SCORE
+            info['eaten'].append(pos)
+
+        if pos in game_map.power_pellets:
+            game_map.power_pellets.remove(pos)
+            for g in self.ghosts:
+                g.frighten(FRIGHT_FRAMES)
+            self.score += POWER_PELLET_SCORE
+            info['eaten'].append(pos)
+
+        # التصادم مع الأشباح (نفس البلاطة)
+        for g in self.ghosts:
+            if g.pos == player.pos:
+                if g.state == "FRIGHTENED":
+                    g.respawn()
+                    self.score += GHOST_SCORE
+                    info['ghosts_eaten'] += 1
+                else:
+                    self.lives -= 1
+                    info['life_lost'] = True
+                    player.reset(game_map.start)
+                    for g2 in self.ghosts:
+                        g2.reset()
+                    if self.lives <= 0:
+                        self.game_over = True
+
+        info['reward'] = self.score - score_before
+        info['game_over'] = self.game_over
+        return info
+
+    def run(self, policy=None, max_ticks=10000):
+        """
+        تشغيل اللعبة حتى النهاية أو max_ticks
+
+        Args:
+            policy: دالة policy(state) -> action، أو None (اللاعب ثابت)
+
+        Returns:
+            عدد الإطارات المنفذة
+        """
+        ticks = 0
+        while ticks < max_ticks and not self.done:
+            self.step(policy(self) if policy is not None else None)
+            ticks += 1
+        return ticks
@@ -1,13 +1,27 @@
 """
 كلاس الأشباح - يستخدم الخوارزميات من مجلد algorithms
 """
-import pygame
+import time
+
 from algorithms import astar  # افتراضي: A*
 
+# ألوان الأشباح بالترتيب حسب مواضع G في الخريطة
+GHOST_COLORS = [
+    (255, 0, 0),      # Red
+    (255, 128, 0),    # Orange
+    (255, 0, 255),    # Magenta
+    (0, 255, 255),    # Cyan
+    (255, 255, 0),    # Yellow
+    (0, 255, 0),      # Green
+    (128, 0, 255),    # Purple
+    (255, 192, 203)   # Pink
+]
+
 class Ghost:
     """كلاس الشبح في اللعبة"""
     
-    def __init__(self, pos, tile, color, gamemap, algorithm=astar):
+    def __init__(self, pos, tile, color, gamemap, algorithm=astar, distance_table=None,
+                 path_cache=None, planner=None, flow_field=None, scheduler=None):
         """
         تهيئة الشبح
         
@@ -17,22 +31,37 @@ class Ghost:
             color: لون الشبح
             gamemap: خريطة اللعبة
             algorithm: الخوارزمية المستخدمة (افتراضي: A*)
+            distance_table: جدول مسافات محسوب مسبقاً (DistanceTable) - إن وُجد
+                تؤخذ الخطوة التالية منه مباشرة بدل تشغيل الخوارزمية
+            path_cache: ذاكرة مسارات مشتركة (PathCache) بين الأشباح والإطارات
+            planner: مخطط تزايدي له حالة (مثل DStarLite) - يُستخدم بدل الخوارزمية
+                ويصلح مساره السابق بدل البحث من الصفر
+            flow_field: حقل تدفق مشترك (FlowField) يُحدَّث مرة واحدة لكل إطار
+                من موضع اللاعب، والشبح يقرأ منه خطوته التالية فقط
+            scheduler: مُجدوِل مشترك (PathScheduler أو PlanningService) - الشبح
+                يطلب المسار منه ويواصل السير على مساره القديم حتى يصله الجديد
+                عبر receive_path
         """
         self.start = pos
         self.pos = list(pos)
         self.tile = tile
         self.color = color
         self.gamemap = gamemap
-        self.algorithm = algorithm
-        self.rect = pygame.Rect(self.pos[0]*tile, self.pos[1]*tile, tile, tile)
+        self.algorithm = path_cache.wrap(algorithm) if path_cache is not None else algorithm
+        self.distance_table = distance_table
+        self.planner = planner
+        self.flow_field = flow_field
+        self.scheduler = scheduler
         self.path = []
         self.state = "CHASE"
         self.fright_timer = 0
         self.move_timer = 0
         self.move_speed = 3  # يتحرك كل 3 إطارات (أبطأ)
+        self.last_plan_time = 0.0  # زمن البحث في آخر update (ثوانٍ، 0 إن لم يُعِد التخطيط)
     
     def update(self, target):
         """تحديث موضع الشبح"""
+        self.last_plan_time = 0.0
         if self.fright_timer > 0:
             self.fright_timer -= 1
             if self.fright_timer <= 0:
@@ -48,11 +77,37 @@ class Ghost:
                 self.move_timer = 0
             return
         
+        # جدول المسافات: الخطوة التالية في O(1) بدون بحث
+        if self.distance_table is not None:
+            if self.move_timer >= self.move_speed:
+                nxt = self.distance_table.next_step(tuple(self.pos), tuple(target))
+                if nxt is not None:
+                    self.pos = list(nxt)
+                    self.move_timer = 0
+            return
+        
+        # حقل التدفق المشترك: قراءة الاتجاه فقط (الحقل يُحدَّث خارج الشبح)
+        if self.flow_field is not None:
+            if self.move_timer >= self.move_speed:
+                nxt = self.flow_field.next_step(tuple(self.pos))
+                if nxt is not None:
+                    self.pos = list(nxt)
+                    self.move_timer = 0
+            return
+        
         # إعادة حساب المسار إذا تغير الهدف
-        if not self.path or tuple(target) != self.path[-1]:
+        if self.scheduler is not None:
+            if not self.path or tuple(target) != self.path[-1]:
+                self.scheduler.request(self, tuple(self.pos), tuple(target))
+        elif not self.path or tuple(target) != self.path[-1]:
             start = tuple(self.pos)
             goal = tuple(target)
-            self.path = self.algorithm(self.gamemap, start, goal)
+            t0 = time.perf_counter()
+            if self.planner is not None:
+                self.path = self.planner.plan(start, goal)
+            else:
+                self.path = self.algorithm(self.gamemap, start, goal)
+            self.last_plan_time = time.perf_counter() - t0
             if self.path and len(self.path) > 1:
                 self.path = self.path[1:]  # إزالة الموضع الحالي
         
@@ -60,9 +115,33 @@ class Ghost:
         if self.path and self.move_timer >= self.move_speed:
             nxt = self.path.pop(0)
             self.pos = list(nxt)
-            self.rect.topleft = (self.pos[0]*self.tile, self.pos[1]*self.tile)
             self.move_timer = 0
     
+    def receive_path(self, start, goal, path):
+        """
+        استلام مسار من المُجدوِل (قد يكون الشبح تحرك منذ الطلب)
+        
+        Args:
+            start: الموضع الذي بدأ منه البحث
+            goal: الهدف الذي طُلب
+            path: المسار من start إلى goal
+        """
+        pos = tuple(self.pos)
+        if pos != start:
+            # تحرك الشبح على مساره القديم أثناء البحث: نكمل من موضعه الحالي
+            if pos not in path:
+                return  # ابتعد عن المسار الجديد، يبقى القديم ويُطلب غيره
+            path = path[path.index(pos):]
+        if len(path) > 1:
+            path = path[1:]  # إزالة الموضع الحالي
+        self.path = list(path)
+    
+    @property
+    def rect(self):
+        """مستطيل pygame للشبح (يُنشأ عند الطلب - المنطق لا يعتمد على pygame)"""
+        import pygame
+        return pygame.Rect(self.pos[0]*self.tile, self.pos[1]*self.tile, self.tile, self.tile)
+    
     def step_away(self):
         """التحرك عشوائياً عند الخوف"""
         import random
@@ -70,13 +149,20 @@ class Ghost:
         if nlist:
             choice = random.choice(nlist)
             self.pos = [choice[0], choice[1]]
-            self.rect.topleft = (self.pos[0]*self.tile, self.pos[1]*self.tile)
     
-    def draw(self, surface):
-        """رسم الشبح"""
+    def draw(self, surface, pos=None):
+        """
+        رسم الشبح
+        
+        Args:
+            surface: سطح الرسم
+            pos: موضع بإحداثيات البلاطات (قد يكون كسرياً عند الاستيفاء بين إطارين)
+        """
+        import pygame
         col = (100, 100, 255) if self.state == "FRIGHTENED" else self.color
+        x, y = pos if pos is not None else self.pos
         pygame.draw.rect(surface, col, 
-                        (self.pos[0]*self.tile, self.pos[1]*self.tile, 
+                        (round(x*self.tile), round(y*self.tile), 
                          self.tile, self.tile))
     
     def frighten(self, frames):
@@ -86,8 +172,10 @@ class Ghost:
     
     def respawn(self):
         """إعادة إحياء الشبح"""
+        if self.scheduler is not None:
+            self.scheduler.cancel(self)
         self.pos = list(self.start)
-        self.rect.topleft = (self.pos[0]*self.tile, self.pos[1]*self.tile)
+        self.path = []  # المسار القديم يبدأ من موضع آخر
         self.state = "CHASE"
     
     def reset(self):
@@ -5,18 +5,23 @@ import pygame
 import json
 import sys
 import math
+import time
 from pathlib import Path
 
 # إضافة المجلد الرئيسي إلى المسار للاستيراد الصحيح
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from map import GameMap
-from player import Player
-from ghost import Ghost
+from engine import GameState, make_ghosts
+from autopilot import Autopilot
+from gui.profiler import FrameProfiler
+from gui.renderer import Renderer
 from algorithms import (
     astar, dijkstra, bfs, dfs,
     greedy_best_first, bidirectional_search,
-    ida_star, theta_star
+    ida_star, theta_star, jump_point_search, hpa_star,
+    load_distance_table, PathCache, DStarLite, FlowField, PathScheduler,
+    PlanningService
 )
 
 # Load best algorithm from results file
@@ -32,7 +37,9 @@ def load_best_algorithm():
         'Greedy Best-First': greedy_best_first,
         'Bidirectional': bidirectional_search,
         'IDA*': ida_star,
-        'Theta*': theta_star
+        'Theta*': theta_star,
+        'JPS': jump_point_search,
+        'HPA*': hpa_star
     }
     
     try:
@@ -50,11 +57,38 @@ def load_best_algorithm():
 class GameGUI:
     """Graphical User Interface class"""
     
-    def __init__(self, map_path):
+    def __init__(self, map_path, use_distance_table=False, path_cache_size=1024,
+                 incremental=False, use_flow_field=False, show_profiler=False,
+                 plan_budget_ms=None, schedule_policy='round_robin',
+                 async_planning=None, planning_workers=None,
+                 tick_rate=30, render_fps=0, max_catch_up=5, vsync=False,
+                 autopilot=False):
         pygame.init()
+        self.use_distance_table = use_distance_table
+        self.incremental = incremental
+        self.use_flow_field = use_flow_field
+        # Per-frame pathfinding budget (None: every ghost replans immediately)
+        self.plan_budget_ms = plan_budget_ms
+        self.schedule_policy = schedule_policy
+        # 'thread' or 'process': ghosts plan on a worker pool and never block a frame
+        self.async_planning = async_planning
+        self.planning_workers = planning_workers
+        self.scheduler = None
+        # Fixed-timestep simulation: game logic runs at tick_rate steps per second
+        # whatever the render rate (render_fps=0: uncapped); at most max_catch_up
+        # steps per rendered frame, anything older is dropped instead of spiralling
+        self.tick_rate = tick_rate
+        self.render_fps = render_fps
+        self.max_catch_up = max_catch_up
+        self.dropped_ticks = 0
+        # AI-controlled player for soak-testing ghost algorithms (F2 toggles)
+        self.use_autopilot = autopilot
+        # Shared by all ghosts and kept across restarts: the map (and so its
+        # version, part of every key) is reused, only its pellets are reset
+        self.path_cache = PathCache(maxsize=path_cache_size)
         
         # Load map first to determine size
-        self.game_map = GameMap(map_path)
+        self.game_map = GameMap(map_path, compiled=True)
         self.tile = self.game_map.tile_size
         self.map_path = map_path
         
@@ -65,7 +99,15 @@ class GameGUI:
         self.SCREEN_W = map_width * self.tile
         self.SCREEN_H = map_height * self.tile + 50  # Extra space for info
         
-        self.screen = pygame.display.set_mode((self.SCREEN_W, self.SCREEN_H))
+        self.screen = None
+        if vsync:
+            try:
+                self.screen = pygame.display.set_mode((self.SCREEN_W, self.SCREEN_H),
+                                                      pygame.SCALED, vsync=1)
+            except pygame.error:
+                pass  # vsync unsupported by this driver
+        if self.screen is None:
+            self.screen = pygame.display.set_mode((self.SCREEN_W, self.SCREEN_H))
         pygame.display.set_caption("Pac-Man - AI Algorithms")
         self.clock = pygame.time.Clock()
         
@@ -76,56 +118,89 @@ class GameGUI:
 
         # Game control flags
         self.running = True
-        self.game_over = False
+
+        # Frame profiler: F3 toggles the overlay, F4 dumps a Chrome trace
+        self.profiler = FrameProfiler()
+        self.show_profiler = show_profiler
+        self.trace_path = Path(__file__).parent.parent / "frame_trace.json"
 
         # Initialize entities/state
         self._init_game_entities()
 
     def _init_game_entities(self):
-        """Initialize or reset player, ghosts, map, score."""
-        # Reload map to reset pellets/positions
-        self.game_map = GameMap(self.map_path)
-        self.tile = self.game_map.tile_size
+        """Initialize or reset player, ghosts, pellets, score."""
+        # Same map object (same version) so cached paths and tables stay valid
+        self.game_map.reset_pellets()
 
         # Load best algorithm
         best_algorithm, alg_name = load_best_algorithm()
         self.algorithm_name = alg_name
         
-        # Create player and ghosts
-        self.player = Player(self.game_map.start, self.tile)
-        self.ghosts = []
-        
-        # Ghost colors (more colors)
-        ghost_colors = [
-            (255, 0, 0),      # Red
-            (255, 128, 0),    # Orange
-            (255, 0, 255),    # Magenta
-            (0, 255, 255),    # Cyan
-            (255, 255, 0),    # Yellow
-            (0, 255, 0),      # Green
-            (128, 0, 255),    # Purple
-            (255, 192, 203)   # Pink
-        ]
+        # Precomputed all-pairs table (memory-mapped sidecar cache)
+        distance_table = None
+        if self.use_distance_table:
+            distance_table = load_distance_table(self.game_map)
+            self.algorithm_name = "Distance Table"
+        elif self.incremental:
+            self.algorithm_name = "D* Lite"
         
-        # Create ghosts based on number in map
-        for i, ghost_pos in enumerate(self.game_map.ghost_positions):
-            color = ghost_colors[i % len(ghost_colors)]
-            self.ghosts.append(
-                Ghost(ghost_pos, self.tile, color, self.game_map, best_algorithm)
-            )
+        # One reverse BFS from the player per tick, shared by every ghost
+        self.flow_field = FlowField(self.game_map) if self.use_flow_field else None
+        if self.flow_field is not None:
+            self.algorithm_name = "Flow Field"
         
-        # If no ghosts, add one at default position
-        if not self.ghosts:
-            default_pos = (5, 3) if self.game_map.passable((5, 3)) else (1, 1)
-            self.ghosts.append(
-                Ghost(default_pos, self.tile, (255, 0, 0), self.game_map, best_algorithm)
-            )
+        # Replans staggered across frames within a fixed time budget,
+        # or handed to background workers
+        if self.scheduler is not None:
+            self.scheduler.close()
+        self.scheduler = None
+        if self.async_planning is not None:
+            self.scheduler = PlanningService(self.game_map, self.planning_workers,
+                                             self.async_planning)
+        elif self.plan_budget_ms is not None:
+            self.scheduler = PathScheduler(self.plan_budget_ms, self.schedule_policy)
         
-        # Game state
-        self.score = 0
-        self.lives = 3
-        self.game_over = False
+        # Create ghosts and the headless game state (player, pellets, score, lives)
+        ghosts = make_ghosts(self.game_map, best_algorithm,
+                             planner_factory=self._make_planner,
+                             distance_table=distance_table,
+                             path_cache=self.path_cache,
+                             flow_field=self.flow_field,
+                             scheduler=self.scheduler)
+        self.state = GameState(self.game_map, ghosts, flow_field=self.flow_field,
+                               scheduler=self.scheduler)
         self.game_over_timer = 0
+        self.autopilot = Autopilot(self.game_map)
+        # Entity positions before the last step, for render interpolation
+        self._previous = None
+        
+        # Cached wall/pellet layers for the new map
+        self.renderer = Renderer(self.screen, self.game_map)
+    
+    # The GUI only renders; game logic lives in GameState
+    @property
+    def player(self):
+        return self.state.player
+    
+    @property
+    def ghosts(self):
+        return self.state.ghosts
+    
+    @property
+    def score(self):
+        return self.state.score
+    
+    @property
+    def lives(self):
+        return self.state.lives
+    
+    @property
+    def game_over(self):
+        return self.state.game_over
+    
+    def _make_planner(self):
+        """One stateful incremental planner per ghost (each has its own start)"""
+        return DStarLite(self.game_map) if self.incremental else None
     
     def handle_events(self):
         """Handle events"""
@@ -134,9 +209,16 @@ class GameGUI:
                 self.running = False
             if self.game_over and event.type == pygame.KEYDOWN and event.key == pygame.K_r:
                 self._init_game_entities()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F2:
+                self.use_autopilot = not self.use_autopilot
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.show_profiler = not self.show_profiler
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                self.profiler.dump_chrome_trace(self.trace_path)
+                print(f"Frame trace saved to: {self.trace_path}")
         
         keys = pygame.key.get_pressed()
-        if self.game_over:
+        if self.game_over or self.use_autopilot:
             return
         if keys[pygame.K_UP]:
             self.player.request_move((0, -1))
@@ -148,110 +230,120 @@ class GameGUI:
             self.player.request_move((1, 0))
     
     def update(self):
-        """Update game state"""
+        """Advance the simulation by one fixed step"""
         if self.game_over:
+            self.game_over_timer += 1
             return
-        dt = self.clock.tick(30)
-        
-        # تحديث اللاعب
-        self.player.update(self.game_map)
-        
-        # تحديث الأشباح
-        for g in self.ghosts:
-            g.update(self.player.pos)
-        
-        # Collect points
-        if tuple(self.player.pos) in self.game_map.pellets:
-            self.game_map.pellets.remove(tuple(self.player.pos))
-            self.score += 10
-        
-        if tuple(self.player.pos) in self.game_map.power_pellets:
-            self.game_map.power_pellets.remove(tuple(self.player.pos))
-            for g in self.ghosts:
-                g.frighten(300)
-            self.score += 50
-        
-        # Collision with ghosts
-        for g in self.ghosts:
-            if g.rect.colliderect(self.player.rect):
-                if g.state == "FRIGHTENED":
-                    g.respawn()
-                    self.score += 200
-                else:
-                    self.lives -= 1
-                    self.player.reset(self.game_map.start)
-                    for g2 in self.ghosts:
-                        g2.reset()
-                    if self.lives <= 0:
-                        self.game_over = True
+        self._previous = [tuple(self.player.pos)] + [tuple(g.pos) for g in self.ghosts]
+        with self.profiler.phase('update'):
+            action = self.autopilot(self.state) if self.use_autopilot else None
+            info = self.state.step(action)
+        self.profiler.record_ghosts(self.ghosts)
+        self.renderer.eat(info['eaten'])
     
-    def draw(self):
-        """Draw the game"""
-        self.screen.fill((0, 0, 0))
-        
-        # Draw walls
-        for y, row in enumerate(self.game_map.grid):
-            for x, ch in enumerate(row):
-                rx, ry = x * self.tile, y * self.tile
-                if ch == '#':
-                    pygame.draw.rect(self.screen, (33, 33, 255), 
-                                    (rx, ry, self.tile, self.tile))
+    @staticmethod
+    def _interpolate(previous, current, alpha):
+        """Position between two steps (no tweening across respawns/resets)"""
+        if previous is None or abs(current[0] - previous[0]) + abs(current[1] - previous[1]) > 1:
+            return tuple(current)
+        return (previous[0] + (current[0] - previous[0]) * alpha,
+                previous[1] + (current[1] - previous[1]) * alpha)
+    
+    def _entity_rect(self, pos):
+        return pygame.Rect(round(pos[0] * self.tile), round(pos[1] * self.tile),
+                           self.tile, self.tile)
+    
+    def draw(self, alpha=1.0):
+        """
+        Draw the game (only regions that changed reach the display)
         
-        # Draw pellets
-        for p in list(self.game_map.pellets):
-            pygame.draw.circle(self.screen, (255, 255, 255),
-                             (p[0]*self.tile + self.tile//2,
-                              p[1]*self.tile + self.tile//2), 3)
+        Args:
+            alpha: Fraction of the next step already elapsed; entities are drawn
+                that far between their previous and current tiles
+        """
+        renderer = self.renderer
+        # Walls and pellets come from the cached background layer
+        renderer.begin()
         
-        # Draw power pellets
-        for p in list(self.game_map.power_pellets):
-            pygame.draw.circle(self.screen, (255, 255, 0),
-                             (p[0]*self.tile + self.tile//2,
-                              p[1]*self.tile + self.tile//2), 6)
+        previous = self._previous
+        if previous is None or len(previous) != len(self.ghosts) + 1:
+            previous = [None] * (len(self.ghosts) + 1)
         
         # Draw player
-        self.player.draw(self.screen)
+        pos = self._interpolate(previous[0], self.player.pos, alpha)
+        self.player.draw(self.screen, pos)
+        renderer.mark(self._entity_rect(pos))
         
         # Draw ghosts
-        for g in self.ghosts:
-            g.draw(self.screen)
+        for g, prev in zip(self.ghosts, previous[1:]):
+            pos = self._interpolate(prev, g.pos, alpha)
+            g.draw(self.screen, pos)
+            renderer.mark(self._entity_rect(pos))
         
         # Draw info
         info_text = f"Score: {self.score}   Lives: {self.lives}   Algorithm: {self.algorithm_name}"
         txt = self.font.render(info_text, True, (255, 255, 255))
-        self.screen.blit(txt, (10, 10))
+        renderer.mark(self.screen.blit(txt, (10, 10)))
         
         # Win message
         if not self.game_map.pellets and not self.game_map.power_pellets:
             win = self.big_font.render("YOU WIN!", True, (0, 255, 0))
             win_rect = win.get_rect(center=(self.SCREEN_W//2, self.SCREEN_H//2))
-            self.screen.blit(win, win_rect)
+            renderer.mark(self.screen.blit(win, win_rect))
         
         # Game over message
         if self.game_over:
-            # Animate scale up
-            self.game_over_timer += 1
+            # Animate scale up (the timer advances with simulation steps)
             scale = 1.0 + min(0.6, self.game_over_timer * 0.02)
 
             base_surface = self.game_over_font.render("GAME OVER", True, (255, 0, 0))
             w, h = base_surface.get_size()
             scaled_surface = pygame.transform.smoothscale(base_surface, (int(w * scale), int(h * scale)))
             lose_rect = scaled_surface.get_rect(center=(self.SCREEN_W//2, self.SCREEN_H//2 - 20))
-            self.screen.blit(scaled_surface, lose_rect)
+            renderer.mark(self.screen.blit(scaled_surface, lose_rect))
 
             restart = self.font.render("Press R to Restart", True, (255, 255, 255))
             restart_rect = restart.get_rect(center=(self.SCREEN_W//2, self.SCREEN_H//2 + 30))
-            self.screen.blit(restart, restart_rect)
+            renderer.mark(self.screen.blit(restart, restart_rect))
+        
+        if self.show_profiler:
+            renderer.mark(self.profiler.draw_overlay(self.screen, self.font))
         
-        pygame.display.flip()
+        renderer.present()
     
     def run(self):
-        """Run the game"""
+        """Run the game: fixed simulation steps, rendering as fast as allowed"""
+        profiler = self.profiler
+        step = 1.0 / self.tick_rate
+        accumulator = 0.0
+        last = time.perf_counter()
         while self.running:
-            self.handle_events()
-            self.update()
-            self.draw()
+            profiler.begin_frame()
+            with profiler.phase('wait'):
+                self.clock.tick(self.render_fps)
+            now = time.perf_counter()
+            accumulator += now - last
+            last = now
+            
+            with profiler.phase('events'):
+                self.handle_events()
+            
+            steps = 0
+            while accumulator >= step and steps < self.max_catch_up:
+                self.update()
+                accumulator -= step
+                steps += 1
+            if accumulator >= step:
+                # Too far behind (slow frame, window drag): drop the backlog
+                self.dropped_ticks += int(accumulator // step)
+                accumulator %= step
+            
+            with profiler.phase('draw'):
+                self.draw(accumulator / step)
+            profiler.end_frame()
         
+        if self.scheduler is not None:
+            self.scheduler.close()
         pygame.quit()
 
 def main():
@@ -0,0 +1,183 @@
+"""
+Frame profiler - per-phase and per-ghost timings in a ring buffer,
+an on-screen overlay and JSON / Chrome-trace dumps
+"""
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+def _percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class FrameProfiler:
+    """Records the last `capacity` frames: phase timings and ghost replans"""
+
+    def __init__(self, capacity=600):
+        """
+        Args:
+            capacity: Number of frames kept in the ring buffer
+        """
+        self.frames = deque(maxlen=capacity)
+        self.origin = time.perf_counter()
+        self._frame = None
+
+    def begin_frame(self):
+        self._frame = {
+            'start': time.perf_counter(),
+            'duration': 0.0,
+            'phases': [],   # (name, start, duration)
+            'ghosts': []    # (ghost index, planning seconds)
+        }
+
+    def end_frame(self):
+        frame = self._frame
+        if frame is None:
+            return
+        frame['duration'] = time.perf_counter() - frame['start']
+        self.frames.append(frame)
+        self._frame = None
+
+    @contextmanager
+    def phase(self, name):
+        """Time a phase of the current frame"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self._frame is not None:
+                self._frame['phases'].append((name, start, time.perf_counter() - start))
+
+    def record_ghosts(self, ghosts):
+        """Record the pathfinding time each ghost spent in the last simulation step"""
+        if self._frame is None:
+            return
+        for i, ghost in enumerate(ghosts):
+            seconds = getattr(ghost, 'last_plan_time', 0.0)
+            if seconds:
+                self._frame['ghosts'].append((i, seconds))
+
+    def summary(self):
+        """
+        Aggregate the buffered frames
+
+        Returns:
+            dict: fps, busy frame time percentiles (ms, excluding the
+                'wait' phase), mean ms per phase and the slowest ghost
+        """
+        frames = list(self.frames)
+        if not frames:
+            return {'frames': 0, 'fps': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'p99_ms': 0.0,
+                    'phases_ms': {}, 'slowest_ghost': None}
+
+        total = sum(f['duration'] for f in frames)
+        busy = []
+        phase_totals = {}
+        ghost_max = {}
+        for f in frames:
+            wait = 0.0
+            for name, _, duration in f['phases']:
+                phase_totals[name] = phase_totals.get(name, 0.0) + duration
+                if name == 'wait':
+                    wait += duration
+            busy.append((f['duration'] - wait) * 1000)
+            for index, seconds in f['ghosts']:
+                if seconds > ghost_max.get(index, 0.0):
+                    ghost_max[index] = seconds
+        busy.sort()
+
+        slowest = None
+        if ghost_max:
+            index = max(ghost_max, key=ghost_max.get)
+            slowest = {'ghost': index, 'max_ms': ghost_max[index] * 1000}
+
+        return {
+            'frames': len(frames),
+            'fps': len(frames) / total if total else 0.0,
+            'p50_ms': _percentile(busy, 50),
+            'p95_ms': _percentile(busy, 95),
+            'p99_ms': _percentile(busy, 99),
+            'phases_ms': {name: t * 1000 / len(frames) for name, t in phase_totals.items()},
+            'slowest_ghost': slowest
+        }
+
+    def overlay_lines(self):
+        """Text lines for the HUD overlay"""
+        s = self.summary()
+        lines = [
+            f"FPS: {s['fps']:.1f}",
+            f"frame ms p50/p95/p99: {s['p50_ms']:.2f} / {s['p95_ms']:.2f} / {s['p99_ms']:.2f}"
+        ]
+        for name, ms in s['phases_ms'].items():
+            lines.append(f"{name}: {ms:.2f} ms")
+        if s['slowest_ghost'] is not None:
+            lines.append(f"slowest ghost: #{s['slowest_ghost']['ghost']} "
+                         f"{s['slowest_ghost']['max_ms']:.2f} ms")
+        return lines
+
+    def draw_overlay(self, surface, font):
+        """Draw the overlay in the top-right corner of surface"""
+        import pygame
+        rendered = [font.render(line, True, (0, 255, 0)) for line in self.overlay_lines()]
+        width = max(r.get_width() for r in rendered) + 16
+        height = sum(r.get_height() for r in rendered) + 12
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        y = 6
+        for r in rendered:
+            panel.blit(r, (8, y))
+            y += r.get_height()
+        x = surface.get_width() - width - 8
+        surface.blit(panel, (x, 8))
+        return pygame.Rect(x, 8, width, height)
+
+    def dump_json(self, path):
+        """Write the buffered frames and their summary as plain JSON"""
+        frames = [{
+            'start_ms': (f['start'] - self.origin) * 1000,
+            'duration_ms': f['duration'] * 1000,
+            'phases': {name: duration * 1000 for name, _, duration in f['phases']},
+            'ghosts': {str(i): seconds * 1000 for i, seconds in f['ghosts']}
+        } for f in self.frames]
+        with open(path, 'w', encoding='utf-8') as fp:
+            json.dump({'summary': self.summary(), 'frames': frames}, fp, indent=2)
+        return path
+
+    def dump_chrome_trace(self, path):
+        """
+        Write the buffered frames in Chrome trace event format
+        (open with chrome://tracing or https://ui.perfetto.dev)
+        """
+        def us(t):
+            return (t - self.origin) * 1e6
+
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': 0, 'tid': 0,
+                   'args': {'name': 'frame'}}]
+        ghost_threads = set()
+        for n, f in enumerate(self.frames):
+            events.append({'name': 'frame', 'ph': 'X', 'pid': 0, 'tid': 0,
+                           'ts': us(f['start']), 'dur': f['duration'] * 1e6,
+                           'args': {'frame': n}})
+            update_start = f['start']
+            for name, start, duration in f['phases']:
+                events.append({'name': name, 'ph': 'X', 'pid': 0, 'tid': 0,
+                               'ts': us(start), 'dur': duration * 1e6})
+                if name == 'update':
+                    update_start = start
+            # Ghost replans run inside the update phase
+            for index, seconds in f['ghosts']:
+                ghost_threads.add(index)
+                events.append({'name': 'plan', 'ph': 'X', 'pid': 0, 'tid': index + 1,
+                               'ts': us(update_start), 'dur': seconds * 1e6})
+        for index in sorted(ghost_threads):
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': 0, 'tid': index + 1,
+                           'args': {'name': f'ghost {index}'}})
+        with open(path, 'w', encoding='utf-8') as fp:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, fp)
+        return path
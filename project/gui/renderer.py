@@ -0,0 +1,107 @@
+"""
+Layered renderer - walls pre-rendered once, pellets on a background layer
+updated as they are eaten, and only dirty rectangles pushed to the display
+"""
+import pygame
+
+WALL_COLOR = (33, 33, 255)
+PELLET_COLOR = (255, 255, 255)
+POWER_PELLET_COLOR = (255, 255, 0)
+
+
+class Renderer:
+    """
+    Keeps a background surface (walls + pellets) in sync with the map and
+    redraws only what changed since the last frame.
+
+    Per frame:
+        renderer.begin()            # restore last frame's dirty regions
+        renderer.mark(sprite_rect)  # for everything drawn on top
+        renderer.present()          # display.update(dirty rects)
+    """
+
+    def __init__(self, screen, game_map):
+        """
+        Args:
+            screen: Display surface
+            game_map: Game map (walls are cached per map version)
+        """
+        self.screen = screen
+        self.game_map = game_map
+        self.tile = game_map.tile_size
+        self.walls = None
+        self.background = None
+        self.version = None
+        self._previous = []   # rects drawn over the background last frame
+        self._pending = []    # background changes not yet on screen
+        self._rects = []      # rects to push to the display this frame
+        self._full = True
+
+    def _tile_rect(self, pos):
+        return pygame.Rect(pos[0] * self.tile, pos[1] * self.tile, self.tile, self.tile)
+
+    def rebuild(self):
+        """Render the wall layer and the pellet layer from scratch"""
+        game_map = self.game_map
+        self.walls = pygame.Surface(self.screen.get_size()).convert()
+        self.walls.fill((0, 0, 0))
+        for y, row in enumerate(game_map.grid):
+            for x, ch in enumerate(row):
+                if ch == '#':
+                    pygame.draw.rect(self.walls, WALL_COLOR, self._tile_rect((x, y)))
+
+        self.background = self.walls.copy()
+        half = self.tile // 2
+        for p in game_map.pellets:
+            pygame.draw.circle(self.background, PELLET_COLOR,
+                               (p[0] * self.tile + half, p[1] * self.tile + half), 3)
+        for p in game_map.power_pellets:
+            pygame.draw.circle(self.background, POWER_PELLET_COLOR,
+                               (p[0] * self.tile + half, p[1] * self.tile + half), 6)
+        self.version = getattr(game_map, 'version', None)
+        self.invalidate()
+
+    def invalidate(self):
+        """Force a full redraw on the next frame"""
+        self._full = True
+        self._pending = []
+
+    def eat(self, positions):
+        """Erase eaten pellets from the background layer"""
+        if self.background is None:
+            return
+        for pos in positions:
+            rect = self._tile_rect(pos)
+            self.background.blit(self.walls, rect, rect)
+            self._pending.append(rect)
+
+    def begin(self):
+        """Start a frame: restore the regions drawn over last frame"""
+        if self.background is None or getattr(self.game_map, 'version', None) != self.version:
+            self.rebuild()
+        screen = self.screen
+        if self._full:
+            screen.blit(self.background, (0, 0))
+            self._rects = [screen.get_rect()]
+        else:
+            self._rects = self._previous + self._pending
+            for rect in self._rects:
+                screen.blit(self.background, rect, rect)
+        self._previous = []
+        self._pending = []
+
+    def mark(self, rect):
+        """Register a rect drawn over the background this frame"""
+        if rect is not None:
+            rect = pygame.Rect(rect)
+            self._previous.append(rect)
+            self._rects.append(rect)
+
+    def present(self):
+        """Push the frame to the display"""
+        if self._full:
+            pygame.display.flip()
+            self._full = False
+        else:
+            pygame.display.update(self._rects)
+        return self._rects
@@ -1,13 +1,190 @@
+from array import array
+from itertools import count
 from pathlib import Path
+
+import numpy as np
+
+DIRECTIONS = ((1,0),(-1,0),(0,1),(0,-1))
+# Map versions are unique across GameMap instances so caches keyed by
+# version never mix two maps, and set_tile() bumps the version.
+_versions = count()
+# set_tile() changes kept for changed_tiles(); older history falls back to None
+TILE_LOG_SIZE = 1024
+
+class CellPositions:
+    """Read-only sequence view: ``positions[cid] == (x, y)``, computed on access."""
+    __slots__ = ('width','size')
+    def __init__(self,width,size):
+        self.width = width
+        self.size = size
+    def __len__(self):
+        return self.size
+    def __getitem__(self,cid):
+        if not 0 <= cid < self.size:
+            raise IndexError(cid)
+        return (cid % self.width, cid // self.width)
+    def __iter__(self):
+        w = self.width
+        return ((c % w, c // w) for c in range(self.size))
+
+class CompiledMap:
+    """Flat walkability buffer and CSR neighbor table, built once from a grid.
+
+    Cell ids are ``y * width + x``. ``offsets``/``targets`` form the CSR table:
+    the neighbors of cell ``cid`` are ``targets[offsets[cid]:offsets[cid+1]]``,
+    in the same order as ``GameMap.neighbors``.
+
+    The CSR arrays are the only structures built eagerly. ``adjacency`` (tuples
+    by cell id) is built on first use, ``pos_adjacency`` (dict by position) is
+    filled per walkable cell as ``neighbors`` visits it, and ``positions`` is a
+    computed view.
+    """
+    def __init__(self,grid):
+        self.height = len(grid)
+        self.width = len(grid[0]) if grid else 0
+        w,h = self.width,self.height
+        self.size = w*h
+        self.walkable = bytearray(self.size)
+        for y,row in enumerate(grid):
+            base = y*w
+            for x,ch in enumerate(row[:w]):
+                if ch != '#':
+                    self.walkable[base+x] = 1
+        walkable = self.walkable
+        offsets = array('i',[0])
+        targets = array('i')
+        add_target = targets.append
+        add_offset = offsets.append
+        # Same order as DIRECTIONS: right, left, down, up
+        for y in range(h):
+            base = y*w
+            down = y+1 < h
+            for cid in range(base,base+w):
+                if cid+1 < base+w and walkable[cid+1]:
+                    add_target(cid+1)
+                if cid > base and walkable[cid-1]:
+                    add_target(cid-1)
+                if down and walkable[cid+w]:
+                    add_target(cid+w)
+                if y and walkable[cid-w]:
+                    add_target(cid-w)
+                add_offset(len(targets))
+        self.offsets = offsets
+        self.targets = targets
+        self.positions = CellPositions(w,self.size)
+        self._adjacency = None
+        self.pos_adjacency = {}
+        self._padded = None
+    @property
+    def adjacency(self):
+        """Neighbor ids by cell id; walls share one empty tuple."""
+        if self._adjacency is None:
+            offsets,targets,walkable = self.offsets,self.targets,self.walkable
+            empty = ()
+            self._adjacency = [tuple(targets[offsets[c]:offsets[c+1]]) if walkable[c] else empty
+                               for c in range(self.size)]
+        return self._adjacency
+    def cell_id(self,pos):
+        return pos[1]*self.width + pos[0]
+    def cell_pos(self,cid):
+        return self.positions[cid]
+    def is_walkable(self,cid):
+        return self.walkable[cid] == 1
+    def walkable_ids(self):
+        return [c for c in range(self.size) if self.walkable[c]]
+    def neighbor_ids(self,cid):
+        return tuple(self.targets[self.offsets[cid]:self.offsets[cid+1]])
+    def neighbors(self,pos):
+        """Neighbor positions of a walkable cell (memoized in pos_adjacency),
+        or None for walls and out-of-bounds positions."""
+        nbrs = self.pos_adjacency.get(pos)
+        if nbrs is None:
+            x,y = pos
+            w = self.width
+            if not (0 <= x < w and 0 <= y < self.height):
+                return None
+            cid = y*w + x
+            if not self.walkable[cid]:
+                return None
+            targets = self.targets[self.offsets[cid]:self.offsets[cid+1]]
+            nbrs = self.pos_adjacency[pos] = tuple((n % w, n // w) for n in targets)
+        return nbrs
+    def _csr_row(self,cid):
+        """Walkable neighbors of cid in DIRECTIONS order, from the walkable buffer."""
+        w,walkable = self.width,self.walkable
+        x,y = cid % w, cid // w
+        row = array('i')
+        if x+1 < w and walkable[cid+1]:
+            row.append(cid+1)
+        if x > 0 and walkable[cid-1]:
+            row.append(cid-1)
+        if y+1 < self.height and walkable[cid+w]:
+            row.append(cid+w)
+        if y > 0 and walkable[cid-w]:
+            row.append(cid-w)
+        return row
+    def set_walkable(self,pos,walkable):
+        """Patch one cell in place: its flag, the CSR rows of its neighbors
+        and whatever lazy views were already built."""
+        x,y = pos
+        w = self.width
+        if not (0 <= x < w and 0 <= y < self.height):
+            return
+        cid = y*w + x
+        flag = 1 if walkable else 0
+        if self.walkable[cid] == flag:
+            return
+        self.walkable[cid] = flag
+        offsets,targets = self.offsets,self.targets
+        nbrs = [n for n,ok in ((cid-w,y > 0),(cid-1,x > 0),(cid+1,x+1 < w),(cid+w,y+1 < self.height)) if ok]
+        # Highest id first so the offsets of lower rows stay valid while resizing
+        shifts = []
+        for n in reversed(nbrs):
+            start,end = offsets[n],offsets[n+1]
+            row = self._csr_row(n)
+            targets[start:end] = row
+            shifts.append((n+1,len(row)-(end-start)))
+        view = np.frombuffer(offsets,dtype=np.intc)
+        for first,delta in shifts:
+            view[first:] += delta
+        del view
+        if self._adjacency is not None:
+            for n in nbrs+[cid]:
+                self._adjacency[n] = tuple(targets[offsets[n]:offsets[n+1]]) if self.walkable[n] else ()
+        for n in nbrs+[cid]:
+            self.pos_adjacency.pop((n % w, n // w),None)
+        if self._padded is not None:
+            buf,stride = self._padded
+            buf[(y+1)*stride+x+1] = flag
+    def padded(self):
+        """Walkability with a one-cell wall border: (buffer, stride).
+        Index of (x, y) is (y+1)*stride + x+1, so scans need no bounds checks."""
+        if self._padded is None:
+            w = self.width
+            stride = w+2
+            buf = bytearray(stride*(self.height+2))
+            for y in range(self.height):
+                start = (y+1)*stride+1
+                buf[start:start+w] = self.walkable[y*w:(y+1)*w]
+            self._padded = (buf,stride)
+        return self._padded
+
 class GameMap:
-    def __init__(self,path):
+    def __init__(self,path=None,compiled=False,text=None):
         self.tile_size = 32
         self.grid = []
         self.pellets = set()
         self.power_pellets = set()
         self.ghost_positions = []
         self.start = (1,1)
-        for y,line in enumerate(Path(path).read_text().splitlines()):
+        self.compiled = None
+        self.version = next(_versions)
+        self._log_base = self.version
+        self._tile_log = []
+        self.map_path = Path(path) if path is not None else None
+        if text is None:
+            text = self.map_path.read_text()
+        for y,line in enumerate(text.splitlines()):
             row = list(line.rstrip("\n"))
             self.grid.append(row)
             for x,ch in enumerate(row):
@@ -21,6 +198,46 @@ class GameMap:
                 if ch == 'G':
                     self.ghost_positions.append((x,y))
                     self.grid[y][x] = ' '
+        self._initial_pellets = (frozenset(self.pellets),frozenset(self.power_pellets))
+        if compiled:
+            self.compile()
+    @classmethod
+    def from_text(cls,text,compiled=False):
+        return cls(compiled=compiled,text=text)
+    def compile(self):
+        if self.compiled is None:
+            self.compiled = CompiledMap(self.grid)
+        return self.compiled
+    def set_tile(self,pos,ch):
+        x,y = pos
+        self.grid[y][x] = ch
+        self.version = next(_versions)
+        self._tile_log.append((self.version,(x,y)))
+        drop = len(self._tile_log) - TILE_LOG_SIZE
+        if drop > 0:
+            self._log_base = self._tile_log[drop-1][0]
+            del self._tile_log[:drop]
+        if self.compiled is not None:
+            self.compiled.set_walkable((x,y),ch != '#')
+    def reset_pellets(self):
+        """Put back every pellet the map was loaded with. Walls and version are
+        untouched, so caches keyed by version stay valid across games."""
+        pellets,power_pellets = self._initial_pellets
+        self.pellets.clear()
+        self.pellets.update(pellets)
+        self.power_pellets.clear()
+        self.power_pellets.update(power_pellets)
+    def changed_tiles(self,since):
+        """Positions changed by set_tile() after version ``since``, or None
+        if the log no longer reaches back that far."""
+        if since == self.version:
+            return []
+        if since == self._log_base:
+            return [pos for _,pos in self._tile_log]
+        for i,(version,_) in enumerate(self._tile_log):
+            if version == since:
+                return [pos for _,pos in self._tile_log[i+1:]]
+        return None
     def in_bounds(self,pos):
         x,y = pos
         return 0 <= y < len(self.grid) and 0 <= x < len(self.grid[0])
@@ -32,8 +249,16 @@ class GameMap:
             return False
         return self.grid[y][x] != '#'
     def neighbors(self,pos):
+        if self.compiled is not None:
+            nbrs = self.compiled.pos_adjacency.get(pos)
+            if nbrs is None:
+                nbrs = self.compiled.neighbors(pos)
+            if nbrs is not None:
+                return nbrs
+        return self._scan_neighbors(pos)
+    def _scan_neighbors(self,pos):
         x,y = pos
-        for dx,dy in ((1,0),(-1,0),(0,1),(0,-1)):
+        for dx,dy in DIRECTIONS:
             n = (x+dx,y+dy)
             if self.in_bounds(n) and self.passable(n):
                 yield n
@@ -0,0 +1,192 @@
+"""
+مولّد خرائط Pac-Man إجرائي لاختبارات التوسع
+
+يُنتج متاهات بممرات وحلقات وبيت للأشباح وكرات وعلامات P/G بأي حجم
+(حتى 2000x2000)، بشكل قابل للتكرار عبر البذرة. المخرجات نص بنفس صيغة
+ملفات maps/ وتُحمَّل عبر GameMap.
+
+    text = generate_maze(200, 100, seed=1)
+    game_map = generate_map(200, 100, seed=1)
+    path = ensure_maze_file(200, 100, seed=1)   # maps/generated_200x100_s1.txt
+"""
+import argparse
+import random
+from pathlib import Path
+
+from map import GameMap
+
+WALL = ord('#')
+OPEN = ord(' ')
+MAPS_DIR = Path(__file__).parent / "maps"
+MIN_SIZE = 7
+
+
+def generate_maze(width, height, seed=None, braid=0.7, ghosts=4, ghost_house=True):
+    """
+    توليد متاهة نصية
+
+    Args:
+        width: عدد الأعمدة
+        height: عدد الصفوف
+        seed: البذرة (نفس البذرة -> نفس المتاهة)
+        braid: احتمال فتح كل طريق مسدود لتكوين حلقات (0 = متاهة شجرية)
+        ghosts: عدد علامات G
+        ghost_house: إنشاء بيت للأشباح في الوسط إن اتسعت الخريطة
+
+    Returns:
+        نص الخريطة (أسطر مفصولة بـ newline)
+    """
+    if width < MIN_SIZE or height < MIN_SIZE:
+        raise ValueError(f"map must be at least {MIN_SIZE}x{MIN_SIZE}, got {width}x{height}")
+    rng = random.Random(seed)
+    grid = bytearray([WALL]) * (width * height)
+
+    # شبكة الخلايا: الخلية (i, j) هي البلاطة (2i+1, 2j+1)
+    cw, ch = (width - 1) // 2, (height - 1) // 2
+
+    def tile(i, j):
+        return (2 * j + 1) * width + 2 * i + 1
+
+    # حجز بيت الأشباح قبل حفر المتاهة حتى تلتف الممرات حوله
+    reserved = bytearray(cw * ch)
+    house = None
+    hw, hh = 3, 2
+    if ghost_house and cw >= hw + 4 and ch >= hh + 4:
+        hi, hj = (cw - hw) // 2, (ch - hh) // 2
+        house = (hi, hj)
+        for j in range(hj, hj + hh):
+            for i in range(hi, hi + hw):
+                reserved[j * cw + i] = 1
+
+    # المتاهة: بحث بالعمق عشوائي تكراري (ممرات طويلة)
+    visited = bytearray(reserved)
+    start = rng.randrange(cw * ch)
+    while visited[start]:
+        start = rng.randrange(cw * ch)
+    visited[start] = 1
+    grid[tile(start % cw, start // cw)] = OPEN
+    stack = [start]
+    steps = ((1, 0), (-1, 0), (0, 1), (0, -1))
+    while stack:
+        c = stack[-1]
+        i, j = c % cw, c // cw
+        options = []
+        for di, dj in steps:
+            ni, nj = i + di, j + dj
+            if 0 <= ni < cw and 0 <= nj < ch and not visited[nj * cw + ni]:
+                options.append((di, dj))
+        if not options:
+            stack.pop()
+            continue
+        di, dj = options[rng.randrange(len(options))]
+        n = (j + dj) * cw + i + di
+        visited[n] = 1
+        grid[tile(i, j) + dj * width + di] = OPEN
+        grid[tile(i + di, j + dj)] = OPEN
+        stack.append(n)
+
+    # الحلقات: فتح جدار عشوائي من كل طريق مسدود باحتمال braid
+    for j in range(ch):
+        for i in range(cw):
+            if reserved[j * cw + i]:
+                continue
+            t = tile(i, j)
+            walls = []
+            open_count = 0
+            for di, dj in steps:
+                ni, nj = i + di, j + dj
+                if not (0 <= ni < cw and 0 <= nj < ch) or reserved[nj * cw + ni]:
+                    continue
+                if grid[t + dj * width + di] == OPEN:
+                    open_count += 1
+                else:
+                    walls.append((di, dj))
+            if open_count == 1 and walls and rng.random() < braid:
+                di, dj = walls[rng.randrange(len(walls))]
+                grid[t + dj * width + di] = OPEN
+
+    # بيت الأشباح: فراغ داخلي مع باب في الأعلى
+    house_tiles = set()
+    if house is not None:
+        hi, hj = house
+        for y in range(2 * hj + 1, 2 * (hj + hh - 1) + 2):
+            for x in range(2 * hi + 1, 2 * (hi + hw - 1) + 2):
+                grid[y * width + x] = OPEN
+                house_tiles.add((x, y))
+        door_x = 2 * (hi + hw // 2) + 1
+        grid[(2 * hj) * width + door_x] = OPEN
+        house_tiles.add((door_x, 2 * hj))
+
+    # اللاعب في أسفل الوسط
+    pi, pj = cw // 2, (ch * 3) // 4
+    if reserved[pj * cw + pi]:
+        pj = ch - 1
+    player = (2 * pi + 1, 2 * pj + 1)
+
+    # الكرات في كل الممرات، والكرات الكبيرة في الزوايا
+    grid = bytearray(grid.replace(b' ', b'.'))
+    for x, y in house_tiles:
+        grid[y * width + x] = OPEN
+    corners = ((0, 0), (cw - 1, 0), (0, ch - 1), (cw - 1, ch - 1))
+    for i, j in corners:
+        grid[tile(i, j)] = ord('o')
+    grid[player[1] * width + player[0]] = ord('P')
+
+    # الأشباح داخل البيت، والباقي في خلايا عشوائية
+    spawns = sorted(house_tiles - {(door_x, 2 * house[1])}) if house else []
+    spawns = rng.sample(spawns, min(ghosts, len(spawns)))
+    if len(spawns) < ghosts:
+        # خلايا حرة فقط: بدون اللاعب والكرات الكبيرة وما اختير سابقاً
+        taken = set(spawns) | {(2 * i + 1, 2 * j + 1) for i, j in corners} | {player}
+        free = [(2 * i + 1, 2 * j + 1) for j in range(ch) for i in range(cw)
+                if not reserved[j * cw + i] and (2 * i + 1, 2 * j + 1) not in taken]
+        spawns += rng.sample(free, min(ghosts - len(spawns), len(free)))
+    for x, y in spawns:
+        grid[y * width + x] = ord('G')
+
+    return "\n".join(grid[y * width:(y + 1) * width].decode('ascii') for y in range(height)) + "\n"
+
+
+def generated_map_path(width, height, seed, directory=None):
+    """اسم الملف القياسي لخريطة مولّدة"""
+    return Path(directory or MAPS_DIR) / f"generated_{width}x{height}_s{seed}.txt"
+
+
+def write_maze(path, width, height, seed=None, **options):
+    """توليد متاهة وكتابتها في ملف"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(generate_maze(width, height, seed, **options))
+    return path
+
+
+def ensure_maze_file(width, height, seed=0, directory=None, **options):
+    """مسار ملف المتاهة المولّدة (تُكتب مرة واحدة فقط)"""
+    path = generated_map_path(width, height, seed, directory)
+    if not path.exists():
+        write_maze(path, width, height, seed, **options)
+    return path
+
+
+def generate_map(width, height, seed=None, compiled=True, **options):
+    """توليد متاهة وتحميلها مباشرة كـ GameMap بدون ملف"""
+    return GameMap.from_text(generate_maze(width, height, seed, **options), compiled=compiled)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a Pac-Man maze")
+    parser.add_argument("width", type=int)
+    parser.add_argument("height", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--braid", type=float, default=0.7)
+    parser.add_argument("--ghosts", type=int, default=4)
+    parser.add_argument("-o", "--output", help="output file (default: maps/generated_WxH_sSEED.txt)")
+    args = parser.parse_args()
+
+    path = args.output or generated_map_path(args.width, args.height, args.seed)
+    write_maze(path, args.width, args.height, args.seed, braid=args.braid, ghosts=args.ghosts)
+    print(f"Map written to: {path}")
+
+
+if __name__ == "__main__":
+    main()
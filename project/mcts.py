@@ -0,0 +1,394 @@
+"""
+لاعب Monte Carlo Tree Search - محاكاة سريعة لقواعد اللعبة موزعة على عدة عمليات
+
+كل عامل يبني شجرة UCT مستقلة من نفس الحالة (root parallelization) حتى
+نهاية الميزانية الزمنية، ثم تُجمع زيارات أفعال الجذر ويُختار الأكثر زيارة:
+
+    with MCTSPlayer(state.game_map, time_budget=0.05, workers=4) as player:
+        state.run(policy=player)
+        print(player.last_stats['rollouts_per_sec_per_core'])
+"""
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from algorithms import astar
+from autopilot import PelletField
+from engine import PELLET_SCORE, POWER_PELLET_SCORE, GHOST_SCORE, FRIGHT_FRAMES
+from map import DIRECTIONS
+
+GHOST_MOVE_SPEED = 3
+DEATH_PENALTY = 500
+WIN_BONUS = 1000
+MAX_HOPS = 200000  # حد ذاكرة خطوات الأشباح في كل عامل
+# فعل البقاء في المكان: الفعل الوحيد عندما لا يوجد اتجاه ممكن
+STAY = len(DIRECTIONS)
+MOVES = DIRECTIONS + ((0, 0),)
+
+
+class RolloutRules:
+    """
+    نسخة خفيفة من قواعد GameState على معرّفات الخلايا
+
+    الحالة قائمة قابلة للنسخ:
+        [player, ghosts, move_timers, fright_timers, frightened, eaten,
+         score, lives, done, last_action]
+    الكرات لا تُنسخ: eaten مجموعة صغيرة بما أُكل منذ الجذر فقط.
+    """
+
+    def __init__(self, gamemap, algorithm=astar):
+        self.gamemap = gamemap
+        self.algorithm = algorithm
+        self.compiled = gamemap.compile()
+        self.version = getattr(gamemap, 'version', None)
+        self.player_start = self.compiled.cell_id(gamemap.start)
+        self.pellet_field = PelletField(gamemap)
+        self._hops = {}   # (ghost, player) -> خلية الشبح التالية
+        self.pellets = frozenset()
+        self.power_pellets = frozenset()
+        self.ghost_starts = ()
+
+    def hop(self, ghost, player):
+        """خطوة الشبح التالية نحو اللاعب بخوارزمية الشبح (محفوظة)"""
+        key = (ghost, player)
+        nxt = self._hops.get(key)
+        if nxt is None:
+            positions = self.compiled.positions
+            path = self.algorithm(self.gamemap, positions[ghost], positions[player])
+            nxt = self.compiled.cell_id(path[1]) if path and len(path) > 1 else ghost
+            if len(self._hops) >= MAX_HOPS:
+                self._hops.clear()
+            self._hops[key] = nxt
+        return nxt
+
+    def root(self, snapshot):
+        """تجهيز حالة الجذر من snapshot (يُستدعى مرة لكل حركة)"""
+        (player, ghosts, ghost_starts, move_timers, fright_timers, frightened,
+         pellets, power_pellets, score, lives) = snapshot
+        cell_id = self.compiled.cell_id
+        self.pellets = frozenset(cell_id(p) for p in pellets)
+        self.power_pellets = frozenset(cell_id(p) for p in power_pellets)
+        self.ghost_starts = tuple(cell_id(p) for p in ghost_starts)
+        self.pellet_field.sync(pellets, power_pellets)
+        return [cell_id(player), [cell_id(g) for g in ghosts], list(move_timers),
+                list(fright_timers), list(frightened), set(), score, lives, False, None]
+
+    @staticmethod
+    def copy(state):
+        return [state[0], list(state[1]), list(state[2]), list(state[3]), list(state[4]),
+                set(state[5]), state[6], state[7], state[8], state[9]]
+
+    def actions(self, state):
+        """الاتجاهات الممكنة من موضع اللاعب ([STAY] إن كان محاصراً)"""
+        compiled = self.compiled
+        w = compiled.width
+        x, y = compiled.positions[state[0]]
+        actions = [k for k, (dx, dy) in enumerate(DIRECTIONS)
+                   if 0 <= x + dx < w and 0 <= y + dy < compiled.height
+                   and compiled.walkable[state[0] + dx + dy * w]]
+        return actions or [STAY]
+
+    def step(self, state, action, rng):
+        """
+        تقدم الحالة إطاراً واحداً بنفس ترتيب GameState.step
+
+        Returns:
+            المكافأة (النقاط المكتسبة ناقص DEATH_PENALTY لكل روح مفقودة)
+        """
+        dx, dy = MOVES[action]
+        player = state[0] + dx + dy * self.compiled.width
+        state[0] = player
+        state[9] = action
+        ghosts, timers, fright, frightened = state[1], state[2], state[3], state[4]
+        adjacency = self.compiled.adjacency
+
+        for i, ghost in enumerate(ghosts):
+            if fright[i] > 0:
+                fright[i] -= 1
+                if fright[i] <= 0:
+                    frightened[i] = False
+            timers[i] += 1
+            if frightened[i]:
+                if timers[i] >= GHOST_MOVE_SPEED * 2:
+                    nbrs = adjacency[ghost]
+                    if nbrs:
+                        ghosts[i] = nbrs[int(rng.random() * len(nbrs))]
+                    timers[i] = 0
+            elif timers[i] >= GHOST_MOVE_SPEED:
+                nxt = self.hop(ghost, player)
+                if nxt != ghost:
+                    ghosts[i] = nxt
+                    timers[i] = 0
+
+        reward = 0
+        eaten = state[5]
+        if player not in eaten:
+            if player in self.pellets:
+                eaten.add(player)
+                reward += PELLET_SCORE
+            elif player in self.power_pellets:
+                eaten.add(player)
+                reward += POWER_PELLET_SCORE
+                for i in range(len(ghosts)):
+                    fright[i] = FRIGHT_FRAMES
+                    frightened[i] = True
+
+        for i in range(len(ghosts)):
+            if ghosts[i] != state[0]:
+                continue
+            if frightened[i]:
+                ghosts[i] = self.ghost_starts[i]
+                frightened[i] = False
+                reward += GHOST_SCORE
+            else:
+                reward -= DEATH_PENALTY
+                state[7] -= 1
+                state[0] = self.player_start
+                ghosts[:] = self.ghost_starts
+                for j in range(len(frightened)):
+                    frightened[j] = False
+                if state[7] <= 0:
+                    state[8] = True
+
+        if len(eaten) == len(self.pellets) + len(self.power_pellets):
+            reward += WIN_BONUS
+            state[8] = True
+        state[6] += reward
+        return reward
+
+    def rollout(self, state, depth, rng):
+        """حركات عشوائية (بدون رجوع إلا في الطريق المسدود) ثم تقييم الموضع"""
+        reward = 0
+        for _ in range(depth):
+            if state[8]:
+                return reward
+            actions = self.actions(state)
+            last = state[9]
+            if last is not None and len(actions) > 1:
+                back = last ^ 1  # DIRECTIONS مرتبة أزواجاً متعاكسة
+                actions = [a for a in actions if a != back]
+            reward += self.step(state, actions[int(rng.random() * len(actions))], rng)
+        # بعد الكرات المتبقية عن نهاية المحاكاة (نقطة لكل خطوة)
+        if not state[8]:
+            distance = self.pellet_field.distance[state[0]]
+            if distance == 0 and state[0] in state[5]:
+                distance = 1  # الكرة تحت اللاعب أُكلت داخل المحاكاة
+            reward -= min(distance, 100)
+        return reward
+
+
+class _Node:
+    __slots__ = ('visits', 'value', 'children')
+
+    def __init__(self):
+        self.visits = 0
+        self.value = 0.0
+        self.children = {}
+
+
+def uct_search(rules, root, time_budget, rng, rollout_depth=40, exploration=1.0):
+    """
+    بحث UCT مفتوح الحلقة: الشجرة تخزن تسلسلات الأفعال وتُعاد المحاكاة من
+    الجذر في كل تكرار (حركة الأشباح الخائفة عشوائية)
+
+    Returns:
+        (إحصاءات أفعال الجذر {action: (visits, value)}, عدد المحاكاات، عدد العقد)
+    """
+    scale = PELLET_SCORE * rollout_depth
+    tree = _Node()
+    nodes = 1
+    rollouts = 0
+    deadline = time.perf_counter() + time_budget
+    while True:
+        state = rules.copy(root)
+        node = tree
+        path = [tree]
+        reward = 0
+        depth = 0
+
+        # الاختيار ثم التوسيع
+        while not state[8] and depth < rollout_depth:
+            actions = rules.actions(state)
+            untried = [a for a in actions if a not in node.children]
+            if untried:
+                action = untried[int(rng.random() * len(untried))]
+                node.children[action] = child = _Node()
+                nodes += 1
+            else:
+                log_n = math.log(node.visits)
+                best = None
+                for a in actions:
+                    c = node.children[a]
+                    ucb = c.value / c.visits / scale + exploration * math.sqrt(log_n / c.visits)
+                    if best is None or ucb > best:
+                        best, action = ucb, a
+                child = node.children[action]
+            reward += rules.step(state, action, rng)
+            depth += 1
+            node = child
+            path.append(node)
+            if untried:
+                break
+
+        reward += rules.rollout(state, rollout_depth - depth, rng)
+        for n in path:
+            n.visits += 1
+            n.value += reward
+        rollouts += 1
+        if time.perf_counter() >= deadline:
+            break
+
+    children = {a: (c.visits, c.value) for a, c in tree.children.items()}
+    return children, rollouts, nodes
+
+
+# قواعد كل عملية عاملة (تُبنى مرة عند بدء المجمّع)
+_worker_rules = None
+
+
+def _init_worker(gamemap, algorithm):
+    global _worker_rules
+    _worker_rules = RolloutRules(gamemap, algorithm)
+
+
+def _worker_search(snapshot, time_budget, seed, rollout_depth, exploration):
+    rules = _worker_rules
+    root = rules.root(snapshot)
+    return uct_search(rules, root, time_budget, random.Random(seed),
+                      rollout_depth, exploration)
+
+
+def snapshot(state):
+    """حالة GameState بصيغة قابلة للإرسال إلى العمال"""
+    ghosts = state.ghosts
+    return (tuple(state.player.pos),
+            tuple(tuple(g.pos) for g in ghosts),
+            tuple(tuple(g.start) for g in ghosts),
+            tuple(g.move_timer for g in ghosts),
+            tuple(g.fright_timer for g in ghosts),
+            tuple(g.state == "FRIGHTENED" for g in ghosts),
+            frozenset(state.game_map.pellets),
+            frozenset(state.game_map.power_pellets),
+            state.score,
+            state.lives)
+
+
+class MCTSPlayer:
+    """
+    سياسة للاعب بالتوقيع policy(state) -> action (كما في GameState.run)
+
+    workers=1 يبحث في العملية الحالية بدون مجمّع.
+    """
+
+    def __init__(self, gamemap, algorithm=astar, time_budget=0.05, workers=None,
+                 rollout_depth=40, exploration=1.0, seed=None):
+        """
+        Args:
+            gamemap: خريطة اللعبة
+            algorithm: خوارزمية الأشباح في المحاكاة (نفس خوارزمية Ghost)
+            time_budget: زمن البحث لكل حركة بالثواني
+            workers: عدد العمليات (افتراضي: عدد الأنوية)
+            rollout_depth: أقصى عدد إطارات في كل محاكاة
+            exploration: ثابت الاستكشاف في UCB1
+            seed: بذرة المولد العشوائي
+        """
+        # الدوال المغلَّفة (PathCache) لا تُرسل إلى العمليات الأخرى
+        self.algorithm = getattr(algorithm, '__wrapped__', algorithm)
+        self.gamemap = gamemap
+        self.time_budget = time_budget
+        self.workers = workers or os.cpu_count() or 1
+        self.rollout_depth = rollout_depth
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+        self._executor = None
+        self._rules = None
+        self._version = None
+        self.last_stats = None
+        self.moves = 0
+        self.total_rollouts = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _pool(self):
+        """المجمّع الحالي، ويُعاد إنشاؤه إذا تغيرت الخريطة"""
+        version = getattr(self.gamemap, 'version', None)
+        if self._executor is not None and version == self._version:
+            return self._executor
+        self.close()
+        self._executor = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                             initargs=(self.gamemap, self.algorithm))
+        self._version = version
+        return self._executor
+
+    def search(self, state):
+        """
+        البحث عن أفضل حركة للحالة الحالية
+
+        Returns:
+            (action, stats): الاتجاه (dx, dy) أو (0, 0) للبقاء أو None، وإحصاءات البحث
+                (rollouts, rollouts_per_sec, rollouts_per_sec_per_core, ...)
+        """
+        if state.game_map is not self.gamemap:
+            self.close()
+            self.gamemap = state.game_map
+            self._rules = None
+        snap = snapshot(state)
+        t0 = time.perf_counter()
+        if self.workers == 1:
+            if self._rules is None or self._rules.version != getattr(self.gamemap, 'version', None):
+                self._rules = RolloutRules(self.gamemap, self.algorithm)
+            root = self._rules.root(snap)
+            results = [uct_search(self._rules, root, self.time_budget, self.rng,
+                                  self.rollout_depth, self.exploration)]
+        else:
+            pool = self._pool()
+            futures = [pool.submit(_worker_search, snap, self.time_budget,
+                                   self.rng.getrandbits(32), self.rollout_depth,
+                                   self.exploration)
+                       for _ in range(self.workers)]
+            results = [f.result() for f in futures]
+        elapsed = time.perf_counter() - t0
+
+        visits, values = {}, {}
+        rollouts = nodes = 0
+        for children, count, size in results:
+            rollouts += count
+            nodes += size
+            for a, (n, v) in children.items():
+                visits[a] = visits.get(a, 0) + n
+                values[a] = values.get(a, 0.0) + v
+
+        action = None
+        if visits:
+            best = max(visits, key=lambda a: (visits[a], values[a] / visits[a]))
+            action = MOVES[best]
+
+        self.moves += 1
+        self.total_rollouts += rollouts
+        per_sec = rollouts / elapsed if elapsed > 0 else 0.0
+        self.last_stats = {
+            'action': action,
+            'rollouts': rollouts,
+            'elapsed_ms': elapsed * 1000,
+            'workers': self.workers,
+            'rollouts_per_sec': per_sec,
+            'rollouts_per_sec_per_core': per_sec / self.workers,
+            'tree_nodes': nodes,
+            'root': {MOVES[a]: {'visits': visits[a], 'mean_value': values[a] / visits[a]}
+                     for a in visits}
+        }
+        return action, self.last_stats
+
+    def __call__(self, state):
+        return self.search(state)[0]
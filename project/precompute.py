@@ -0,0 +1,26 @@
+"""
+Offline step: build the all-pairs distance / next-hop tables for maps
+and store them in the sidecar cache (maps/.cache) used by the game.
+
+Usage: python precompute.py [map files...]   (default: all maps/*.txt)
+"""
+import sys
+import time
+from pathlib import Path
+
+from map import GameMap
+from algorithms import load_distance_table
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    maps = [Path(a) for a in argv] or sorted((Path(__file__).parent / "maps").glob("*.txt"))
+    for map_path in maps:
+        start_time = time.perf_counter()
+        table = load_distance_table(GameMap(map_path, compiled=True))
+        elapsed = time.perf_counter() - start_time
+        print(f"{map_path.name}: {len(table.cells)} cells, {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
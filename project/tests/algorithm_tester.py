@@ -12,14 +12,28 @@ from map import GameMap
 from algorithms import (
     astar, dijkstra, bfs, dfs, 
     greedy_best_first, bidirectional_search, 
-    ida_star, theta_star
+    ida_star, theta_star, jump_point_search, hpa_star, PathCache,
+    on_junction_graph, collect_stats
 )
 
 class AlgorithmTester:
     """Class for testing and measuring algorithm performance"""
     
-    def __init__(self, map_path):
-        self.game_map = GameMap(map_path)
+    def __init__(self, map_path, compiled=True, path_cache=None, junction_graph=False):
+        """
+        Args:
+            map_path: Path to the map file
+            compiled: Load the map with its compiled adjacency table
+            path_cache: Optional PathCache (or maxsize int) shared by all
+                algorithms; timings then measure cached lookups after the
+                first run of each query
+            junction_graph: Run every algorithm on the contracted junction
+                graph instead of tiles (see algorithms.junction_graph)
+        """
+        self.game_map = GameMap(map_path, compiled=compiled)
+        if isinstance(path_cache, int):
+            path_cache = PathCache(maxsize=path_cache)
+        self.path_cache = path_cache
         self.algorithms = {
             'A*': astar,
             'Dijkstra': dijkstra,
@@ -28,10 +42,22 @@ class AlgorithmTester:
             'Greedy Best-First': greedy_best_first,
             'Bidirectional': bidirectional_search,
             'IDA*': ida_star,
-            'Theta*': theta_star
+            'Theta*': theta_star,
+            'JPS': jump_point_search,
+            'HPA*': hpa_star
         }
+        if junction_graph:
+            self.algorithms = {
+                name: on_junction_graph(algorithm)
+                for name, algorithm in self.algorithms.items()
+            }
+        if path_cache is not None:
+            self.algorithms = {
+                name: path_cache.wrap(algorithm, name)
+                for name, algorithm in self.algorithms.items()
+            }
     
-    def test_algorithm(self, algorithm_name, start, goal, num_runs=10, timeout=5.0):
+    def test_algorithm(self, algorithm_name, start, goal, num_runs=10, timeout=5.0, instrument=True):
         """
         Test a specific algorithm
         
@@ -41,6 +67,7 @@ class AlgorithmTester:
             goal: Goal point (x, y)
             num_runs: Number of runs for measurement
             timeout: Maximum time per run in seconds
+            instrument: Add search counters from one extra instrumented run
         
         Returns:
             dict: Test results
@@ -60,6 +87,13 @@ class AlgorithmTester:
                 path = algorithm(self.game_map, start, goal)
                 elapsed_time = time.time() - start_time
                 
+                # Searches that report running out of time or nodes
+                if getattr(path, 'exhausted', False):
+                    timeout_count += 1
+                    path_lengths.append(float('inf'))
+                    times.append(elapsed_time)
+                    continue
+                
                 # Check for timeout
                 if elapsed_time > timeout:
                     timeout_count += 1
@@ -89,9 +123,33 @@ class AlgorithmTester:
             'success_rate': success_rate,
             'times': times,
             'path_lengths': path_lengths,
-            'timeout_count': timeout_count
+            'timeout_count': timeout_count,
+            'stats': self.instrument_algorithm(algorithm_name, start, goal) if instrument else None
         }
     
+    def instrument_algorithm(self, algorithm_name, start, goal):
+        """
+        Run an algorithm once with search counters and tracemalloc enabled
+        
+        Kept separate from the timed runs so tracing does not skew timings.
+        
+        Args:
+            algorithm_name: Name of the algorithm
+            start: Start point (x, y)
+            goal: Goal point (x, y)
+        
+        Returns:
+            dict: expanded, generated, heap_pushes, heap_pops, peak_open and
+                peak_memory (bytes), or None if the run failed
+        """
+        algorithm = self.algorithms[algorithm_name]
+        try:
+            with collect_stats(trace_memory=True) as stats:
+                algorithm(self.game_map, start, goal)
+        except (RecursionError, MemoryError):
+            return None
+        return stats.as_dict()
+    
     def test_all_algorithms(self, start, goal, num_runs=10, timeout=5.0):
         """
         Test all algorithms
@@ -122,7 +180,7 @@ class AlgorithmTester:
                 print(f"Error: {e}")
         return results
     
-    def find_best_algorithm(self, start, goal, num_runs=10):
+    def find_best_algorithm(self, start, goal, num_runs=10, results=None):
         """
         Find the best algorithm based on accuracy and speed
         
@@ -133,12 +191,27 @@ class AlgorithmTester:
             start: Start point (x, y)
             goal: Goal point (x, y)
             num_runs: Number of runs
+            results: Results of a previous test_all_algorithms pass to score
+                instead of rerunning every algorithm
         
         Returns:
             dict: Best algorithm and its results
         """
-        results = self.test_all_algorithms(start, goal, num_runs)
+        if results is None:
+            results = self.test_all_algorithms(start, goal, num_runs)
+        return self.score_results(results)
+    
+    @staticmethod
+    def score_results(results):
+        """
+        Score test results and return the best one (see find_best_algorithm)
+        
+        Args:
+            results: List of test_algorithm results
         
+        Returns:
+            dict: Best result with its 'score', or None
+        """
         if not results:
             return None
         
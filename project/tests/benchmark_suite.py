@@ -0,0 +1,228 @@
+"""
+Benchmark Suite - latency distribution of every algorithm over many
+start/goal pairs, stratified by path length, with BFS ground truth
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from algorithm_tester import AlgorithmTester
+from map_generator import ensure_maze_file
+
+
+def bfs_distances(gamemap, source):
+    """Distances from source to every reachable cell"""
+    dist = {source: 0}
+    queue = deque([source])
+    while queue:
+        current = queue.popleft()
+        for neighbor in gamemap.neighbors(current):
+            if neighbor not in dist:
+                dist[neighbor] = dist[current] + 1
+                queue.append(neighbor)
+    return dist
+
+
+def sample_pairs(gamemap, count=200, strata=4, seed=0, sources=None):
+    """
+    Sample reachable start/goal pairs stratified by shortest path length
+
+    Args:
+        gamemap: Game map
+        count: Total number of pairs
+        strata: Number of equal-width path length bins
+        seed: Random seed (sampling is reproducible)
+        sources: Number of BFS sources to draw candidates from
+
+    Returns:
+        list: (start, goal, optimal_length) tuples, optimal_length in tiles
+    """
+    rng = random.Random(seed)
+    cells = [(x, y) for y, row in enumerate(gamemap.grid)
+             for x in range(len(row)) if gamemap.passable((x, y))]
+    if not cells:
+        return []
+
+    candidates = []
+    for source in rng.sample(cells, min(len(cells), sources or max(8, count // 4))):
+        for target, d in bfs_distances(gamemap, source).items():
+            if d > 0:
+                candidates.append((source, target, d + 1))
+    if not candidates:
+        return []
+
+    longest = max(c[2] for c in candidates)
+    width = max(1, (longest - 1) // strata + 1)
+    bins = [[] for _ in range(strata)]
+    for c in candidates:
+        bins[min(strata - 1, (c[2] - 2) // width)].append(c)
+    bins = [b for b in bins if b]
+
+    pairs = []
+    per_bin = count // len(bins)
+    extra = count - per_bin * len(bins)
+    for i, b in enumerate(bins):
+        take = per_bin + (1 if i < extra else 0)
+        pairs.extend(rng.sample(b, take) if take <= len(b) else [rng.choice(b) for _ in range(take)])
+    return pairs
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def is_valid_path(gamemap, path, start, goal):
+    """A contiguous walk of passable tiles from start to goal"""
+    if not path or path[0] != start or path[-1] != goal:
+        return False
+    return all(b in gamemap.neighbors(a) for a, b in zip(path, path[1:]))
+
+
+class BenchmarkSuite:
+    """Times every algorithm over many sampled pairs"""
+
+    def __init__(self, map_path, pairs=200, strata=4, seed=0, warmup=20, repeats=3,
+                 junction_graph=False):
+        """
+        Args:
+            map_path: Path to the map file
+            pairs: Number of start/goal pairs to sample
+            strata: Number of path length strata
+            seed: Sampling seed
+            warmup: Untimed queries per algorithm before timing
+            repeats: Timed runs per pair (latency is recorded for each)
+            junction_graph: Search on the contracted junction graph
+        """
+        self.tester = AlgorithmTester(map_path, junction_graph=junction_graph)
+        self.game_map = self.tester.game_map
+        self.pairs = sample_pairs(self.game_map, pairs, strata, seed)
+        self.warmup = warmup
+        # Pairs are ordered by stratum, so a prefix would only warm up on the
+        # shortest queries: sample the warmup set across all strata instead
+        rng = random.Random(seed)
+        self.warmup_pairs = rng.sample(self.pairs, min(warmup, len(self.pairs)))
+        self.repeats = repeats
+
+    def run_algorithm(self, name):
+        """
+        Benchmark one algorithm over all pairs
+
+        Returns:
+            dict: Latency percentiles (ms), throughput and path quality counts
+        """
+        algorithm = self.tester.algorithms[name]
+        gamemap = self.game_map
+
+        for start, goal, _ in self.warmup_pairs:
+            algorithm(gamemap, start, goal)
+
+        latencies = []
+        failures = suboptimal = invalid = exhausted = 0
+        excess = 0
+        total_ns = 0
+        for start, goal, optimal in self.pairs:
+            for _ in range(self.repeats):
+                t0 = time.perf_counter_ns()
+                path = algorithm(gamemap, start, goal)
+                elapsed = time.perf_counter_ns() - t0
+                latencies.append(elapsed)
+                total_ns += elapsed
+            if not path:
+                failures += 1
+                if getattr(path, 'exhausted', False):
+                    exhausted += 1
+            elif not is_valid_path(gamemap, path, start, goal):
+                invalid += 1
+            elif len(path) > optimal:
+                suboptimal += 1
+                excess += len(path) - optimal
+
+        latencies.sort()
+        queries = len(latencies)
+        return {
+            'name': name,
+            'pairs': len(self.pairs),
+            'queries': queries,
+            'median_ms': percentile(latencies, 50) / 1e6,
+            'p95_ms': percentile(latencies, 95) / 1e6,
+            'p99_ms': percentile(latencies, 99) / 1e6,
+            'mean_ms': total_ns / queries / 1e6 if queries else 0,
+            'qps': queries / (total_ns / 1e9) if total_ns else 0,
+            'failures': failures,
+            'timeouts': exhausted,
+            'suboptimal': suboptimal,
+            'avg_excess_length': excess / suboptimal if suboptimal else 0,
+            'invalid_paths': invalid
+        }
+
+    def run(self, algorithms=None, verbose=True):
+        """
+        Benchmark all (or the given) algorithms
+
+        Returns:
+            list: One result dict per algorithm
+        """
+        results = []
+        for name in algorithms or self.tester.algorithms:
+            if verbose:
+                print(f"Benchmarking {name}...", end=" ", flush=True)
+            results.append(self.run_algorithm(name))
+            if verbose:
+                print("Done")
+        return results
+
+
+def print_report(results):
+    print(f"\n{'Algorithm':<20}{'median':>10}{'p95':>10}{'p99':>10}{'qps':>10}"
+          f"{'fail':>6}{'subopt':>8}{'invalid':>9}")
+    for r in results:
+        print(f"{r['name']:<20}{r['median_ms']:>10.4f}{r['p95_ms']:>10.4f}{r['p99_ms']:>10.4f}"
+              f"{r['qps']:>10.0f}{r['failures']:>6}{r['suboptimal']:>8}{r['invalid_paths']:>9}")
+    print("(latencies in ms; suboptimal/invalid against BFS ground truth)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statistical benchmark of all algorithms")
+    parser.add_argument("--map", default=str(Path(__file__).parent.parent / "maps" / "map1.txt"))
+    parser.add_argument("--generate", metavar="WxH",
+                        help="benchmark on a generated maze of this size (written to maps/)")
+    parser.add_argument("--pairs", type=int, default=200)
+    parser.add_argument("--strata", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--junctions", action="store_true",
+                        help="run every algorithm on the contracted junction graph")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+    if args.generate:
+        width, height = (int(v) for v in args.generate.lower().split("x"))
+        args.map = str(ensure_maze_file(width, height, args.seed))
+
+    suite = BenchmarkSuite(args.map, args.pairs, args.strata, args.seed, args.warmup, args.repeats,
+                           args.junctions)
+    print(f"Map: {args.map}  Pairs: {len(suite.pairs)}  Repeats: {args.repeats}")
+    results = suite.run()
+    print_report(results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'map': args.map, 'pairs': len(suite.pairs), 'results': results},
+                      f, indent=2, ensure_ascii=False)
+        print(f"\nResults saved to: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Bidirectional Benchmark - expansions of bidirectional_search against
+unidirectional A* on long queries in large generated mazes
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from algorithms import astar, bidirectional_search
+from algorithms.instrumentation import collect_stats
+from benchmark_suite import bfs_distances
+from map_generator import generate_map
+
+
+def long_pairs(gamemap, count=30, sources=6, seed=0):
+    """
+    Start/goal pairs drawn from the 200 farthest cells of a few random sources
+
+    Returns:
+        list: (start, goal, optimal_length) tuples, optimal_length in moves
+    """
+    rng = random.Random(seed)
+    compiled = gamemap.compile()
+    cells = [compiled.cell_pos(cid) for cid in compiled.walkable_ids()]
+    pairs = []
+    for source in rng.sample(cells, sources):
+        dist = bfs_distances(gamemap, source)
+        farthest = sorted(dist.items(), key=lambda item: -item[1])[:200]
+        for target, d in rng.sample(farthest, -(-count // sources)):
+            pairs.append((source, target, d))
+    return pairs[:count]
+
+
+def compare(gamemap, pairs):
+    """
+    Returns:
+        dict: algorithm name -> (mean expanded, mean ms, suboptimal paths)
+    """
+    results = {}
+    for algorithm in (astar, bidirectional_search):
+        expanded = suboptimal = 0
+        seconds = 0.0
+        for start, goal, optimal in pairs:
+            t0 = time.perf_counter()
+            with collect_stats() as stats:
+                path = algorithm(gamemap, start, goal)
+            seconds += time.perf_counter() - t0
+            expanded += stats.expanded
+            if len(path) - 1 != optimal:
+                suboptimal += 1
+        results[algorithm.__name__] = (expanded / len(pairs), seconds / len(pairs) * 1000,
+                                       suboptimal)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bidirectional search vs A* on long maze queries")
+    parser.add_argument("--size", type=int, default=201, help="maze width and height")
+    parser.add_argument("--pairs", type=int, default=30)
+    parser.add_argument("--braids", default="0.0,0.7,1.0",
+                        help="comma separated braid values (0 = perfect maze)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'Braid':<7}{'Algorithm':<22}{'Expanded':>10}{'ms':>9}{'subopt':>8}")
+    for braid in (float(b) for b in args.braids.split(",")):
+        gamemap = generate_map(args.size, args.size, seed=args.seed, braid=braid)
+        results = compare(gamemap, long_pairs(gamemap, args.pairs, seed=args.seed))
+        for name, (expanded, ms, suboptimal) in results.items():
+            print(f"{braid:<7}{name:<22}{expanded:>10.0f}{ms:>9.1f}{suboptimal:>8}")
+        assert results['bidirectional_search'][2] == 0, "bidirectional_search returned suboptimal paths"
+        assert results['bidirectional_search'][0] < results['astar'][0], \
+            f"bidirectional_search expanded more nodes than astar at braid {braid}"
+
+    print("\nOK: bidirectional_search is optimal and expands fewer nodes than astar")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+HPA* Update Test - after GameMap.set_tile, plan() must rebuild only the
+clusters around the changed tiles and end up identical to a fresh build
+"""
+import argparse
+import random
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import map as map_module
+from algorithms.hpa_star import HierarchicalPlanner
+from map_generator import generate_map
+
+
+def count_calls(planner, name):
+    """Wrap a planner method so its calls are counted in calls[name]"""
+    calls = {name: 0}
+    method = getattr(planner, name)
+
+    def counted(*args, **kwargs):
+        calls[name] += 1
+        return method(*args, **kwargs)
+
+    setattr(planner, name, counted)
+    return calls
+
+
+def run(size=81, cluster_size=10, edits=20, seed=0):
+    rng = random.Random(seed)
+    gamemap = generate_map(size, size, seed=seed)
+    planner = HierarchicalPlanner(gamemap, cluster_size)
+    rebuilds = count_calls(planner, 'rebuild')
+    intra = count_calls(planner, '_build_intra')
+    total_clusters = planner.clusters_x * planner.clusters_y
+
+    cells = [(x, y) for y in range(1, size - 1) for x in range(1, size - 1)]
+    for _ in range(edits):
+        pos = rng.choice(cells)
+        gamemap.set_tile(pos, ' ' if gamemap.grid[pos[1]][pos[0]] == '#' else '#')
+        intra['_build_intra'] = 0
+        start, goal = rng.sample([c for c in cells if gamemap.passable(c)], 2)
+        path = planner.plan(start, goal)
+
+        # The changed cluster and its (at most 4) neighbours
+        assert rebuilds['rebuild'] == 0, "plan() fell back to a full rebuild"
+        assert 0 < intra['_build_intra'] <= 5, \
+            f"{intra['_build_intra']} of {total_clusters} clusters rebuilt"
+
+        fresh = HierarchicalPlanner(gamemap, cluster_size)
+        assert planner.borders == fresh.borders, "entrances differ from a fresh build"
+        assert planner.intra == fresh.intra, "intra-cluster distances differ from a fresh build"
+        assert len(path) == len(fresh.plan(start, goal)), "path differs from a fresh build"
+
+    # More edits than the change log keeps: plan() falls back to a full rebuild
+    log_size, map_module.TILE_LOG_SIZE = map_module.TILE_LOG_SIZE, 4
+    try:
+        for pos in rng.sample(cells, 6):
+            gamemap.set_tile(pos, gamemap.grid[pos[1]][pos[0]])
+    finally:
+        map_module.TILE_LOG_SIZE = log_size
+    start, goal = rng.sample([c for c in cells if gamemap.passable(c)], 2)
+    planner.plan(start, goal)
+    assert rebuilds['rebuild'] == 1, "a truncated change log did not trigger a rebuild"
+    return total_clusters
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HPA* incremental update test")
+    parser.add_argument("--size", type=int, default=81)
+    parser.add_argument("--cluster-size", type=int, default=10)
+    parser.add_argument("--edits", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    total = run(args.size, args.cluster_size, args.edits, args.seed)
+    print(f"OK: {args.edits} edits, each rebuilt at most 5 of {total} clusters")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Parallel benchmark runner - spreads (algorithm, map, start, goal) jobs
+across a process pool
+"""
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from algorithm_tester import AlgorithmTester
+
+# Per-process cache: each worker loads a map only once
+_testers = {}
+
+
+def _get_tester(map_path):
+    key = str(map_path)
+    tester = _testers.get(key)
+    if tester is None:
+        tester = AlgorithmTester(map_path)
+        _testers[key] = tester
+    return tester
+
+
+def _run_job(job):
+    """Run one (algorithm, map, start, goal) job inside a worker"""
+    index, algorithm_name, map_path, start, goal, num_runs, timeout = job
+    tester = _get_tester(map_path)
+    try:
+        result = tester.test_algorithm(algorithm_name, start, goal, num_runs, timeout)
+        error = None
+    except Exception as e:
+        result, error = None, str(e)
+    return index, result, error
+
+
+class ParallelBenchmarkRunner:
+    """Runs AlgorithmTester jobs in parallel and merges results deterministically"""
+
+    def __init__(self, workers=None):
+        """
+        Args:
+            workers: Number of worker processes (default: CPU count);
+                1 runs everything in the current process
+        """
+        self.workers = workers or os.cpu_count() or 1
+
+    def run_jobs(self, jobs, num_runs=10, timeout=5.0, verbose=True):
+        """
+        Run a list of (algorithm_name, map_path, start, goal) jobs
+
+        Args:
+            jobs: List of job tuples
+            num_runs: Number of runs per job
+            timeout: Maximum time per run in seconds
+            verbose: Print progress as jobs complete
+
+        Returns:
+            list: Results in the same order as jobs (None for failed jobs)
+        """
+        tasks = [
+            (i, name, str(map_path), tuple(start), tuple(goal), num_runs, timeout)
+            for i, (name, map_path, start, goal) in enumerate(jobs)
+        ]
+        results = [None] * len(tasks)
+
+        def collect(index, result, error):
+            results[index] = result
+            if verbose:
+                name = tasks[index][1]
+                if error is not None:
+                    print(f"{name}: Error: {error}")
+                elif result is None:
+                    print(f"{name}: Failed")
+                elif result['timeout_count'] > 0:
+                    print(f"{name}: Done (with {result['timeout_count']} timeouts)")
+                else:
+                    print(f"{name}: Done")
+
+        if self.workers <= 1 or len(tasks) <= 1:
+            for task in tasks:
+                collect(*_run_job(task))
+            return results
+
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(tasks))) as executor:
+            futures = [executor.submit(_run_job, task) for task in tasks]
+            for future in as_completed(futures):
+                collect(*future.result())
+        return results
+
+    def test_all_algorithms(self, map_path, start, goal, num_runs=10, timeout=5.0, algorithms=None):
+        """
+        Parallel equivalent of AlgorithmTester.test_all_algorithms
+
+        Args:
+            map_path: Path to the map file
+            start: Start point (x, y)
+            goal: Goal point (x, y)
+            num_runs: Number of runs
+            timeout: Maximum time per run in seconds
+            algorithms: Algorithm names (default: all of AlgorithmTester's)
+
+        Returns:
+            list: Results in algorithm order
+        """
+        if algorithms is None:
+            algorithms = list(_get_tester(map_path).algorithms)
+        jobs = [(name, map_path, start, goal) for name in algorithms]
+        return [r for r in self.run_jobs(jobs, num_runs, timeout) if r is not None]
@@ -3,10 +3,18 @@ Script to run tests and find the best algorithm
 """
 from pathlib import Path
 from algorithm_tester import AlgorithmTester
+from parallel_runner import ParallelBenchmarkRunner
 from collections import deque
+import argparse
 import json
 
-def main():
+def main(workers=None):
+    if workers is None:
+        parser = argparse.ArgumentParser(description="Benchmark all algorithms")
+        parser.add_argument("--workers", type=int, default=None,
+                            help="worker processes (default: CPU count)")
+        workers = parser.parse_args().workers
+    
     map_path = Path(__file__).parent.parent / "maps" / "map1.txt"
     tester = AlgorithmTester(map_path)
     
@@ -52,8 +60,9 @@ def main():
     print(f"Goal Point: {goal}")
     print("=" * 70)
     
-    # Test all algorithms (with timeout for slow algorithms)
-    results = tester.test_all_algorithms(start, goal, num_runs=10, timeout=2.0)
+    # Test all algorithms in parallel (with timeout for slow algorithms)
+    runner = ParallelBenchmarkRunner(workers)
+    results = runner.test_all_algorithms(map_path, start, goal, num_runs=10, timeout=2.0)
     
     print("\n" + "=" * 70)
     print("Results:")
@@ -66,9 +75,15 @@ def main():
         print(f"  - Average Time: {result['avg_time']*1000:.4f} ms")
         if result.get('timeout_count', 0) > 0:
             print(f"  - Timeouts: {result['timeout_count']}")
+        stats = result.get('stats')
+        if stats:
+            print(f"  - Nodes Expanded/Generated: {stats['expanded']} / {stats['generated']}")
+            print(f"  - Heap Pushes/Pops: {stats['heap_pushes']} / {stats['heap_pops']}")
+            print(f"  - Peak Open Set: {stats['peak_open']}")
+            print(f"  - Peak Memory: {stats['peak_memory'] / 1024:.1f} KB")
     
-    # Find best algorithm
-    best = tester.find_best_algorithm(start, goal, num_runs=10)
+    # Find best algorithm (scores the results above instead of rerunning)
+    best = tester.score_results(results)
     
     print("\n" + "=" * 70)
     print("Best Algorithm:")
@@ -86,7 +101,8 @@ def main():
         with open(results_file, 'w', encoding='utf-8') as f:
             json.dump({
                 'best_algorithm': best['name'],
-                'results': best
+                'results': best,
+                'search_stats': {r['name']: r.get('stats') for r in results}
             }, f, indent=2, ensure_ascii=False)
         
         print(f"\nResults saved to: {results_file}")
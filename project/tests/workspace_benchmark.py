@@ -0,0 +1,93 @@
+"""
+Workspace Benchmark - time and allocation peak of each algorithm against
+its SearchWorkspace variant on the same start/goal pairs
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from algorithms import (
+    astar, dijkstra, bfs, dfs, greedy_best_first, astar_workspace, dijkstra_workspace,
+    bfs_workspace, dfs_workspace, greedy_workspace, get_workspace, measure_allocations
+)
+from benchmark_suite import is_valid_path, sample_pairs
+from map import GameMap
+from map_generator import generate_map
+
+VARIANTS = [
+    (astar, astar_workspace),
+    (dijkstra, dijkstra_workspace),
+    (bfs, bfs_workspace),
+    (dfs, dfs_workspace),
+    (greedy_best_first, greedy_workspace)
+]
+# Only these must return a path of the same length as the dict version
+OPTIMAL = (astar, dijkstra, bfs)
+
+
+def total_seconds(algorithm, gamemap, queries):
+    t0 = time.perf_counter()
+    for start, goal in queries:
+        algorithm(gamemap, start, goal)
+    return time.perf_counter() - t0
+
+
+def compare(gamemap, pairs, alloc_queries=50):
+    """
+    Returns:
+        list: (name, dict ms, workspace ms, dict peak bytes, workspace peak bytes)
+    """
+    queries = [(start, goal) for start, goal, _ in pairs]
+    rows = []
+    for baseline, variant in VARIANTS:
+        for start, goal in queries:
+            path = variant(gamemap, start, goal)
+            assert is_valid_path(gamemap, path, start, goal), \
+                f"{variant.__name__} returned an invalid path {start} -> {goal}"
+            if baseline in OPTIMAL:
+                assert len(path) == len(baseline(gamemap, start, goal)), \
+                    f"{variant.__name__} path length differs from {baseline.__name__}"
+        base_peak = measure_allocations(baseline, gamemap, queries[:alloc_queries])
+        ws_peak = measure_allocations(variant, gamemap, queries[:alloc_queries])
+        rows.append((baseline.__name__,
+                     total_seconds(baseline, gamemap, queries) * 1000,
+                     total_seconds(variant, gamemap, queries) * 1000,
+                     base_peak['avg_peak_bytes'], ws_peak['avg_peak_bytes']))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dict-based search vs SearchWorkspace variants")
+    parser.add_argument("--map", default=str(Path(__file__).parent.parent / "maps" / "map1.txt"))
+    parser.add_argument("--generate", type=int, metavar="SIZE",
+                        help="use a generated SIZExSIZE maze instead of --map")
+    parser.add_argument("--pairs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.generate:
+        gamemap = generate_map(args.generate, args.generate, seed=args.seed)
+    else:
+        gamemap = GameMap(args.map, compiled=True)
+    rows = compare(gamemap, sample_pairs(gamemap, args.pairs, seed=args.seed))
+
+    print(f"{'Algorithm':<20}{'dict ms':>9}{'ws ms':>9}{'dict peak KB':>14}{'ws peak KB':>12}")
+    for name, base_ms, ws_ms, base_peak, ws_peak in rows:
+        print(f"{name:<20}{base_ms:>9.0f}{ws_ms:>9.0f}{base_peak / 1024:>14.1f}{ws_peak / 1024:>12.1f}")
+    stats = get_workspace(gamemap).stats()
+    print(f"\nWorkspace: {stats['queries']} queries, {stats['cells_touched']} cells touched, "
+          f"{stats['dict_entries_avoided']} dict entries avoided, "
+          f"{stats['workspace_bytes']} bytes reused")
+
+    assert all(ws_peak < base_peak for _, _, _, base_peak, ws_peak in rows), \
+        "a workspace variant allocated more than its dict version"
+    print("\nOK: every workspace variant allocates less than its dict version")
+
+
+if __name__ == "__main__":
+    main()